@@ -1,7 +1,17 @@
 import streamlit as st
-import requests
-import json
-import pandas as pd
+import io
+import time
+from github_client import get_client
+from github_api import build_repo_info, configure, get_readme_content
+from multi_owner import get_owner_group, parse_owners, split_repository_label
+from readme_images import process_github_images, rewrite_readme_images
+from image_prefetch import get_image_prefetcher
+from readme_render import get_readme_html
+from metrics import get_metrics, install_github_metrics, start_metrics_server, timed
+from batch_rename import apply_renames, execute_renames, parse_rename_mapping, plan_renames, regex_rename_mapping
+
+# Draw the page shell first; everything below it may wait on GitHub
+st.set_page_config(layout="wide")
 
 # Custom CSS for README container height
 st.markdown("""
@@ -13,536 +23,82 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-token = st.secrets["github_classic_token_test_001"]
-userName="HKIBIMTechnical"
-change_name_code=st.secrets["change_name_code"]
-#region function
-def get_public_repositories(username):
-    """
-    Get public repositories for a specific username without requiring authentication.
-    
-    Args:
-        username (str): GitHub username to get repositories for
-    
-    Returns:
-        list: List of dictionaries containing repository information
-    """
-    url = f'https://api.github.com/users/{username}/repos'
-    
-    repositories = []
-    page = 1
-    per_page = 100  # Maximum allowed by GitHub API
-    
-    try:
-        while True:
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'sort': 'updated',
-                'direction': 'desc'
-            }
-            
-            # No authentication headers needed for public repos
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            page_repos = response.json()
-            
-            # If no more repositories, break
-            if not page_repos:
-                break
-            
-            # Process repositories on this page
-            for repo in page_repos:
-                repo_info = {
-                    'name': repo['name'],
-                    'url': repo['url'],
-                    'html_url': repo['html_url'],
-                    'clone_url': repo['clone_url'],
-                    'ssh_url': repo['ssh_url'],
-                    'description': repo.get('description', ''),
-                    'language': repo.get('language', ''),
-                    'private': repo['private'],
-                    'fork': repo['fork'],
-                    'stars': repo['stargazers_count'],
-                    'forks': repo['forks_count'],
-                    'updated_at': repo['updated_at']
-                }
-                repositories.append(repo_info)
-            
-            # Check if we've reached the last page
-            if len(page_repos) < per_page:
-                break
-            
-            page += 1
-            
-        return repositories
-        
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to fetch repositories: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error processing repositories: {str(e)}")
+st.title("HKIBIM Github Repositories")
 
-def get_all_repositories(token, username=None):
-    """
-    Get all repositories for the authenticated user or a specific username.
-    
-    Args:
-        token (str): GitHub personal access token
-        username (str, optional): Specific username to get repositories for. 
-                                 If None, gets repositories for the authenticated user.
-    
-    Returns:
-        list: List of dictionaries containing repository information
-              Each dict has 'name', 'url', 'html_url', 'clone_url', 'ssh_url'
-    
-    Raises:
-        Exception: If the API request fails
-    """
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # Determine the API endpoint
-    if username:
-        # Get repositories for a specific user
-        url = f'https://api.github.com/users/{username}/repos'
-    else:
-        # Get repositories for the authenticated user
-        url = 'https://api.github.com/user/repos'
-    
-    repositories = []
-    page = 1
-    per_page = 100  # Maximum allowed by GitHub API
-    
-    try:
-        while True:
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'sort': 'updated',  # Sort by last updated
-                'direction': 'desc'  # Most recent first
-            }
-            
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            
-            page_repos = response.json()
-            
-            # If no more repositories, break
-            if not page_repos:
-                break
-            
-            # Process repositories on this page
-            for repo in page_repos:
-                repo_info = {
-                    'name': repo['name'],
-                    'url': repo['url'],  # API URL
-                    'html_url': repo['html_url'],  # Web page URL
-                    'clone_url': repo['clone_url'],  # HTTPS clone URL
-                    'ssh_url': repo['ssh_url'],  # SSH clone URL
-                    'description': repo.get('description', ''),
-                    'language': repo.get('language', ''),
-                    'private': repo['private'],
-                    'fork': repo['fork'],
-                    'stars': repo['stargazers_count'],
-                    'forks': repo['forks_count'],
-                    'updated_at': repo['updated_at']
-                }
-                repositories.append(repo_info)
-            
-            # Check if we've reached the last page
-            if len(page_repos) < per_page:
-                break
-            
-            page += 1
-            
-        return repositories
-        
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to fetch repositories: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error processing repositories: {str(e)}")
-def rename_repository(token, username, old_repository_name, new_repository_name):
-    """
-    Rename a GitHub repository.
-    
-    Args:
-        token (str): GitHub personal access token with repo scope
-        username (str): GitHub username (owner of the repository)
-        old_repository_name (str): Current name of the repository
-        new_repository_name (str): New name for the repository
-    
-    Returns:
-        dict: Repository rename information including new URLs and details
-        
-    Raises:
-        Exception: If the repository rename fails
-    """
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # API endpoint for renaming repository
-    url = f'https://api.github.com/repos/{username}/{old_repository_name}'
-    
-    # Repository rename data
-    data = {
-        'name': new_repository_name
-    }
-    
-    try:
-        # First check if the old repository exists
-        check_response = requests.get(url, headers=headers)
-        if check_response.status_code == 404:
-            raise Exception(f"Repository '{old_repository_name}' not found")
-        elif check_response.status_code != 200:
-            check_response.raise_for_status()
-        
-        # Check if the new name is already taken
-        new_url = f'https://api.github.com/repos/{username}/{new_repository_name}'
-        new_check_response = requests.get(new_url, headers=headers)
-        if new_check_response.status_code == 200:
-            raise Exception(f"Repository name '{new_repository_name}' is already taken")
-        
-        # Make the PATCH request to rename the repository
-        response = requests.patch(url, headers=headers, json=data)
-        
-        if response.status_code == 200:
-            # Repository successfully renamed
-            result = response.json()
-            
-            return {
-                'status': 'success',
-                'action': 'renamed',
-                'old_name': old_repository_name,
-                'new_name': new_repository_name,
-                'full_name': result.get('full_name', ''),
-                'html_url': result.get('html_url', ''),
-                'clone_url': result.get('clone_url', ''),
-                'ssh_url': result.get('ssh_url', ''),
-                'private': result.get('private', False),
-                'description': result.get('description', ''),
-                'created_at': result.get('created_at', ''),
-                'updated_at': result.get('updated_at', ''),
-                'message': f"Repository '{old_repository_name}' successfully renamed to '{new_repository_name}'"
-            }
-        elif response.status_code == 422:
-            raise Exception(f"Invalid repository name '{new_repository_name}' or name already exists")
-        elif response.status_code == 403:
-            raise Exception("Insufficient permissions. Token needs 'repo' scope or you don't have access to this repository")
-        elif response.status_code == 401:
-            raise Exception("Authentication failed. Check your token and permissions")
-        else:
-            raise Exception(f"Failed to rename repository. Status code: {response.status_code}")
-            
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to rename repository: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error renaming repository: {str(e)}")
-def get_fileInfo_content(token, username, repository_Name, file_path="README.md", branch="main"):
-    """
-    Get file content or directory listing from a GitHub repository.
-    file content include file name, path, content, size, sha, url, html_url, download_url, encoding.
-    directory listing include file name, path, type, size, sha, url, html_url, download_url.
-    current file README.md is under root folder, you can set your own file path.
-    if file under folder, file path should be "folder/file.ext" for example.
-    
-    Args:
-        token (str): GitHub personal access token
-        username (str): GitHub username (owner of the repository)
-        repository_Name (str): Name of the repository
-        file_path (str): Path to the file or directory (empty string for root)
-        branch (str): Branch name (default: "main")
-    
-    Returns:
-        dict: File content or directory listing information
-        
-    Raises:
-        Exception: If the file retrieval fails
-    """
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # API endpoint for getting repository contents
-    url = f'https://api.github.com/repos/{username}/{repository_Name}/contents/{file_path}'
-    
-    # Add branch parameter if specified
-    if branch:
-        url += f'?ref={branch}'
-    
-    try:
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            content_data = response.json()
-            
-            # Check if it's a file or directory
-            if isinstance(content_data, dict):
-                # Single file
-                if content_data.get('type') == 'file':
-                    # Decode content if it's encoded
-                    content = content_data.get('content', '')
-                    encoding = content_data.get('encoding', '')
-                    
-                    if encoding == 'base64':
-                        import base64
-                        try:
-                            content = base64.b64decode(content).decode('utf-8')
-                        except:
-                            content = content_data.get('content', '')
-                    
-                    return {
-                        'type': 'file',
-                        'name': content_data.get('name', ''),
-                        'path': content_data.get('path', ''),
-                        'content': content,
-                        'size': content_data.get('size', 0),
-                        'sha': content_data.get('sha', ''),
-                        'url': content_data.get('url', ''),
-                        'html_url': content_data.get('html_url', ''),
-                        'download_url': content_data.get('download_url', ''),
-                        'encoding': encoding
-                    }
-                elif content_data.get('type') == 'dir':
-                    # Directory - return list of files
-                    return {
-                        'type': 'directory',
-                        'path': content_data.get('path', ''),
-                        'files': content_data
-                    }
-                else:
-                    return content_data
-            elif isinstance(content_data, list):
-                # Directory listing
-                files = []
-                for item in content_data:
-                    file_info = {
-                        'name': item.get('name', ''),
-                        'path': item.get('path', ''),
-                        'type': item.get('type', ''),  # 'file' or 'dir'
-                        'size': item.get('size', 0),
-                        'sha': item.get('sha', ''),
-                        'url': item.get('url', ''),
-                        'html_url': item.get('html_url', ''),
-                        'download_url': item.get('download_url', '')
-                    }
-                    files.append(file_info)
-                
-                return {
-                    'type': 'directory',
-                    'path': file_path if file_path else 'root',
-                    'files': files
-                }
-            else:
-                return content_data
-                
-        elif response.status_code == 404:
-            raise Exception(f"File or directory '{file_path}' not found in repository '{repository_Name}'")
-        elif response.status_code == 403:
-            raise Exception("Insufficient permissions or repository is private")
-        elif response.status_code == 401:
-            raise Exception("Authentication failed. Check your token and permissions")
-        else:
-            raise Exception(f"Failed to get file content. Status code: {response.status_code}")
-            
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to get file content: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error getting file content: {str(e)}")
-def get_file_content_string(token, username, repository_Name, file_path="README.md", branch="main"):
-    """
-    Get content of a specific file from a GitHub repository.
-    current file README.md is under root folder, you can set your own file path.
-    if file under folder, file path should be "folder/file.ext" for example.
-    Args:
-        token (str): GitHub personal access token
-        username (str): GitHub username (owner of the repository)
-        repository_Name (str): Name of the repository
-        file_path (str): Path to the specific file
-        branch (str): Branch name (default: "main")
-    
-    Returns:
-        str: File content as string
-        
-    Raises:
-        Exception: If the file retrieval fails
-    """
-    result = get_fileInfo_content(token, username, repository_Name, file_path, branch)
-    
-    if result.get('type') == 'file':
-        return result.get('content', '')
-    else:
-        raise Exception(f"Path '{file_path}' is not a file")
-def check_file_or_folder_exists(token, username, repository_Name, file_path="README.md", branch="main"):
+
+@st.cache_resource(show_spinner=False)
+def load_settings():
     """
-    Check if a file or folder exists in a GitHub repository.
-    current file README.md is under root folder, you can set your own file path.
-    if file under folder, file path should be "folder/file.ext" for example.
-    
-    Args:
-        token (str): GitHub personal access token
-        username (str): GitHub username (owner of the repository)
-        repository_Name (str): Name of the repository
-        file_path (str): Path to the file or folder to check
-        branch (str): Branch name (default: "main")
+    Read the secrets and set up the process-wide GitHub helpers once per
+    process; every rerun after the first reuses the result. Changed secrets
+    take effect after a restart.
     
     Returns:
-        dict: Existence status and type information
-            {
-                'exists': bool,
-                'type': str,  # 'file', 'directory', or 'unknown'
-                'path': str,
-                'name': str,
-                'size': int,
-                'sha': str
-            }
-        
-    Raises:
-        Exception: If the check fails
+        dict: Settings read from st.secrets, with defaults applied
     """
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
+    token = st.secrets["github_classic_token_test_001"]
+    settings = {
+        'token': token,
+        # Users / organizations whose repositories are shown together: names, or
+        # tables with "name" and "token" for owners another account can read
+        'owners': parse_owners(st.secrets.get("owners", ["HKIBIMTechnical"]), token),
+        'change_name_code': st.secrets["change_name_code"],
+        'github_backend': st.secrets.get("github_backend", "rest"),
+        'repos_refresh_interval': float(st.secrets.get("repos_refresh_interval", 300)),
+        'readme_prefetch_count': int(st.secrets.get("readme_prefetch_count", 20)),
+        'full_sync_interval': float(st.secrets.get("full_sync_interval", 3600)),
+        'file_content_max_age': float(st.secrets.get("file_content_max_age", 60)),
+        'show_metrics': bool(st.secrets.get("show_metrics", False)),
+        'metrics_port': int(st.secrets.get("metrics_port", 0)),
+        'readme_render': st.secrets.get("readme_render", "html"),
+        'table_page_size': int(st.secrets.get("table_page_size", 50))
     }
     
-    # API endpoint for checking repository contents
-    url = f'https://api.github.com/repos/{username}/{repository_Name}/contents/{file_path}'
-    
-    # Add branch parameter if specified
-    if branch:
-        url += f'?ref={branch}'
-    
-    try:
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code == 200:
-            content_data = response.json()
-            
-            # File or directory exists
-            if isinstance(content_data, dict):
-                item_type = content_data.get('type', 'unknown')
-                return {
-                    'exists': True,
-                    'type': item_type,  # 'file' or 'dir'
-                    'path': content_data.get('path', ''),
-                    'name': content_data.get('name', ''),
-                    'size': content_data.get('size', 0),
-                    'sha': content_data.get('sha', ''),
-                    'html_url': content_data.get('html_url', ''),
-                    'download_url': content_data.get('download_url', '')
-                }
-            elif isinstance(content_data, list):
-                # This shouldn't happen for a specific path, but handle it
-                return {
-                    'exists': True,
-                    'type': 'directory',
-                    'path': file_path,
-                    'name': file_path.split('/')[-1] if '/' in file_path else file_path,
-                    'size': 0,
-                    'sha': '',
-                    'html_url': '',
-                    'download_url': ''
-                }
-            else:
-                return {
-                    'exists': True,
-                    'type': 'unknown',
-                    'path': file_path,
-                    'name': file_path.split('/')[-1] if '/' in file_path else file_path,
-                    'size': 0,
-                    'sha': '',
-                    'html_url': '',
-                    'download_url': ''
-                }
-                
-        elif response.status_code == 404:
-            # File or directory does not exist
-            return {
-                'exists': False,
-                'type': 'none',
-                'path': file_path,
-                'name': file_path.split('/')[-1] if '/' in file_path else file_path,
-                'size': 0,
-                'sha': '',
-                'html_url': '',
-                'download_url': ''
-            }
-        elif response.status_code == 403:
-            raise Exception("Insufficient permissions or repository is private")
-        elif response.status_code == 401:
-            raise Exception("Authentication failed. Check your token and permissions")
-        else:
-            raise Exception(f"Failed to check file existence. Status code: {response.status_code}")
-            
-    except requests.exceptions.RequestException as e:
-        raise Exception(f"Failed to check file existence: {str(e)}")
-    except Exception as e:
-        raise Exception(f"Error checking file existence: {str(e)}")
+    # The GitHub helpers live in github_api.py; apply the secrets to them
+    configure(
+        readme_prefetch_count=settings['readme_prefetch_count'],
+        full_sync_interval=settings['full_sync_interval'],
+        file_content_max_age=settings['file_content_max_age'],
+        readme_render=settings['readme_render']
+    )
+    # Record every GitHub request (latency, status, bytes, retries, cache hits) in-process
+    install_github_metrics()
+    # Open the HTTP client (connection pool, response cache) before the first request needs it
+    get_client(settings['token'])
+    return settings
+
+
+settings = load_settings()
+token = settings['token']
+OWNERS = settings['owners']
+userName = OWNERS[0]['name']  # Owner of repository names shown without "owner/"
+change_name_code = settings['change_name_code']
+github_backend = settings['github_backend']  # "rest" or "graphql"
+REPOS_REFRESH_INTERVAL = settings['repos_refresh_interval']  # Seconds between background refreshes
+README_PREFETCH_COUNT = settings['readme_prefetch_count']  # READMEs of the most recently updated repos to prefetch
+SNAPSHOT_WAIT_TIMEOUT = 10  # Seconds the first visitor waits for the first snapshot before the page reruns
+OWNER_WAIT_TIMEOUT = 2  # Seconds the page waits for owners still on their first load once another owner is shown
+PARTIAL_POLL_INTERVAL = 0.5  # Seconds between updates of the partial table while the first snapshot loads
+FULL_SYNC_INTERVAL = settings['full_sync_interval']  # Seconds between full crawls that detect deletions
+FILE_CONTENT_MAX_AGE = settings['file_content_max_age']  # Seconds a viewed file is served without revalidation
+SHOW_METRICS = settings['show_metrics']  # Show the GitHub I/O metrics panel (off unless enabled in secrets)
+METRICS_PORT = settings['metrics_port']  # Serve Prometheus /metrics on this port (0 = off)
+README_RENDER = settings['readme_render']  # "html" (pre-rendered, cached per blob SHA) or "markdown"
+TABLE_PAGE_SIZE = settings['table_page_size']  # Rows of the Repository Table sent per rerun
+TABLE_VIEWPORT_ROWS = 15  # Rows visible at once; the table scrolls inside a fixed height
+TABLE_COLUMNS = ["Name", "URL", "Index"]  # Columns shown in the Repository Table
+UPDATED_WITHIN_DAYS = {"Any time": None, "Last 7 days": 7, "Last 30 days": 30, "Last year": 365}  # Search facet choices
 
-def process_github_images(content):
+#region function
+def format_age(seconds):
     """
-    Process GitHub markdown content to convert blob URLs to raw URLs for image display.
-    
-    Args:
-        content (str): Markdown content from README
-        
-    Returns:
-        str: Processed content with converted image URLs and line breaks after images
+    Short age for status lines: "42s", "7m", "5h" or "3d".
     """
-    import re
-    
-    # Pattern to match GitHub blob URLs in markdown image syntax
-    # Matches: ![alt](https://github.com/user/repo/blob/branch/path/to/image.png)
-    pattern = r'!\[([^\]]*)\]\(https://github\.com/([^/]+)/([^/]+)/blob/([^/]+)/([^)]+)\)'
-    
-    def replace_url(match):
-        alt_text = match.group(1)
-        username = match.group(2)
-        repo_name = match.group(3)
-        branch = match.group(4)
-        file_path = match.group(5)
-        
-        # Convert to raw GitHub URL
-        raw_url = f"https://raw.githubusercontent.com/{username}/{repo_name}/{branch}/{file_path}"
-        
-        return f'![{alt_text}]({raw_url})\n\n'
-    
-    # Replace all GitHub blob URLs with raw URLs
-    processed_content = re.sub(pattern, replace_url, content)
-    
-    
-    # Also handle other common GitHub URL patterns
-    # Handle URLs that might be missing the branch (default to main)
-    pattern2 = r'!\[([^\]]*)\]\(https://github\.com/([^/]+)/([^/]+)/blob/([^)]+)\)'
-    def replace_url2(match):
-        alt_text = match.group(1)
-        username = match.group(2)
-        repo_name = match.group(3)
-        file_path = match.group(4)
-        
-        # Default to main branch
-        raw_url = f"https://raw.githubusercontent.com/{username}/{repo_name}/main/{file_path}"
-        
-        return f'![{alt_text}]({raw_url})\n\n'
-    
-    processed_content = re.sub(pattern2, replace_url2, processed_content)
-    
-    # Also add line breaks after any remaining image markdown that wasn't caught by the above patterns
-    # This handles images that might already be in raw format or other formats
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    def add_line_breaks(match):
-        alt_text = match.group(1)
-        img_url = match.group(2)
-        return f'![{alt_text}]({img_url})\n\n'
-    
-    processed_content = re.sub(image_pattern, add_line_breaks, processed_content)
-    
-    return processed_content
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size:.0f}{unit}"
+    return f"{max(seconds, 0):.0f}s"
+
 
 def display_readme_with_images(content, repo_name):
     """
@@ -552,82 +108,132 @@ def display_readme_with_images(content, repo_name):
         content (str): README content
         repo_name (str): Repository name for context
     """
-    import re
-    
-    # Process GitHub images
-    processed_content = process_github_images(content)
-    
-    # Check if there are any images in the content
-    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-    images = re.findall(image_pattern, processed_content)
+    # Process GitHub images; the same pass collects the images in the content
+    processed_content, images = rewrite_readme_images(content)
     
     if images:
+        # Download and validate every image at once; broken ones are collected in errors
+        image_data, errors = get_image_prefetcher().fetch_all([img_url for _, img_url in images])
+        
         # Display images separately for better control
         for i, (alt_text, img_url) in enumerate(images):
-            st.markdown(f"**Image {i+1}:** {alt_text if alt_text else 'No description'}")
+            if img_url not in image_data:
+                continue
             
-            try:
-                # Try to display the image
-                if img_url.startswith('http'):
-                    # Add a small delay to prevent overwhelming the server
-                    import time
-                    time.sleep(0.1)
-                    
-                    st.image(img_url, caption=alt_text if alt_text else f"Image {i+1}")
-                else:
-                    st.warning(f"⚠️ Invalid image URL: {img_url}")
-            except Exception as e:
-                st.error(f"❌ Failed to load image: {str(e)}")
-                st.info(f"Image URL: {img_url}")
-                
-                # Provide alternative display options
-                st.markdown(f"**Alternative options:**")
-                st.markdown(f"- Try copying this URL: `{img_url}`")
-                st.markdown(f"- Check if the image exists at: {img_url}")
+            st.markdown(f"**Image {i+1}:** {alt_text if alt_text else 'No description'}")
+            data, content_type = image_data[img_url]
+            if content_type == 'image/svg+xml':
+                # st.image renders SVG from markup, not from a byte buffer
+                st.image(data.decode('utf-8', errors='replace'), caption=alt_text if alt_text else f"Image {i+1}")
+            else:
+                st.image(io.BytesIO(data), caption=alt_text if alt_text else f"Image {i+1}")
             
             st.markdown("---")
+        
+        if errors:
+            st.error(f"❌ Failed to load {len(errors)} image(s)")
+            for img_url, error in errors.items():
+                st.markdown(f"- `{img_url}`: {error}")
     
     # Display the processed markdown content
     st.markdown(processed_content)
 
-#endregion
-
-
 
+#endregion
 
 
-st.set_page_config(layout="wide")
 
 
 
+if METRICS_PORT:
+    try:
+        start_metrics_server(METRICS_PORT)
+    except Exception as e:
+        st.warning(str(e))
 
-st.title("HKIBIM Github Repositories")
 
-# Get repositories - use session state to track if we need to refresh
-if 'repos_cache' not in st.session_state:
-    st.session_state.repos_cache = get_all_repositories(token,userName)
+# Get repositories - a background thread per owner (one set per process) refreshes the
+# repository list and the most recently updated READMEs on a schedule and publishes
+# immutable snapshots; the owners load in parallel and are shown as one list.
+# Snapshots are saved locally, so after a restart the last one is shown at once
+# and reconciled with GitHub in the background.
+# The page only reads the latest snapshots, so it never waits on GitHub once one exists.
+owner_group = get_owner_group(OWNERS, github_backend, REPOS_REFRESH_INTERVAL)
 
 # Check if we need to refresh the repository list
 if st.session_state.get('refresh_repos', False):
-    st.session_state.repos_cache = get_all_repositories(token,userName)
+    with st.spinner("Refreshing repositories..."):
+        owner_group.refresh_now(wait=True, timeout=60)
     st.session_state.refresh_repos = False
 
-repos = st.session_state.repos_cache
+repo_snapshot = owner_group.combined_snapshot()
+if owner_group.pending_owners():
+    # Only the first visitors of a freshly started process get here. Pages are
+    # shown as they arrive, until the snapshots are published; once one owner
+    # is shown, slower owners get a short grace period and then join on a later rerun
+    partial_placeholder = st.empty()
+    deadline = time.time() + (SNAPSHOT_WAIT_TIMEOUT if repo_snapshot is None else OWNER_WAIT_TIMEOUT)
+    with st.spinner("Loading repositories from GitHub..."):
+        while time.time() < deadline and owner_group.wait(PARTIAL_POLL_INTERVAL):
+            partial_repos = owner_group.partial_repos()
+            if partial_repos:
+                with partial_placeholder.container():
+                    st.caption(f"Loaded {len(partial_repos)} repositories so far...")
+                    st.dataframe(
+                        [{'Name': repo['name'], 'URL': repo['html_url'], 'Updated': repo['updated_at']} for repo in partial_repos],
+                        hide_index=True
+                    )
+    partial_placeholder.empty()
+    repo_snapshot = owner_group.combined_snapshot()
+    if repo_snapshot is None:
+        if not owner_group.pending_owners():
+            errors = "; ".join(f"{status['owner']}: {str(status['error'])}" for status in owner_group.statuses())
+            st.error(f"Failed to load repositories: {errors}")
+            st.stop()
+        st.rerun()
+
+repo_table = repo_snapshot.table  # Columnar store built once per snapshot
+search_index = owner_group.search_index
+# The refresher indexes every snapshot it publishes; this only catches up when
+# the page got here first (e.g. the first load), and is a no-op otherwise
+search_index.sync(repo_snapshot)
+
+fetch_stats = repo_snapshot.stats
+rate_limit = get_client(token).rate_limit_status()['core']
+if fetch_stats:
+    st.caption(f"Loaded {len(repo_table)} repositories with {fetch_stats['requests']} requests in {fetch_stats['elapsed']:.2f}s"
+               f" ({repo_snapshot.sync.get('mode', 'full')} sync)"
+               f" · snapshot {format_age(repo_snapshot.age)} old"
+               f" · API budget {rate_limit['remaining']}/{rate_limit['limit']}")
+if 'restored' in repo_snapshot.sync.get('mode', ''):
+    st.info(f"🕒 Showing repositories saved {format_age(repo_snapshot.age)} ago; "
+            "they are being refreshed from GitHub in the background.")
+
+# One status line per owner, so a slow or failing owner only affects its own line
+if owner_group.multiple:
+    for status in owner_group.statuses():
+        owner_snapshot = status['snapshot']
+        owner_rate_limit = get_client(owner_group.token(status['owner'])).rate_limit_status()['core']
+        budget = f"API budget {owner_rate_limit['remaining']}/{owner_rate_limit['limit']}"
+        if owner_snapshot is None and status['loading']:
+            st.info(f"⏳ {status['owner']}: still loading · {budget}")
+        elif owner_snapshot is None:
+            st.error(f"❌ {status['owner']}: {str(status['error'])} · {budget}")
+        else:
+            owner_stats = owner_snapshot.stats
+            owner_caption = (f"{status['owner']}: {len(owner_snapshot.table)} repositories"
+                             f" · {owner_stats.get('requests', 0)} requests in {owner_stats.get('elapsed', 0.0):.2f}s"
+                             f" · snapshot {format_age(owner_snapshot.age)} old · {budget}")
+            if status['error'] is not None:
+                st.warning(f"⚠️ {owner_caption} · last refresh failed: {str(status['error'])}")
+            else:
+                st.caption(owner_caption)
 
 # Create a container for the table
 container = st.container()
 
 # Create a proper table using Streamlit's native table functionality
-# First, create the data for the table
-table_data = []
-for i, repo in enumerate(repos):
-    table_data.append({
-        "Name": repo['name'],
-        "URL": repo['html_url'],
-        "Index": i
-    })
-
-table_data.reverse()
+# The table data ("Name", "URL", "Index", oldest first) is prebuilt with the snapshot
 
 # Interactive dataframe with click functionality
 st.markdown("### Repository Table")
@@ -635,18 +241,37 @@ st.markdown("### Repository Table")
 # Container for Repository Table
 with st.container():
     st.markdown("**📊 Repository List**")
-    # Create dataframe without index column
-    df_display = pd.DataFrame(table_data)
-    row_height = 35  
-    num_rows = len(df_display)
-    calculated_height = num_rows * row_height + 50
-    # Use st.data_editor for interactive functionality
+    # Only the current page is sent to the browser; the full table stays on the server
+    page_count = repo_table.page_count(TABLE_PAGE_SIZE)
+    # The page lives in session state only (no widget default), since it is also set here
+    if "repo_table_page" not in st.session_state:
+        st.session_state["repo_table_page"] = 1
+    elif st.session_state["repo_table_page"] > page_count:
+        # The repository list shrank since the page was chosen
+        st.session_state["repo_table_page"] = page_count
+    page_number = st.number_input(
+        "Page",
+        min_value=1,
+        max_value=page_count,
+        step=1,
+        key="repo_table_page"
+    )
+    df_display = repo_table.page(page_number, TABLE_PAGE_SIZE, columns=TABLE_COLUMNS)
+    first_row = (page_number - 1) * TABLE_PAGE_SIZE
+    st.caption(f"Rows {first_row + 1 if len(df_display) else 0}-{first_row + len(df_display)} "
+               f"of {len(repo_table)} · page {page_number} of {page_count}")
+
+    row_height = 35
+    calculated_height = min(len(df_display), TABLE_VIEWPORT_ROWS) * row_height + 38
+    # Use st.data_editor for interactive functionality; the key stays the same
+    # when the repository count changes, so the widget is updated, not remounted
     edited_df = st.data_editor(
         df_display,
         use_container_width=True,
         hide_index=True,
         height=calculated_height,
-        key=f"interactive_repo_dataframe_{len(repos)}"
+        row_height=row_height,
+        key="interactive_repo_dataframe"
     )
 
 
@@ -714,16 +339,128 @@ with st.container():
 
 
 
+# Batch Rename - every rename is validated locally against the snapshot (the
+# preview is a dry run), PATCHes run concurrently and the snapshot is updated in place
+st.divider()
+st.markdown("### ✏️ Batch Rename")
+
+with st.expander("Rename several repositories at once"):
+    # Renames run against one owner's own snapshot, with that owner's token
+    if owner_group.multiple:
+        rename_owner = st.selectbox("Owner:", options=owner_group.owners, key="batch_rename_owner")
+    else:
+        rename_owner = userName
+    rename_snapshot = owner_group.snapshot(rename_owner)
+    rename_names = rename_snapshot.table.names if rename_snapshot is not None else ()
+    if rename_snapshot is None:
+        st.info(f"ℹ️ The repositories of {rename_owner} are not loaded yet.")
+
+    batch_code_input = st.text_input(
+        "Change Name Code:",
+        type="password",
+        help="Enter the change name code to enable repository renaming",
+        key="batch_rename_code_input"
+    )
+    rename_mode = st.radio("Rename rule:", ["Mapping", "Regex"], horizontal=True, key="batch_rename_mode")
+
+    rename_mapping = {}
+    try:
+        if rename_mode == "Mapping":
+            mapping_text = st.text_area(
+                "One rename per line (old -> new):",
+                height=150,
+                placeholder="old-name -> new-name",
+                key="batch_rename_mapping"
+            )
+            rename_mapping = parse_rename_mapping(mapping_text)
+        else:
+            pattern_col, replacement_col = st.columns(2)
+            with pattern_col:
+                rename_pattern = st.text_input("Pattern (regular expression):", placeholder=r"^old_(.*)$", key="batch_rename_pattern")
+            with replacement_col:
+                rename_replacement = st.text_input("Replacement:", placeholder=r"new_\1", key="batch_rename_replacement")
+            if rename_pattern:
+                rename_mapping = regex_rename_mapping(rename_names, rename_pattern, rename_replacement)
+    except Exception as e:
+        st.error(str(e))
+
+    rename_plan = plan_renames(rename_names, rename_mapping)
+    ready_renames = [entry for entry in rename_plan if entry['status'] == 'ready']
+    if rename_plan:
+        st.dataframe(rename_plan, use_container_width=True, hide_index=True,
+                     column_order=["old", "new", "status", "reason", "wave"])
+        invalid_count = sum(1 for entry in rename_plan if entry['status'] == 'invalid')
+        wave_count = len({entry['wave'] for entry in ready_renames})
+        st.caption(f"Dry run: {len(ready_renames)} ready in {wave_count} wave(s) · {invalid_count} invalid · "
+                   f"{len(rename_plan) - len(ready_renames) - invalid_count} unchanged")
+
+    batch_code_ok = batch_code_input == change_name_code
+    if st.button(f"Rename {len(ready_renames)} repositories", type="primary",
+                 disabled=not (batch_code_ok and ready_renames), key="batch_rename_button"):
+        with st.spinner(f"Renaming {len(ready_renames)} repositories..."):
+            rename_results = execute_renames(owner_group.token(rename_owner), rename_owner, rename_plan)
+        if any(result['status'] == 'renamed' for result in rename_results):
+            # Apply the renames to the owner's snapshot instead of fetching every repository again
+            owner_group.refreshers[rename_owner].publish(apply_renames(rename_snapshot, rename_results, build_repo_info))
+        st.session_state.batch_rename_results = rename_results
+        st.rerun()
+
+    if not batch_code_ok:
+        if batch_code_input:
+            st.error("❌ Incorrect change name code. Please enter the correct code to enable renaming.")
+        else:
+            st.info("ℹ️ Please enter the change name code to enable repository renaming.")
+
+    for result in st.session_state.get("batch_rename_results", []):
+        if result['status'] == 'renamed':
+            st.success(result['message'])
+        else:
+            st.error(f"{result['old']} -> {result['new']}: {result['message']}")
+
+
 # Repository Selection and README Display
 st.divider()
 st.markdown("### 🔍 Repository Selection")
 
 
 
+search_query = st.text_input(
+    "Search repositories:",
+    placeholder="Name, description, language or README text",
+    key="repo_search_query"
+)
+filter_cols = st.columns(4)
+with filter_cols[0]:
+    search_languages = st.multiselect("Language", options=search_index.languages(), key="repo_search_languages")
+with filter_cols[1]:
+    search_fork = st.selectbox("Forks", options=["All", "Sources only", "Forks only"], key="repo_search_fork")
+with filter_cols[2]:
+    search_min_stars = st.number_input("Min stars", min_value=0, value=0, step=1, key="repo_search_min_stars")
+with filter_cols[3]:
+    search_updated = st.selectbox("Updated", options=list(UPDATED_WITHIN_DAYS), key="repo_search_updated")
+
+if search_query.strip() or search_languages or search_fork != "All" or search_min_stars or UPDATED_WITHIN_DAYS[search_updated]:
+    updated_days = UPDATED_WITHIN_DAYS[search_updated]
+    search_start = time.perf_counter()
+    repo_options = search_index.search(
+        search_query,
+        languages=search_languages,
+        fork={"All": None, "Sources only": False, "Forks only": True}[search_fork],
+        min_stars=search_min_stars,
+        updated_after=time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() - updated_days * 86400)) if updated_days else None
+    )
+    st.caption(f"{len(repo_options)} of {len(repo_table)} repositories match "
+               f"({(time.perf_counter() - search_start) * 1000:.1f} ms)")
+else:
+    repo_options = repo_table.names_oldest_first
+
+if not repo_options:
+    st.info("No repositories match the search")
+
 selected_repo_name = st.selectbox(
     "Select repository to view README:",
-    options=[repo['name'] for repo in repos][::-1],
-    key=f"repo_selector_for_readme_{len(repos)}"
+    options=repo_options,
+    key="repo_selector_for_readme"
 )
 
 
@@ -736,16 +473,38 @@ if selected_repo_name:
     st.markdown(f"### 📖 README.md for {selected_repo_name}")
     
     # Check if README.md exists and get content
+    selected_owner, selected_repository = split_repository_label(selected_repo_name, userName)
+    owner_token = owner_group.token(selected_owner)
+    owner_snapshot = owner_group.snapshot(selected_owner)
     try:
-        readme_content = get_file_content_string(token, userName, selected_repo_name, "README.md")
+        owner_readmes = owner_snapshot.readmes if owner_snapshot is not None else {}
+        # Relative README links point to the repository's own default branch
+        readme_branch = owner_snapshot.table.default_branch(selected_repository) if owner_snapshot is not None else 'main'
+        readme_content = get_readme_content(owner_token, selected_owner, selected_repository, owner_readmes)
+        if selected_repo_name not in repo_snapshot.readmes:
+            # Make READMEs fetched on demand searchable too
+            search_index.add_readme(selected_repo_name, readme_content)
         if readme_content:
             st.markdown("**Content:**")
             st.markdown("---")
             
             # Container for README content with fixed height
             with st.container( height=800):
-                processed_content = process_github_images(readme_content)
-                st.markdown(processed_content)
+                readme_html = None
+                if README_RENDER == "html":
+                    try:
+                        # Rendered and sanitized once per README version, then served from memory
+                        with timed('render_readme'):
+                            readme_html = get_readme_html(owner_token, selected_owner, selected_repository, readme_content,
+                                                          branch=readme_branch)
+                    except Exception:
+                        readme_html = None
+                if readme_html is not None:
+                    st.html(readme_html)
+                else:
+                    # Markdown API unavailable: let the browser render the markdown
+                    processed_content = process_github_images(readme_content)
+                    st.markdown(processed_content)
                 
                 st.markdown("---")
         else:
@@ -760,6 +519,88 @@ if selected_repo_name:
 
 
 
+# GitHub I/O metrics - collected in-process by the request hooks; the same data
+# is available to Prometheus in text format
+if SHOW_METRICS:
+    st.divider()
+    with st.expander("🛠 GitHub I/O metrics"):
+        metrics = get_metrics()
+
+        request_counts = metrics.counters('github_requests_total')
+        response_bytes = metrics.counters('github_response_bytes_total')
+        request_retries = metrics.counters('github_request_retries_total')
+        cache_lookups = metrics.counters('github_cache_lookups_total')
+
+        endpoint_rows = []
+        for labels, histogram in sorted(metrics.histograms('github_request_duration_seconds').items()):
+            label_values = dict(labels)
+            endpoint = label_values['endpoint']
+            errors = sum(count for counter_labels, count in request_counts.items()
+                         if dict(counter_labels)['endpoint'] == endpoint
+                         and dict(counter_labels)['method'] == label_values['method']
+                         and not dict(counter_labels)['status'].startswith(('2', '3')))
+            hits = cache_lookups.get((('endpoint', endpoint), ('result', 'hit')), 0)
+            lookups = sum(count for counter_labels, count in cache_lookups.items() if dict(counter_labels)['endpoint'] == endpoint)
+            endpoint_rows.append({
+                "Endpoint": endpoint,
+                "Method": label_values['method'],
+                "Requests": histogram.count,
+                "Errors": errors,
+                "Mean ms": round(histogram.sum / histogram.count * 1000, 1),
+                "p50 ms": round(histogram.quantile(0.5) * 1000, 1),
+                "p95 ms": round(histogram.quantile(0.95) * 1000, 1),
+                "KB": round(response_bytes.get((('endpoint', endpoint),), 0) / 1024, 1),
+                "Retries": request_retries.get((('endpoint', endpoint),), 0),
+                "Cache hit %": round(hits / lookups * 100, 1) if lookups else None
+            })
+        st.markdown("**Requests by endpoint**")
+        if endpoint_rows:
+            st.dataframe(endpoint_rows, use_container_width=True, hide_index=True)
+        else:
+            st.caption("No GitHub requests recorded yet")
 
-
-
+        operation_rows = [
+            {
+                "Operation": dict(labels)['operation'],
+                "Calls": histogram.count,
+                "Mean ms": round(histogram.sum / histogram.count * 1000, 1),
+                "p95 ms": round(histogram.quantile(0.95) * 1000, 1)
+            }
+            for labels, histogram in sorted(metrics.histograms('app_operation_duration_seconds').items())
+        ]
+        if operation_rows:
+            st.markdown("**Operations**")
+            st.dataframe(operation_rows, use_container_width=True, hide_index=True)
+
+        st.markdown("**Caches and rate limit**")
+        gauge_rows = [
+            {"Metric": name, "Labels": ", ".join(f"{key}={value}" for key, value in sorted(labels.items())), "Value": value}
+            for name, labels, value in metrics.gauges()
+        ]
+        st.dataframe(gauge_rows, use_container_width=True, hide_index=True)
+
+        st.markdown("**Recent requests**")
+        st.dataframe(
+            [
+                {
+                    "Time": time.strftime('%H:%M:%S', time.localtime(event['time'])),
+                    "Method": event['method'],
+                    "Path": event['path'],
+                    "Status": event['status'],
+                    "ms": round(event['elapsed'] * 1000, 1),
+                    "Wait ms": round(event['wait'] * 1000, 1),
+                    "Bytes": event['bytes'],
+                    "Retries": event['retries']
+                }
+                for event in reversed(list(metrics.recent)[-50:])
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+
+        st.download_button(
+            "Download Prometheus metrics",
+            data=metrics.prometheus_text(),
+            file_name="metrics.txt",
+            mime="text/plain"
+        )
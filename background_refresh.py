@@ -0,0 +1,305 @@
+import contextvars
+import threading
+import time
+from dataclasses import dataclass
+from importlib import import_module
+from types import MappingProxyType
+
+from rate_limit import PRIORITY_BACKGROUND, request_priority
+
+# The refresher whose loader is running in this context, for report_partial()
+_current_refresher = contextvars.ContextVar('background_refresher', default=None)
+
+
+@dataclass(frozen=True)
+class RepositorySnapshot:
+    """
+    Immutable view of the repository list published by the background refresher.
+
+    Attributes:
+        table (RepositoryTable): The repositories, most recently updated first, as a
+                                 columnar store built once here and shared by the
+                                 table view and the selectbox (table.rows() for dicts)
+        readmes (Mapping): Prefetched README info by repository name (None if missing)
+        stats (Mapping): Request count and wall time of the fetch that built it
+        sync (Mapping): Sync state: 'mode' ("full" or "incremental"), 'watermark'
+                        (highest updated_at) and 'full_sync_at' (time of the last full crawl)
+        created_at (float): time.time() when the data was fetched: when the snapshot
+                            was published, or when a restored snapshot was saved
+        version (int): Increases by one with every published snapshot
+    """
+    table: 'RepositoryTable'
+    readmes: MappingProxyType
+    stats: MappingProxyType
+    sync: MappingProxyType
+    created_at: float
+    version: int
+
+    @property
+    def age(self):
+        return time.time() - self.created_at
+
+
+def freeze_snapshot(data, version):
+    """
+    Build an immutable RepositorySnapshot from {'repos', 'readmes', 'stats', 'sync'}.
+    Data restored from disk carries 'saved_at', so its age counts from the save.
+    """
+    # Imported here so pandas loads on the refresher thread, not while the
+    # first page is being drawn
+    from repo_store import RepositoryTable
+
+    return RepositorySnapshot(
+        table=RepositoryTable(data['repos']),
+        readmes=MappingProxyType({
+            name: MappingProxyType(dict(readme)) if readme is not None else None
+            for name, readme in data.get('readmes', {}).items()
+        }),
+        stats=MappingProxyType(dict(data.get('stats', {}))),
+        sync=MappingProxyType(dict(data.get('sync', {}))),
+        created_at=data.get('saved_at', time.time()),
+        version=version
+    )
+
+
+class BackgroundRefresher:
+    """
+    Daemon thread that reloads the repository data on a schedule and publishes
+    it as an immutable RepositorySnapshot.
+
+    The Streamlit script only reads the latest snapshot, so rendering a page
+    never waits on GitHub once the first snapshot exists. Loads run at
+    background request priority.
+
+    Args:
+        loader (callable): Function taking the previous snapshot (None on the first
+                           load) and returning {'repos', 'readmes', 'stats', 'sync'}
+        interval (float): Seconds between refreshes
+        name (str): Thread name
+        retry_interval (float): Seconds before retrying after a failed load
+        restore (callable, optional): Returns saved data (or None), published
+                                      before the first load, which then only
+                                      reconciles it with GitHub
+        on_publish (callable, optional): Called with the data of every published
+                                         snapshot, e.g. to save it
+    """
+
+    def __init__(self, loader, interval, name='repository-refresher', retry_interval=30, restore=None,
+                 on_publish=None):
+        self.loader = loader
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.restore = restore
+        self.on_publish = on_publish
+        self.name = name
+        self.last_error = None
+        self.last_attempt = None
+        self._snapshot = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._published = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._thread = None
+        self._loading = False
+        self._partial = ()
+        self._listeners = []
+
+    def start(self):
+        """
+        Start the worker thread if it is not running yet.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._snapshot is None:
+                    # Load pandas for the snapshot table while the first load waits on GitHub
+                    threading.Thread(target=import_module, args=('repo_store',), name=f'{self.name}-preload',
+                                     daemon=True).start()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        if self.restore is not None:
+            try:
+                data = self.restore()
+            except Exception:
+                data = None  # A damaged store only costs a cold start
+            if data:
+                self._publish(data)
+        while True:
+            succeeded = self._refresh_once()
+            self._wake.wait(self.interval if succeeded else min(self.interval, self.retry_interval))
+            self._wake.clear()
+
+    def _refresh_once(self):
+        self.last_attempt = time.time()
+        self._loading = True
+        reset_token = _current_refresher.set(self)
+        try:
+            with request_priority(PRIORITY_BACKGROUND):
+                data = self.loader(self._snapshot)
+        except Exception as e:
+            with self._lock:
+                self.last_error = e
+                self._published.notify_all()
+            return False
+        finally:
+            _current_refresher.reset(reset_token)
+            self._loading = False
+            self._partial = ()
+
+        self.publish(data)
+        return True
+
+    def publish(self, data):
+        """
+        Freeze data into a new snapshot and make it the current one.
+
+        Args:
+            data (dict): {'repos', 'readmes', 'stats', 'sync'}
+
+        Returns:
+            RepositorySnapshot: The published snapshot
+        """
+        snapshot = self._publish(data)
+        if self.on_publish is not None:
+            try:
+                self.on_publish(data)
+            except Exception:
+                pass  # Saving is best effort; the snapshot is already published
+        return snapshot
+
+    def _publish(self, data):
+        with self._lock:
+            self._version += 1
+            snapshot = freeze_snapshot(data, self._version)
+            self._snapshot = snapshot
+            self.last_error = None
+            listeners = list(self._listeners)
+        # Listeners run before waiters are woken, so a page waiting for this
+        # snapshot also finds the data derived from it
+        for listener in listeners:
+            try:
+                listener(snapshot)
+            except Exception:
+                pass  # Derived data (e.g. a search index) must not stop publishing
+        with self._lock:
+            self._published.notify_all()
+        return snapshot
+
+    def add_listener(self, listener):
+        """
+        Call listener(snapshot) on the refresher thread after every snapshot is
+        published, e.g. to build data derived from it off the Streamlit script thread.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def partial_repos(self):
+        """
+        Returns:
+            tuple: Repositories received so far by the load in progress (see
+                   report_partial), empty when no load is reporting
+        """
+        return self._partial
+
+    def snapshot(self):
+        """
+        Returns:
+            RepositorySnapshot: The latest snapshot, or None before the first load finished
+        """
+        return self._snapshot
+
+    def wait_for_snapshot(self, timeout=None, newer_than=0):
+        """
+        Block until a snapshot with version > newer_than exists or a load fails.
+
+        Returns:
+            RepositorySnapshot: The latest snapshot (may be None or not newer on timeout / error)
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._lock:
+            error = self.last_error
+            while self._snapshot is None or self._snapshot.version <= newer_than:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._published.wait(remaining)
+                if self.last_error is not None and self.last_error is not error:
+                    break
+            return self._snapshot
+
+    def refresh_now(self, wait=False, timeout=None):
+        """
+        Wake the worker for an immediate refresh.
+
+        Args:
+            wait (bool): Block until the refreshed snapshot is published
+            timeout (float, optional): Longest time to wait
+
+        Returns:
+            RepositorySnapshot: The latest snapshot
+        """
+        newer_than = self.request_refresh()
+        if wait:
+            return self.wait_for_snapshot(timeout, newer_than=newer_than)
+        return self._snapshot
+
+    def request_refresh(self):
+        """
+        Wake the worker for an immediate refresh without waiting for it.
+
+        Returns:
+            int: Version the refreshed snapshot will be newer than, for wait_for_snapshot
+        """
+        with self._lock:
+            newer_than = self._snapshot.version if self._snapshot else 0
+            if self._loading:
+                # The load in progress may have started before this call; wait for the next one
+                newer_than += 1
+        self._wake.set()
+        return newer_than
+
+
+def report_partial(repos):
+    """
+    Let the refresher running the current loader show the repositories
+    received so far, before its snapshot is published. Does nothing when
+    called outside a refresher.
+
+    Args:
+        repos (list): Repository information dicts received so far
+    """
+    refresher = _current_refresher.get()
+    if refresher is not None:
+        refresher._partial = tuple(repos)
+
+
+_refreshers = {}
+_refreshers_lock = threading.Lock()
+
+
+def get_background_refresher(key, loader, interval, restore=None, on_publish=None):
+    """
+    Get the process-wide refresher for a key, creating and starting it on first use.
+    Later calls return the running refresher; their other arguments are ignored.
+
+    Args:
+        key: Any hashable key, e.g. (owner, backend)
+        loader (callable): Function taking the previous snapshot and returning
+                           {'repos', 'readmes', 'stats', 'sync'}
+        interval (float): Seconds between refreshes
+        restore (callable, optional): Returns saved data to publish before the first load
+        on_publish (callable, optional): Called with the data of every published snapshot
+
+    Returns:
+        BackgroundRefresher: The running refresher
+    """
+    with _refreshers_lock:
+        refresher = _refreshers.get(key)
+        if refresher is None:
+            refresher = BackgroundRefresher(loader, interval, name=f'repository-refresher-{key}',
+                                            restore=restore, on_publish=on_publish)
+            _refreshers[key] = refresher
+    return refresher.start()
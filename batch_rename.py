@@ -0,0 +1,302 @@
+import asyncio
+import os
+import re
+
+import requests
+
+from github_async import gather_sync, run_async
+from github_client import get_client
+
+RENAME_WORKERS = int(os.environ.get('GITHUB_RENAME_WORKERS', '4'))  # PATCH requests in flight at once
+MAX_NAME_LENGTH = 100
+
+# GitHub repository names: ASCII letters, digits, '.', '-' and '_'
+VALID_NAME_PATTERN = re.compile(r'^[A-Za-z0-9._-]+$')
+MAPPING_LINE_PATTERN = re.compile(r'^\s*(\S+)\s*(?:->|=>|,|\s)\s*(\S+)\s*$')
+
+
+def validate_repository_name(name):
+    """
+    Check a repository name locally, without asking GitHub.
+
+    Returns:
+        str: Why the name is invalid, or None if it is valid
+    """
+    if not name:
+        return "Name is empty"
+    if len(name) > MAX_NAME_LENGTH:
+        return f"Name is longer than {MAX_NAME_LENGTH} characters"
+    if name in ('.', '..'):
+        return f"'{name}' is reserved"
+    if not VALID_NAME_PATTERN.match(name):
+        return "Only letters, digits, '.', '-' and '_' are allowed"
+    return None
+
+
+def parse_rename_mapping(text):
+    """
+    Parse one rename per line: "old -> new", "old => new", "old, new" or "old new".
+    Blank lines and lines starting with '#' are ignored.
+
+    Returns:
+        dict: old name -> new name
+
+    Raises:
+        Exception: If a line cannot be parsed or a name is listed twice
+                   (ignoring case, as GitHub does)
+    """
+    mapping = {}
+    seen = {}  # lowercase old name -> line number
+    for line_number, line in enumerate(text.splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        match = MAPPING_LINE_PATTERN.match(line)
+        if not match:
+            raise Exception(f"Line {line_number}: expected 'old -> new', got '{line.strip()}'")
+        old_name, new_name = match.groups()
+        if old_name.lower() in seen:
+            raise Exception(f"Line {line_number}: '{old_name}' is already listed on line {seen[old_name.lower()]}")
+        seen[old_name.lower()] = line_number
+        mapping[old_name] = new_name
+    return mapping
+
+
+def regex_rename_mapping(names, pattern, replacement):
+    """
+    Build a rename mapping by applying re.sub(pattern, replacement) to every
+    name the pattern matches.
+
+    Returns:
+        dict: old name -> new name, for matching names only
+
+    Raises:
+        Exception: If the pattern or replacement is invalid
+    """
+    try:
+        compiled = re.compile(pattern)
+        return {name: compiled.sub(replacement, name) for name in names if compiled.search(name)}
+    except (re.error, IndexError) as e:
+        raise Exception(f"Invalid rename rule: {str(e)}")
+
+
+def plan_renames(names, mapping):
+    """
+    Validate a batch of renames against the cached repository list in one pass.
+
+    GitHub names are case-insensitive, so collisions are checked ignoring case.
+    A rename whose target is the current name of another repository in the
+    batch waits for that rename; each entry gets the wave it can run in. A
+    repository listed twice (in any case), two renames to the same target,
+    renames to a name that stays taken and rename cycles (a -> b, b -> a) are
+    rejected.
+
+    Args:
+        names (iterable): Current repository names (the cached list)
+        mapping (dict): old name -> new name
+
+    Returns:
+        list: One dict per mapping entry: 'old', 'new', 'status' ("ready",
+              "unchanged" or "invalid"), 'reason' and 'wave' (0-based, None unless ready)
+    """
+    existing = {name.lower(): name for name in names}
+    plan = []
+    ready = {}  # lowercase old name -> entry
+
+    sources = {}  # lowercase old name -> entries naming it
+
+    def reject(entry, reason):
+        entry['status'] = 'invalid'
+        entry['reason'] = reason
+        if ready.get(entry['old'].lower()) is entry:
+            del ready[entry['old'].lower()]
+
+    for old_name, new_name in mapping.items():
+        entry = {'old': old_name, 'new': new_name, 'status': 'ready', 'reason': '', 'wave': None}
+        plan.append(entry)
+        sources.setdefault(old_name.lower(), []).append(entry)
+        invalid_reason = validate_repository_name(new_name)
+        if len(sources[old_name.lower()]) > 1:
+            # Both renames would target the same repository; reject all of them
+            for duplicate in sources[old_name.lower()]:
+                listed = ', '.join(f"'{other['old']}'" for other in sources[old_name.lower()])
+                reject(duplicate, f"Repository is listed more than once: {listed}")
+        elif old_name.lower() not in existing:
+            reject(entry, f"Repository '{old_name}' not found")
+        elif invalid_reason:
+            reject(entry, invalid_reason)
+        elif new_name == old_name:
+            entry['status'] = 'unchanged'
+        else:
+            ready[old_name.lower()] = entry
+
+    targets = {}
+    for entry in ready.values():
+        targets.setdefault(entry['new'].lower(), []).append(entry)
+    for entries in targets.values():
+        if len(entries) > 1:
+            for entry in entries:
+                others = ', '.join(f"'{other['old']}'" for other in entries if other is not entry)
+                reject(entry, f"'{entry['new']}' is also the target of {others}")
+
+    # A taken target is only free if its current owner is renamed away first.
+    # Each rejection can take the target of another rename, so repeat until stable.
+    while True:
+        rejected = False
+        for key, entry in list(ready.items()):
+            owner = existing.get(entry['new'].lower())
+            if owner is not None and owner.lower() != key and owner.lower() not in ready:
+                reject(entry, f"Repository name '{entry['new']}' is already taken")
+                rejected = True
+        if rejected:
+            continue
+
+        depends = {}
+        for key, entry in ready.items():
+            owner = existing.get(entry['new'].lower())
+            depends[key] = owner.lower() if owner is not None and owner.lower() != key else None
+
+        waves = {}
+        for key in ready:
+            path = []
+            current = key
+            while current is not None and current not in waves and current not in path:
+                path.append(current)
+                current = depends[current]
+            if current is not None and current in path:
+                cycle = path[path.index(current):]
+                names_in_cycle = ' -> '.join(ready[cycle_key]['old'] for cycle_key in cycle + [cycle[0]])
+                for cycle_key in cycle:
+                    reject(ready[cycle_key], f"Rename cycle: {names_in_cycle}")
+                rejected = True
+                break
+            # Each rename runs one wave after the rename it waits for
+            wave = waves[current] if current is not None else -1
+            for path_key in reversed(path):
+                wave += 1
+                waves[path_key] = wave
+        if not rejected:
+            break
+
+    for key, entry in ready.items():
+        entry['wave'] = waves[key]
+    for entry in plan:
+        if entry['status'] == 'ready' and entry['wave'] is None:
+            # A rename without a place in the order must not run at all
+            reject(entry, f"Could not order the rename of '{entry['old']}' after the renames it depends on")
+    return plan
+
+
+def patch_repository_name(token, username, old_repository_name, new_repository_name):
+    """
+    Rename one repository with a single PATCH request. Unlike rename_repository
+    there are no existence checks; plan_renames already did them locally.
+
+    Returns:
+        dict: Repository JSON returned by GitHub
+
+    Raises:
+        Exception: If the rename fails
+    """
+    client = get_client(token)
+    try:
+        response = client.patch(f'/repos/{username}/{old_repository_name}', json={'name': new_repository_name})
+        if response.status_code == 200:
+            return response.json()
+        elif response.status_code == 404:
+            raise Exception(f"Repository '{old_repository_name}' not found")
+        elif response.status_code == 422:
+            raise Exception(f"Invalid repository name '{new_repository_name}' or name already exists")
+        elif response.status_code == 403:
+            raise Exception("Insufficient permissions. Token needs 'repo' scope or you don't have access to this repository")
+        elif response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        else:
+            raise Exception(f"Failed to rename repository. Status code: {response.status_code}")
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to rename repository: {str(e)}")
+
+
+async def execute_renames_async(token, username, plan, workers=RENAME_WORKERS):
+    """
+    Run the ready entries of a plan wave by wave, up to `workers` PATCH
+    requests at a time (every request still passes the rate-limit scheduler).
+    A rename waiting for one that failed is skipped.
+
+    Returns:
+        list: One dict per ready entry: 'old', 'new', 'status' ("renamed",
+              "failed" or "skipped"), 'message' and 'repository' (GitHub JSON or None)
+    """
+    semaphore = asyncio.Semaphore(workers)
+    ready = [entry for entry in plan if entry['status'] == 'ready']
+    renamed = set()
+    results = []
+
+    async def rename(entry):
+        async with semaphore:
+            try:
+                repository = await run_async(patch_repository_name, token, username, entry['old'], entry['new'])
+                return {'old': entry['old'], 'new': entry['new'], 'status': 'renamed',
+                        'message': f"Renamed '{entry['old']}' to '{entry['new']}'", 'repository': repository}
+            except Exception as e:
+                return {'old': entry['old'], 'new': entry['new'], 'status': 'failed',
+                        'message': str(e), 'repository': None}
+
+    for wave in sorted({entry['wave'] for entry in ready}):
+        runnable = []
+        for entry in ready:
+            if entry['wave'] != wave:
+                continue
+            # Waves after the first free a name taken by a rename of the previous wave
+            blocker = next((other for other in ready
+                            if other is not entry and other['old'].lower() == entry['new'].lower()), None)
+            if blocker is not None and blocker['old'] not in renamed:
+                results.append({'old': entry['old'], 'new': entry['new'], 'status': 'skipped',
+                                'message': f"'{blocker['old']}' was not renamed, so '{entry['new']}' is still taken",
+                                'repository': None})
+            else:
+                runnable.append(entry)
+
+        for result in await asyncio.gather(*(rename(entry) for entry in runnable)):
+            if result['status'] == 'renamed':
+                renamed.add(result['old'])
+            results.append(result)
+    return results
+
+
+def execute_renames(token, username, plan, workers=RENAME_WORKERS):
+    """
+    Blocking version of execute_renames_async for the Streamlit script.
+    """
+    return gather_sync(execute_renames_async(token, username, plan, workers))[0]
+
+
+def apply_renames(snapshot, results, to_repo_info):
+    """
+    Build new snapshot data with the renames applied in place, so the
+    repository list does not have to be fetched again.
+
+    Args:
+        snapshot (RepositorySnapshot): Snapshot the renames were planned against
+        results (list): Results of execute_renames
+        to_repo_info (callable): Turns GitHub repository JSON into a repo_info dict
+
+    Returns:
+        dict: {'repos', 'readmes', 'stats', 'sync'} for BackgroundRefresher.publish
+    """
+    renamed = {result['old'].lower(): result for result in results if result['status'] == 'renamed'}
+
+    repos = []
+    for repo in snapshot.table.rows():
+        result = renamed.get(repo['name'].lower())
+        if result is not None and result['repository']:
+            repos.append(to_repo_info(result['repository']))
+        else:
+            repos.append(repo)
+    repos.sort(key=lambda repo: repo['updated_at'], reverse=True)
+
+    readmes = {}
+    for name, readme in snapshot.readmes.items():
+        result = renamed.get(name.lower())
+        readmes[result['new'] if result is not None else name] = readme
+
+    return {'repos': repos, 'readmes': readmes, 'stats': dict(snapshot.stats), 'sync': dict(snapshot.sync)}
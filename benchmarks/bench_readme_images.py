@@ -0,0 +1,113 @@
+"""
+Benchmark the single-pass README image rewriter against the original
+three-pass process_github_images on large synthetic READMEs.
+
+Usage:
+    python benchmarks/bench_readme_images.py [--sizes 100000 1000000 4000000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import readme_images  # noqa: E402
+
+
+def legacy_process_github_images(content):
+    """
+    The original implementation: three re.sub passes with patterns compiled from strings on every call.
+    """
+    pattern = r'!\[([^\]]*)\]\(https://github\.com/([^/]+)/([^/]+)/blob/([^/]+)/([^)]+)\)'
+
+    def replace_url(match):
+        raw_url = f"https://raw.githubusercontent.com/{match.group(2)}/{match.group(3)}/{match.group(4)}/{match.group(5)}"
+        return f'![{match.group(1)}]({raw_url})\n\n'
+
+    processed_content = re.sub(pattern, replace_url, content)
+
+    pattern2 = r'!\[([^\]]*)\]\(https://github\.com/([^/]+)/([^/]+)/blob/([^)]+)\)'
+
+    def replace_url2(match):
+        raw_url = f"https://raw.githubusercontent.com/{match.group(2)}/{match.group(3)}/main/{match.group(4)}"
+        return f'![{match.group(1)}]({raw_url})\n\n'
+
+    processed_content = re.sub(pattern2, replace_url2, processed_content)
+
+    image_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
+
+    def add_line_breaks(match):
+        return f'![{match.group(1)}]({match.group(2)})\n\n'
+
+    processed_content = re.sub(image_pattern, add_line_breaks, processed_content)
+
+    # display_readme_with_images then scanned the text once more for the images
+    images = re.findall(image_pattern, processed_content)
+    return processed_content, images
+
+
+def make_readme(size, seed=0):
+    """
+    Build a synthetic README of roughly `size` characters with a mix of prose,
+    code, links, blob images, branchless blob images and already-raw images.
+    """
+    rng = random.Random(seed)
+    blocks = [
+        "## Section\n\nSome text describing the project with a [link](https://example.com/page).\n\n",
+        "```python\nprint('hello world')\n```\n\n",
+        "![screenshot](https://github.com/HKIBIMTechnical/demo/blob/main/docs/screenshot.png)\n",
+        "![logo](https://github.com/HKIBIMTechnical/demo/blob/logo.png)\n",
+        "![badge](https://img.shields.io/badge/build-passing-green.svg)\n",
+        "- item one\n- item two\n- item three\n\n",
+    ]
+    parts = []
+    total = 0
+    while total < size:
+        block = rng.choice(blocks)
+        parts.append(block)
+        total += len(block)
+    return ''.join(parts)
+
+
+def best_of(func, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def cold_rewrite(content):
+    readme_images._rewrite_cache.clear()
+    return readme_images.rewrite_readme_images(content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 4_000_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'images':>7} {'legacy':>10} {'single':>10} {'memo':>10} {'speedup':>8}")
+    for size in args.sizes:
+        content = make_readme(size)
+
+        _, legacy_images = legacy_process_github_images(content)
+        _, images = cold_rewrite(content)
+        if len(images) != len(legacy_images):
+            raise SystemExit(f"Image count mismatch: {len(images)} != {len(legacy_images)}")
+
+        legacy = best_of(legacy_process_github_images, content, args.repeat)
+        single = best_of(cold_rewrite, content, args.repeat)
+        memo = best_of(readme_images.rewrite_readme_images, content, args.repeat)
+
+        print(f"{size:>10} {len(images):>7} {legacy * 1000:>8.1f}ms {single * 1000:>8.1f}ms "
+              f"{memo * 1000:>8.2f}ms {legacy / single:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
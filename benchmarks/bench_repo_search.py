@@ -0,0 +1,81 @@
+"""
+Benchmark the repository search index: full build, incremental sync after a
+few repositories changed, and query latency for text and facet searches.
+
+Usage:
+    python benchmarks/bench_repo_search.py [--repos 10000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_repo_store import make_repos  # noqa: E402
+from repo_search import RepositorySearchIndex  # noqa: E402
+
+QUERIES = [
+    ('name substring', dict(query='00042')),
+    ('description words', dict(query='description benchmarking')),
+    ('readme text', dict(query='installation revit')),
+    ('short term', dict(query='re')),
+    ('language facet', dict(languages=['Python', 'C#'])),
+    ('text + facets', dict(query='repository', fork=False, min_stars=100, updated_after='2024-06-01T00:00:00Z')),
+]
+
+
+def make_readmes(repos):
+    readmes = {}
+    for i, repo in enumerate(repos):
+        if i % 4 == 0:
+            readmes[repo['name']] = None
+            continue
+        readmes[repo['name']] = {
+            'sha': f'{i:040x}',
+            'content': f"# {repo['name']}\n\nInstallation guide for the Revit add-in number {i}.\n" * 5
+        }
+    return readmes
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repos', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    repos = make_repos(args.repos)
+    readmes = make_readmes(repos)
+    index = RepositorySearchIndex()
+
+    start = time.perf_counter()
+    index.update(repos, readmes)
+    build_time = time.perf_counter() - start
+
+    # Ten repositories pushed to, one deleted
+    changed = [dict(repo) for repo in repos[1:]]
+    for repo in changed[:10]:
+        repo['updated_at'] = '2030-01-01T00:00:00Z'
+    start = time.perf_counter()
+    touched = index.update(changed, readmes)
+    sync_time = time.perf_counter() - start
+
+    print(f"repositories:        {args.repos}")
+    print(f"full build:          {build_time * 1000:8.1f} ms")
+    print(f"incremental sync:    {sync_time * 1000:8.1f} ms ({touched} rows touched)")
+    for label, kwargs in QUERIES:
+        elapsed, results = best_of(lambda: index.search(**kwargs), args.repeat)
+        print(f"{label + ':':<20} {elapsed * 1000:8.2f} ms ({len(results)} matches)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark the columnar RepositoryTable against the original list-of-dicts
+flow, which rebuilt the table rows, reversed them and created a DataFrame on
+every rerun.
+
+Measures memory of the stored repositories and the per-rerun cost of
+producing the table DataFrame and the selectbox options.
+
+Usage:
+    python benchmarks/bench_repo_store.py [--repos 10000] [--reruns 20]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repo_store import RepositoryTable  # noqa: E402
+
+LANGUAGES = ['Python', 'C#', 'JavaScript', 'TypeScript', None, 'HTML', 'Jupyter Notebook']
+
+
+def make_repos(count, owner='HKIBIMTechnical'):
+    """
+    Build `count` synthetic repo_info dicts, most recently updated first.
+    """
+    repos = []
+    for i in range(count):
+        name = f'repository-{count - i:05d}'
+        repos.append({
+            'id': 100000 + i,
+            'name': name,
+            'url': f'https://api.github.com/repos/{owner}/{name}',
+            'html_url': f'https://github.com/{owner}/{name}',
+            'clone_url': f'https://github.com/{owner}/{name}.git',
+            'ssh_url': f'git@github.com:{owner}/{name}.git',
+            'description': f'Description of {name} used for benchmarking' if i % 3 else None,
+            'language': LANGUAGES[i % len(LANGUAGES)],
+            'private': i % 7 == 0,
+            'fork': i % 5 == 0,
+            'stars': i % 250,
+            'forks': i % 40,
+            'updated_at': f'2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00Z'
+        })
+    return repos
+
+
+def legacy_rerun(repos):
+    """
+    What every rerun did before: rebuild rows, reverse, DataFrame, selectbox options.
+    """
+    table_data = []
+    for i, repo in enumerate(repos):
+        table_data.append({
+            "Name": repo['name'],
+            "URL": repo['html_url'],
+            "Index": i
+        })
+    table_data.reverse()
+    df_display = pd.DataFrame(table_data)
+    options = [repo['name'] for repo in repos][::-1]
+    return df_display, options
+
+
+def columnar_rerun(table):
+    """
+    What a rerun does now: read prebuilt attributes.
+    """
+    return table.display_frame, table.names_oldest_first
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def best_of(func, arg, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repos', type=int, default=10_000)
+    parser.add_argument('--reruns', type=int, default=20)
+    args = parser.parse_args()
+
+    repos, dict_bytes = measure_memory(lambda: make_repos(args.repos))
+
+    start = time.perf_counter()
+    table = RepositoryTable(repos)
+    build_time = time.perf_counter() - start
+
+    legacy = best_of(legacy_rerun, repos, args.reruns)
+    columnar = best_of(columnar_rerun, table, args.reruns)
+
+    print(f"repositories:             {args.repos}")
+    print(f"list of dicts memory:     {dict_bytes / 1024 / 1024:8.2f} MB")
+    print(f"columnar table memory:    {table.memory_usage() / 1024 / 1024:8.2f} MB")
+    print(f"table build (once):       {build_time * 1000:8.2f} ms")
+    print(f"legacy rerun:             {legacy * 1000:8.2f} ms")
+    print(f"columnar rerun:           {columnar * 1000:8.4f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+"""
+Startup benchmark for the Streamlit app, run against the local stand-in API
+in fake_github.py.
+
+Every sample starts fresh Python processes, so nothing is cached between them:
+
+- import: importing streamlit and the modules app.py imports
+- first paint: from process start until the page title is drawn
+- first run: from process start until the first script run ends (the first
+  snapshot included)
+- rerun: a second script run in the same process
+- restored first paint / first run: the same for a restart that finds the
+  snapshot the previous process saved
+
+It also records whether importing the app's modules loaded pandas.
+
+Usage:
+    python benchmarks/bench_startup.py [--samples 5] [--latency-ms 50] [--repos 250] [--output results.json]
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+APP_PATH = os.path.join(REPO_DIR, 'app.py')
+
+BENCH_RATE_LIMIT = 10_000_000  # Budget of the fake API, so pacing never dominates the timings
+MEASURES = ('import_ms', 'first_paint_ms', 'first_run_ms', 'rerun_ms', 'restored_first_paint_ms', 'restored_first_run_ms')
+SAVE_WAIT_TIMEOUT = 30  # Seconds a child waits for its snapshot to be saved before exiting
+
+
+def app_modules():
+    """
+    The repository's own modules app.py imports at the top level, in its order,
+    read from app.py itself so the benchmark imports what the app does.
+    """
+    with open(APP_PATH, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), APP_PATH)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            if os.path.exists(os.path.join(REPO_DIR, f'{name}.py')) and name not in modules:
+                modules.append(name)
+    return modules
+
+
+def child(mode):
+    """
+    One cold start, printed as a JSON line.
+
+    Args:
+        mode (str): "import" times importing the app's modules; "app" runs the
+                    app twice, timed from the start of the process
+    """
+    process_start = time.perf_counter()
+    sys.path.insert(0, REPO_DIR)
+
+    if mode == 'import':
+        import importlib
+
+        import streamlit  # noqa: F401
+        for module in app_modules():
+            importlib.import_module(module)
+        print(json.dumps({
+            'import_ms': round((time.perf_counter() - process_start) * 1000, 3),
+            'pandas_on_import': 'pandas' in sys.modules
+        }))
+        return
+
+    import streamlit
+    from streamlit.testing.v1 import AppTest
+
+    # The title is the first element the page draws
+    painted = []
+    title = streamlit.title
+
+    def timed_title(*args, **kwargs):
+        painted.append(time.perf_counter())
+        return title(*args, **kwargs)
+
+    streamlit.title = timed_title
+
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.secrets['github_classic_token_test_001'] = 'bench-token'
+    app.secrets['change_name_code'] = 'bench'
+    app.run()
+    first_run_ms = (time.perf_counter() - process_start) * 1000
+
+    start = time.perf_counter()
+    app.run()
+    rerun_ms = (time.perf_counter() - start) * 1000
+
+    # The snapshot is saved right after it is published; let that finish so
+    # the next process can restore it
+    from snapshot_store import get_snapshot_store
+    deadline = time.time() + SAVE_WAIT_TIMEOUT
+    while not get_snapshot_store().stats()['versions'] and time.time() < deadline:
+        time.sleep(0.05)
+
+    print(json.dumps({
+        'first_paint_ms': round((painted[0] - process_start) * 1000, 3) if painted else None,
+        'first_run_ms': round(first_run_ms, 3),
+        'rerun_ms': round(rerun_ms, 3),
+        'exception': [str(exception.value) for exception in app.exception]
+    }))
+
+
+def start_child(mode, env):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode],
+        env=env, cwd=REPO_DIR, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(samples, latency_ms, repos):
+    sys.path.insert(0, BENCHMARK_DIR)
+    from fake_github import start_server
+
+    server, _, base_url = start_server(latency=latency_ms / 1000, default_repos=repos, rate_limit=BENCH_RATE_LIMIT)
+    env = dict(os.environ, GITHUB_API_URL=base_url, GITHUB_CACHE_PATH=':memory:', GITHUB_RATE_BURST=str(BENCH_RATE_LIMIT))
+
+    runs = []
+    for sample in range(samples):
+        with tempfile.TemporaryDirectory() as directory:
+            sample_env = dict(env, GITHUB_SNAPSHOT_PATH=os.path.join(directory, 'snapshots.sqlite'))
+            result = start_child('import', sample_env)
+            result.update(start_child('app', sample_env))
+            restored = start_child('app', sample_env)
+        if result['exception'] or restored['exception']:
+            raise Exception(f"The app raised: {result['exception'] or restored['exception']}")
+        result['restored_first_paint_ms'] = restored['first_paint_ms']
+        result['restored_first_run_ms'] = restored['first_run_ms']
+        runs.append(result)
+        print(f"  sample {sample + 1}: " + '  '.join(f"{name} {result[name]:.1f}" for name in MEASURES), flush=True)
+
+    server.shutdown()
+    summary = {name: round(statistics.median(result[name] for result in runs), 3) for name in MEASURES}
+    summary['pandas_on_import'] = any(result['pandas_on_import'] for result in runs)
+    return summary, runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=5, help='Fresh processes to start')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Delay the fake API adds to every response')
+    parser.add_argument('--repos', type=int, default=250, help='Repositories of the app owner on the fake API')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/startup-<commit>.json)')
+    parser.add_argument('--child', choices=('import', 'app'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    sys.path.insert(0, BENCHMARK_DIR)
+    from run_benchmarks import git_commit
+
+    commit = git_commit()
+    summary, runs = run(args.samples, args.latency_ms, args.repos)
+    print('median: ' + '  '.join(f"{name} {summary[name]:.1f} ms" for name in MEASURES)
+          + f"  pandas on import: {summary['pandas_on_import']}")
+
+    output = args.output or os.path.join(BENCHMARK_DIR, 'results', f'startup-{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': sys.version.split()[0],
+            'samples': args.samples,
+            'latency_ms': args.latency_ms,
+            'repos': args.repos,
+            'summary': summary,
+            'runs': runs
+        }, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
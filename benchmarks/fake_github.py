@@ -0,0 +1,371 @@
+"""
+Local stand-in for the parts of the GitHub REST API the app uses, for
+benchmarks and offline runs.
+
+Serves:
+    GET   /users/{owner}/repos, /user/repos     Link pagination, sort/direction
+    GET   /repos/{owner}/{repo}                 repository JSON
+    PATCH /repos/{owner}/{repo}                 rename ({"name": ...}, 422 on conflicts)
+    GET   /repos/{owner}/{repo}/contents/{path} files (base64), directory listings (1,000 max), raw
+    GET   /repos/{owner}/{repo}/git/trees/{ref} recursive tree
+    GET   /repos/{owner}/{repo}/git/blobs/{sha}
+    POST  /markdown                             trivial markdown rendering
+    POST  /graphql, /api/graphql                repositoryOwner.repositories cursor pages with README
+    GET   /rate_limit
+
+Every JSON response carries an ETag and honours If-None-Match (a 304 does
+not use rate-limit budget, as on GitHub), plus X-RateLimit-* headers.
+An owner named "bench<N>" has N repositories, and each of its repositories
+has N files under docs/; any other owner has DEFAULT_REPOS.
+
+Usage:
+    python benchmarks/fake_github.py [--port 8000] [--latency-ms 0]
+    GITHUB_API_URL=http://127.0.0.1:8000 streamlit run app.py
+"""
+import argparse
+import base64
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_REPOS = 250
+RATE_LIMIT = 5000
+LANGUAGES = ['Python', 'C#', 'JavaScript', None]
+
+
+def blob_sha(data):
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+def make_readme(owner, name, images=3):
+    lines = [f'# {name}', '', f'Synthetic repository owned by {owner}.', '']
+    for i in range(images):
+        lines.append(f'![image {i}](https://github.com/{owner}/{name}/blob/main/images/{i}.png)')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+class FakeGitHub:
+    """
+    In-memory GitHub state shared by the request handlers.
+
+    Args:
+        latency (float): Seconds added to every response
+        default_repos (int): Repository count of owners not named "bench<N>"
+        rate_limit (int): Requests per hour reported in X-RateLimit-Limit
+    """
+
+    def __init__(self, latency=0.0, default_repos=DEFAULT_REPOS, rate_limit=RATE_LIMIT):
+        self.latency = latency
+        self.default_repos = default_repos
+        self.rate_limit = rate_limit
+        self.lock = threading.Lock()
+        self.owners = {}  # owner -> list of repository dicts, most recently updated first
+        self._files = {}  # (owner, repo name) -> files, built on first use
+        self.requests = 0
+        self.not_modified = 0
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 3600
+
+    def repos(self, owner):
+        with self.lock:
+            repos = self.owners.get(owner)
+            if repos is None:
+                match = re.match(r'^bench(\d+)$', owner)
+                count = int(match.group(1)) if match else self.default_repos
+                repos = [self._make_repo(owner, i, count) for i in range(count)]
+                self.owners[owner] = repos
+            return repos
+
+    def _make_repo(self, owner, i, count):
+        name = f'repo{i}'
+        return {
+            'id': int(hashlib.md5(f'{owner}/{i}'.encode('utf-8')).hexdigest()[:8], 16),
+            'name': name,
+            'full_name': f'{owner}/{name}',
+            'url': f'https://api.github.com/repos/{owner}/{name}',
+            'html_url': f'https://github.com/{owner}/{name}',
+            'clone_url': f'https://github.com/{owner}/{name}.git',
+            'ssh_url': f'git@github.com:{owner}/{name}.git',
+            'description': f'Synthetic repository {i}' if i % 3 else None,
+            'language': LANGUAGES[i % len(LANGUAGES)],
+            'private': False,
+            'fork': i % 7 == 0,
+            'stargazers_count': i % 100,
+            'forks_count': i % 10,
+            # Spread over time, newest first
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(1700000000 + (count - i) * 60)),
+            'default_branch': 'main',
+            'files': count
+        }
+
+    def find_repo(self, owner, name):
+        for repo in self.repos(owner):
+            if repo['name'].lower() == name.lower():
+                return repo
+        return None
+
+    def files(self, owner, repo):
+        """
+        Returns:
+            dict: path -> bytes for every file of a repository
+        """
+        key = (owner, repo['name'])
+        files = self._files.get(key)
+        if files is None:
+            files = {'README.md': make_readme(owner, repo['name']).encode('utf-8')}
+            for i in range(repo['files']):
+                files[f'docs/file{i}.txt'] = f'File {i} of {repo["name"]}\n'.encode('utf-8')
+            self._files[key] = files
+        return files
+
+    def spend(self, not_modified):
+        with self.lock:
+            self.requests += 1
+            if not_modified:
+                self.not_modified += 1
+            elif self.remaining > 0:
+                self.remaining -= 1
+            return self.remaining
+
+
+def public_repo(repo):
+    return {key: value for key, value in repo.items() if key != 'files'}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    state = None  # FakeGitHub, set by start_server()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, obj, headers=None):
+        body = json.dumps(obj).encode('utf-8')
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        not_modified = status == 200 and self.headers.get('If-None-Match') == etag
+        self.send_body(304 if not_modified else status, b'' if not_modified else body, 'application/json',
+                       dict(headers or {}, ETag=etag))
+
+    def send_body(self, status, body, content_type, headers=None):
+        if self.state.latency:
+            time.sleep(self.state.latency)
+        remaining = self.state.spend(status == 304)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('X-RateLimit-Limit', str(self.state.rate_limit))
+        self.send_header('X-RateLimit-Remaining', str(remaining))
+        self.send_header('X-RateLimit-Reset', str(self.state.reset_at))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+
+        match = re.match(r'^/users/([^/]+)/repos$', path) or re.match(r'^/user/repos$', path)
+        if match:
+            owner = match.group(1) if match.groups() else 'authenticated'
+            repos = self.state.repos(owner)
+            if query.get('direction', ['desc'])[0] == 'asc':
+                repos = repos[::-1]
+            per_page = min(int(query.get('per_page', ['30'])[0]), 100)
+            page = int(query.get('page', ['1'])[0])
+            last = max(1, -(-len(repos) // per_page))
+            base = f'http://{self.headers["Host"]}{path}'
+            links = [f'<{base}?per_page={per_page}&page={last}>; rel="last"']
+            if page < last:
+                links.insert(0, f'<{base}?per_page={per_page}&page={page + 1}>; rel="next"')
+            page_repos = [public_repo(repo) for repo in repos[(page - 1) * per_page:page * per_page]]
+            return self.send_json(200, page_repos, {'Link': ', '.join(links)})
+
+        if path == '/rate_limit':
+            core = {'limit': self.state.rate_limit, 'remaining': self.state.remaining, 'reset': self.state.reset_at}
+            return self.send_json(200, {'resources': {'core': core}, 'rate': core})
+
+        match = re.match(r'^/repos/([^/]+)/([^/]+)(/.*)?$', path)
+        if not match:
+            return self.send_json(404, {'message': 'Not Found'})
+        owner, name, rest = match.group(1), match.group(2), match.group(3) or ''
+        repo = self.state.find_repo(owner, name)
+        if repo is None:
+            return self.send_json(404, {'message': 'Not Found'})
+        if rest == '':
+            return self.send_json(200, public_repo(repo))
+
+        files = self.state.files(owner, repo)
+
+        if rest.startswith('/git/trees/'):
+            directories = sorted({path.rsplit('/', 1)[0] for path in files if '/' in path})
+            tree = [{'path': directory, 'type': 'tree', 'mode': '040000', 'sha': blob_sha(directory.encode())}
+                    for directory in directories]
+            tree += [{'path': file_path, 'type': 'blob', 'mode': '100644', 'size': len(data), 'sha': blob_sha(data)}
+                     for file_path, data in files.items()]
+            return self.send_json(200, {'sha': blob_sha(repr(sorted(files)).encode()), 'tree': tree, 'truncated': False})
+
+        if rest.startswith('/git/blobs/'):
+            sha = rest.rsplit('/', 1)[1]
+            for data in files.values():
+                if blob_sha(data) == sha:
+                    return self.send_json(200, {'sha': sha, 'size': len(data), 'encoding': 'base64',
+                                                'content': base64.b64encode(data).decode('ascii')})
+            return self.send_json(404, {'message': 'Not Found'})
+
+        if rest.startswith('/contents'):
+            file_path = rest[len('/contents'):].strip('/')
+            if file_path in files:
+                data = files[file_path]
+                if 'raw' in self.headers.get('Accept', ''):
+                    return self.send_body(200, data, 'application/octet-stream')
+                return self.send_json(200, {
+                    'type': 'file', 'name': file_path.rsplit('/', 1)[-1], 'path': file_path,
+                    'size': len(data), 'sha': blob_sha(data), 'encoding': 'base64',
+                    'content': base64.b64encode(data).decode('ascii'),
+                    'url': f'https://api.github.com/repos/{owner}/{name}/contents/{file_path}',
+                    'html_url': f'https://github.com/{owner}/{name}/blob/main/{file_path}',
+                    'download_url': f'https://raw.githubusercontent.com/{owner}/{name}/main/{file_path}'
+                })
+            prefix = f'{file_path}/' if file_path else ''
+            children = {}
+            for child in files:
+                if child.startswith(prefix):
+                    head = child[len(prefix):].split('/', 1)
+                    children[prefix + head[0]] = 'dir' if len(head) > 1 else 'file'
+            if not children:
+                return self.send_json(404, {'message': 'Not Found'})
+            listing = [{'type': kind, 'name': child.rsplit('/', 1)[-1], 'path': child,
+                        'size': len(files.get(child, b'')), 'sha': blob_sha(files.get(child, child.encode()))}
+                       for child, kind in sorted(children.items())]
+            # The Contents API lists at most 1,000 entries
+            return self.send_json(200, listing[:1000])
+
+        return self.send_json(404, {'message': 'Not Found'})
+
+    def do_PATCH(self):
+        match = re.match(r'^/repos/([^/]+)/([^/]+)$', urlparse(self.path).path)
+        body = self.read_json()
+        if not match:
+            return self.send_json(404, {'message': 'Not Found'})
+        owner, name = match.groups()
+        repo = self.state.find_repo(owner, name)
+        if repo is None:
+            return self.send_json(404, {'message': 'Not Found'})
+        new_name = body.get('name', repo['name'])
+        if new_name.lower() != repo['name'].lower() and self.state.find_repo(owner, new_name) is not None:
+            return self.send_json(422, {'message': 'name already exists on this account'})
+        with self.state.lock:
+            repo['name'] = new_name
+            repo['full_name'] = f'{owner}/{new_name}'
+            repo['url'] = f'https://api.github.com/repos/{owner}/{new_name}'
+            repo['html_url'] = f'https://github.com/{owner}/{new_name}'
+            repo['clone_url'] = f'https://github.com/{owner}/{new_name}.git'
+            repo['ssh_url'] = f'git@github.com:{owner}/{new_name}.git'
+            repo['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+            # Most recently updated first, as sort=updated lists it
+            repos = self.state.owners[owner]
+            repos.remove(repo)
+            repos.insert(0, repo)
+        return self.send_json(200, public_repo(repo))
+
+    def do_POST(self):
+        body = self.read_json()
+        path = urlparse(self.path).path
+        if path == '/markdown':
+            text = body.get('text', '')
+            rendered = ''.join(f'<p>{line}</p>\n' for line in text.splitlines() if line.strip())
+            return self.send_body(200, rendered.encode('utf-8'), 'text/html')
+        if path in ('/graphql', '/api/graphql'):
+            return self.graphql(body)
+        return self.send_json(404, {'message': 'Not Found'})
+
+    def graphql(self, body):
+        """
+        Answer the repositoryOwner query of github_graphql.py. Cursors are
+        opaque base64 strings holding the index of the last returned repository.
+        """
+        if 'repositoryOwner' not in body.get('query', ''):
+            return self.send_json(200, {'errors': [{'message': 'Only the repositoryOwner query is supported'}]})
+        variables = body.get('variables') or {}
+        owner = variables['login']
+        repos = self.state.repos(owner)
+        first = min(int(variables.get('first') or 100), 100)
+        after = variables.get('after')
+        start = int(base64.b64decode(after).decode('ascii').split(':', 1)[1]) + 1 if after else 0
+
+        nodes = []
+        for repo in repos[start:start + first]:
+            readme = self.state.files(owner, repo)['README.md']
+            nodes.append({
+                'databaseId': repo['id'],
+                'name': repo['name'],
+                'nameWithOwner': repo['full_name'],
+                'url': repo['html_url'],
+                'sshUrl': repo['ssh_url'],
+                'description': repo['description'],
+                'isPrivate': repo['private'],
+                'isFork': repo['fork'],
+                'stargazerCount': repo['stargazers_count'],
+                'forkCount': repo['forks_count'],
+                'updatedAt': repo['updated_at'],
+                'defaultBranchRef': {'name': repo['default_branch']},
+                'primaryLanguage': {'name': repo['language']} if repo['language'] else None,
+                'readme': {'oid': blob_sha(readme), 'byteSize': len(readme), 'isBinary': False,
+                           'text': readme.decode('utf-8')}
+            })
+        end = start + len(nodes) - 1
+        page_info = {
+            'hasNextPage': end + 1 < len(repos),
+            'endCursor': base64.b64encode(f'cursor:{end}'.encode('ascii')).decode('ascii') if nodes else None
+        }
+        return self.send_json(200, {'data': {'repositoryOwner': {
+            'repositories': {'pageInfo': page_info, 'nodes': nodes}
+        }}})
+
+
+def start_server(port=0, latency=0.0, default_repos=DEFAULT_REPOS, host='127.0.0.1', rate_limit=RATE_LIMIT):
+    """
+    Start the fake API in a daemon thread.
+
+    Returns:
+        tuple: (server, state, base_url)
+    """
+    state = FakeGitHub(latency=latency, default_repos=default_repos, rate_limit=rate_limit)
+    handler = type('FakeGitHubHandler', (Handler,), {'state': state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-github', daemon=True).start()
+    return server, state, f'http://{host}:{server.server_port}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay added to every response')
+    parser.add_argument('--repos', type=int, default=DEFAULT_REPOS, help='Repositories of owners not named bench<N>')
+    args = parser.parse_args()
+
+    server, _, base_url = start_server(args.port, args.latency_ms / 1000, args.repos, args.host)
+    print(f'Fake GitHub API at {base_url} (Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+"""
+Offline benchmark suite for the GitHub helpers, run against the local
+stand-in API in fake_github.py.
+
+Times get_all_repositories (all fields and projected to name/updated_at),
+get_fileInfo_content, check_file_or_folder_exists
+and process_github_images at several sizes (repositories per owner, files per
+repository, images per README). "cold" is the first call with empty caches
+and a new connection; "warm" is the median of repeated calls that can use
+the ETag cache, blob cache and path index. Results are written as JSON
+tagged with the current commit, so two runs can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 10,100,1000,10000] [--repeat 5]
+                                        [--latency-ms 0] [--output results.json]
+    python benchmarks/run_benchmarks.py --compare before.json after.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, REPO_DIR)
+
+from fake_github import start_server  # noqa: E402
+
+DEFAULT_SIZES = '10,100,1000,10000'
+BENCH_RATE_LIMIT = 10_000_000  # Budget of the fake API, so pacing never dominates the timings
+PROJECTED_FIELDS = ('name', 'updated_at')  # Field projection measured by get_all_repositories[name]
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def measure(cold_call, warm_call, repeat, state):
+    """
+    Time one cold call and `repeat` warm calls, counting requests served by the fake API.
+
+    Returns:
+        dict: 'cold_ms', 'warm_ms' (median), 'warm_min_ms', 'cold_requests', 'warm_requests' (per call)
+    """
+    before = state.requests
+    start = time.perf_counter()
+    cold_call()
+    cold = time.perf_counter() - start
+    cold_requests = state.requests - before
+
+    timings = []
+    before = state.requests
+    for _ in range(repeat):
+        start = time.perf_counter()
+        warm_call()
+        timings.append(time.perf_counter() - start)
+    warm_requests = (state.requests - before) / repeat if repeat else 0
+
+    return {
+        'cold_ms': round(cold * 1000, 3),
+        'warm_ms': round(statistics.median(timings) * 1000, 3) if timings else None,
+        'warm_min_ms': round(min(timings) * 1000, 3) if timings else None,
+        'cold_requests': cold_requests,
+        'warm_requests': warm_requests
+    }
+
+
+def make_image_readme(images, salt):
+    lines = [f'# Benchmark README {salt}', '']
+    for i in range(images):
+        if i % 2:
+            lines.append(f'![image {i}](https://github.com/owner/repo/blob/main/images/{i}.png)')
+        else:
+            lines.append(f'![image {i}](https://example.com/images/{i}.png)')
+        lines.append(f'Paragraph {i} describing the image above.')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def run(sizes, repeat, latency_ms):
+    server, state, base_url = start_server(latency=latency_ms / 1000, rate_limit=BENCH_RATE_LIMIT)
+    # The client reads its settings at import time
+    os.environ['GITHUB_API_URL'] = base_url
+    os.environ['GITHUB_CACHE_PATH'] = ':memory:'
+    os.environ['GITHUB_RATE_BURST'] = str(BENCH_RATE_LIMIT)
+
+    from github_api import check_file_or_folder_exists, get_all_repositories, get_fileInfo_content
+    from readme_images import process_github_images
+
+    results = {}
+    counter = [0]
+
+    def fresh_token():
+        # A new token means a new client (connection pool) and new response cache keys
+        counter[0] += 1
+        return f'bench-token-{counter[0]}'
+
+    for size in sizes:
+        owner = f'bench{size}'
+        warm_token = fresh_token()
+        print(f'size {size}:', flush=True)
+
+        cases = {
+            'get_all_repositories': (
+                lambda: get_all_repositories(fresh_token(), owner),
+                lambda: get_all_repositories(warm_token, owner)
+            ),
+            'get_all_repositories[name]': (
+                lambda: get_all_repositories(fresh_token(), owner, fields=PROJECTED_FIELDS),
+                lambda: get_all_repositories(warm_token, owner, fields=PROJECTED_FIELDS)
+            ),
+            'get_fileInfo_content': (
+                lambda: get_fileInfo_content(fresh_token(), owner, 'repo1', 'README.md'),
+                lambda: get_fileInfo_content(warm_token, owner, 'repo0', 'README.md')
+            ),
+            'check_file_or_folder_exists': (
+                lambda: check_file_or_folder_exists(fresh_token(), owner, 'repo2', f'docs/file{size - 1}.txt'),
+                lambda: check_file_or_folder_exists(warm_token, owner, 'repo0', f'docs/file{size - 1}.txt')
+            ),
+            'process_github_images': (
+                lambda: process_github_images(make_image_readme(size, time.perf_counter())),
+                lambda: process_github_images(make_image_readme(size, 'warm'))
+            )
+        }
+
+        # Prime the warm paths once so "warm" really measures cached calls
+        for _, warm_call in cases.values():
+            warm_call()
+
+        for name, (cold_call, warm_call) in cases.items():
+            result = measure(cold_call, warm_call, repeat, state)
+            results.setdefault(name, {})[str(size)] = result
+            print(f"  {name:<28} cold {result['cold_ms']:9.2f} ms ({result['cold_requests']} req)  "
+                  f"warm {result['warm_ms']:9.2f} ms ({result['warm_requests']:.1f} req)", flush=True)
+
+    server.shutdown()
+    return results
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{before['commit']} -> {after['commit']}")
+    print(f"{'benchmark':<28} {'size':>6} {'cold before':>12} {'cold after':>11} {'warm before':>12} {'warm after':>11} {'warm x':>7}")
+    for name, sizes in after['results'].items():
+        for size, result in sizes.items():
+            old = before['results'].get(name, {}).get(size)
+            if old is None:
+                continue
+            speedup = old['warm_ms'] / result['warm_ms'] if result['warm_ms'] else float('inf')
+            print(f"{name:<28} {size:>6} {old['cold_ms']:12.2f} {result['cold_ms']:11.2f} "
+                  f"{old['warm_ms']:12.2f} {result['warm_ms']:11.2f} {speedup:7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='Comma separated sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='Warm calls per benchmark')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Delay the fake API adds to every response')
+    parser.add_argument('--output', help='Result file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'), help='Compare two result files')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    commit = git_commit()
+    results = run(sizes, args.repeat, args.latency_ms)
+
+    output = args.output or os.path.join(BENCHMARK_DIR, 'results', f'{commit}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'latency_ms': args.latency_ms,
+            'results': results
+        }, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
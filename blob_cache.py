@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_BLOB_CACHE_MAX_BYTES = int(os.environ.get('BLOB_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+DEFAULT_PATH_ENTRIES = int(os.environ.get('BLOB_CACHE_PATH_ENTRIES', '4096'))  # Remembered path -> SHA mappings
+
+
+class BlobCache:
+    """
+    Content-addressed cache of decoded file contents keyed by git blob SHA.
+
+    A blob SHA identifies the exact file content, so entries never go stale; the
+    cache is only bounded by a byte budget with least-recently-used eviction.
+    It also remembers which SHA a path key pointed to last, so a recently
+    viewed file can be served without any request. Path keys must include a
+    token fingerprint, so a private file is never served to another token.
+
+    Args:
+        max_bytes (int): Maximum total size of the cached contents
+        max_paths (int): Path -> SHA mappings kept, least recently used dropped first
+    """
+
+    def __init__(self, max_bytes=DEFAULT_BLOB_CACHE_MAX_BYTES, max_paths=DEFAULT_PATH_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_paths = max_paths
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._blobs = OrderedDict()  # sha -> (content, size)
+        self._paths = OrderedDict()  # (token fingerprint, owner, repo, path, branch) -> (sha, seen_at)
+
+    def get(self, sha):
+        """
+        Returns:
+            The cached content for the SHA, or None on a miss
+        """
+        with self._lock:
+            entry = self._blobs.get(sha)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._blobs.move_to_end(sha)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, sha, content, size):
+        """
+        Store decoded content under its blob SHA.
+
+        Args:
+            sha (str): Git blob SHA
+            content: Decoded content (usually str)
+            size (int): Size in bytes charged against the budget
+        """
+        if not sha or size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._blobs.pop(sha, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._blobs[sha] = (content, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._blobs.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def set_path_sha(self, path_key, sha):
+        """
+        Remember which blob a repository path currently points to.
+        """
+        with self._lock:
+            self._paths[path_key] = (sha, time.time())
+            self._paths.move_to_end(path_key)
+            while len(self._paths) > self.max_paths:
+                self._paths.popitem(last=False)
+
+    def get_path_sha(self, path_key, max_age):
+        """
+        Returns:
+            str: The blob SHA last seen for the path if it was seen less than
+                 max_age seconds ago, otherwise None
+        """
+        with self._lock:
+            entry = self._paths.get(path_key)
+        if entry is None or time.time() - entry[1] >= max_age:
+            return None
+        return entry[0]
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss counters, number of entries and bytes used
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._blobs),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Process-wide README/file content cache, shared by every session
+_blob_cache = BlobCache()
+
+
+def get_blob_cache():
+    return _blob_cache
@@ -0,0 +1,912 @@
+import base64
+import codecs
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from background_refresh import report_partial
+from blob_cache import get_blob_cache
+from github_async import make_async
+from github_client import get_client
+from github_graphql import get_repositories_with_readmes
+from metrics import timed_operation
+from rate_limit import RateLimitError, current_priority, request_priority
+from readme_render import prerender_readmes
+from repo_fetch import MAX_PAGE_WORKERS, RepositoryFetcher, make_projector
+from repo_tree import get_path_index, peek_path_index, token_fingerprint
+from shared_cache import get_shared_cache
+
+# Defaults for the helpers, overridable through the environment; the Streamlit
+# app replaces them with its secrets through configure()
+README_PREFETCH_COUNT = int(os.environ.get('README_PREFETCH_COUNT', '20'))  # READMEs of the most recently updated repos to prefetch
+FULL_SYNC_INTERVAL = float(os.environ.get('FULL_SYNC_INTERVAL', '3600'))  # Seconds between full crawls that detect deletions
+FILE_CONTENT_MAX_AGE = float(os.environ.get('FILE_CONTENT_MAX_AGE', '60'))  # Seconds a viewed file is served without revalidation
+README_RENDER = os.environ.get('README_RENDER', 'html')  # "html" (pre-rendered, cached per blob SHA) or "markdown"
+CONTENTS_LISTING_LIMIT = 1000  # The Contents API lists at most this many directory entries
+STREAM_CHUNK_SIZE = 64 * 1024  # Bytes per chunk when streaming raw file content
+
+
+def configure(readme_prefetch_count=None, full_sync_interval=None, file_content_max_age=None, readme_render=None):
+    """
+    Override the module defaults, e.g. with the app's Streamlit secrets.
+    Arguments left as None keep their current value.
+    """
+    global README_PREFETCH_COUNT, FULL_SYNC_INTERVAL, FILE_CONTENT_MAX_AGE, README_RENDER
+    if readme_prefetch_count is not None:
+        README_PREFETCH_COUNT = int(readme_prefetch_count)
+    if full_sync_interval is not None:
+        FULL_SYNC_INTERVAL = float(full_sync_interval)
+    if file_content_max_age is not None:
+        FILE_CONTENT_MAX_AGE = float(file_content_max_age)
+    if readme_render is not None:
+        README_RENDER = readme_render
+
+
+def get_public_repositories(username, fields=None):
+    """
+    Get public repositories for a specific username without requiring authentication.
+    
+    Args:
+        username (str): GitHub username to get repositories for
+        fields (iterable, optional): Keys to keep in each dict (default: all of REPO_FIELDS)
+    
+    Returns:
+        list: List of dictionaries containing repository information
+    """
+    try:
+        # No authentication headers needed for public repos
+        return list(RepositoryFetcher(None, username, fields).iter_repositories())
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to fetch repositories: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error processing repositories: {str(e)}")
+
+# Full repository information dict from a GitHub REST repository object
+build_repo_info = make_projector()
+
+def iter_repositories(token, username=None, fields=None):
+    """
+    Yield repositories as their pages arrive, most recently updated first,
+    so a caller can start showing them before the last page is in.
+    
+    Args:
+        token (str): GitHub personal access token (None for public repositories only)
+        username (str, optional): Specific username; None for the authenticated user
+        fields (iterable, optional): Keys to keep in each dict (default: all of REPO_FIELDS)
+    
+    Yields:
+        dict: Repository information
+    
+    Raises:
+        Exception: If the API request fails
+    """
+    try:
+        yield from RepositoryFetcher(token, username, fields).iter_repositories()
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to fetch repositories: {str(e)}")
+
+@timed_operation('get_all_repositories')
+def get_all_repositories(token, username=None, stats=None, fields=None, on_page=None):
+    """
+    Get all repositories for the authenticated user or a specific username.
+    The first page is fetched alone; its Link header tells how many pages exist,
+    and the remaining pages are then fetched concurrently (at most
+    MAX_PAGE_WORKERS at a time) and joined back in page order.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str, optional): Specific username to get repositories for. 
+                                 If None, gets repositories for the authenticated user.
+        stats (dict, optional): If given, filled with 'requests' (number of page
+                                requests), 'pages' (pages parsed) and 'elapsed'
+                                (wall time in seconds)
+        fields (iterable, optional): Keys to keep in each dict (default: all of REPO_FIELDS)
+        on_page (callable, optional): Called with the repositories received so far
+                                      after every page
+    
+    Returns:
+        list: List of dictionaries containing repository information
+              Each dict has 'name', 'url', 'html_url', 'clone_url', 'ssh_url'
+    
+    Raises:
+        Exception: If the API request fails
+    """
+    repositories = []
+    
+    try:
+        fetcher = RepositoryFetcher(token, username, fields)
+        for page_repos in fetcher.iter_pages():
+            repositories.extend(page_repos)
+            if on_page is not None:
+                on_page(repositories)
+        
+        if stats is not None:
+            stats['requests'] = fetcher.requests
+            stats['pages'] = fetcher.pages
+            stats['elapsed'] = fetcher.elapsed
+            
+        return repositories
+        
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to fetch repositories: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error processing repositories: {str(e)}")
+
+def merge_repositories(previous, changed):
+    """
+    Merge changed repositories into a previous repository list.
+    A changed repository replaces the previous entry with the same id, so renames
+    are applied in place; the result is sorted by updated_at, most recent first.
+    
+    Args:
+        previous (list): Previous repository information dicts
+        changed (list): Repositories updated since the previous list was built
+    
+    Returns:
+        list: The merged repository list
+    """
+    changed_ids = {repo['id'] for repo in changed}
+    merged = list(changed) + [repo for repo in previous if repo['id'] not in changed_ids]
+    merged.sort(key=lambda repo: repo['updated_at'], reverse=True)
+    return merged
+
+def merge_readmes(readmes, previous, merged):
+    """
+    Keep the README entries that still belong to the same repository after a
+    merge. READMEs are stored by name, so the entry of a renamed or deleted
+    repository is dropped, and so is one whose name now belongs to another
+    repository (renamed into a name that was freed).
+    
+    Args:
+        readmes (Mapping): README info by repository name from the previous snapshot
+        previous (list): Repository list the READMEs were loaded for
+        merged (list): Repository list after the merge
+    
+    Returns:
+        dict: The README entries still valid for the merged list
+    """
+    previous_ids = {repo['name']: repo['id'] for repo in previous}
+    merged_ids = {repo['name']: repo['id'] for repo in merged}
+    return {
+        name: readme for name, readme in readmes.items()
+        if name in merged_ids and previous_ids.get(name) == merged_ids[name]
+    }
+
+@timed_operation('sync_repositories')
+def sync_repositories(token, username, previous, watermark, stats=None):
+    """
+    Incrementally sync a repository list using an updated_at watermark.
+    Pages are requested newest first and paging stops at the first repository
+    older than the watermark, so an unchanged account costs a single
+    (conditional) request. Deleted repositories are not detected; run a full
+    get_all_repositories from time to time for that.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str, optional): Specific username; None for the authenticated user
+        previous (list): Repository list from the last sync
+        watermark (str): Highest updated_at seen by the last sync (ISO 8601)
+        stats (dict, optional): Filled with 'requests', 'pages', 'elapsed' and 'changed'
+    
+    Returns:
+        tuple: (repositories, changed)
+            repositories (list): The merged repository list
+            changed (list): Repositories updated at or after the watermark
+    
+    Raises:
+        Exception: If the API request fails
+    """
+    changed = []
+    
+    try:
+        # Pages one by one, so nothing past the watermark is requested
+        fetcher = RepositoryFetcher(token, username)
+        for repo in fetcher.iter_repositories(concurrent=False):
+            # ISO 8601 timestamps compare correctly as strings; equal ones are
+            # re-read because several repositories can share a second
+            if repo['updated_at'] < watermark:
+                break
+            changed.append(repo)
+        
+        if stats is not None:
+            stats['requests'] = fetcher.requests
+            stats['pages'] = fetcher.pages
+            stats['elapsed'] = fetcher.elapsed
+            stats['changed'] = len(changed)
+        
+        return merge_repositories(previous, changed), changed
+        
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to sync repositories: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error syncing repositories: {str(e)}")
+
+def rename_repository(token, username, old_repository_name, new_repository_name):
+    """
+    Rename a GitHub repository.
+    
+    Args:
+        token (str): GitHub personal access token with repo scope
+        username (str): GitHub username (owner of the repository)
+        old_repository_name (str): Current name of the repository
+        new_repository_name (str): New name for the repository
+    
+    Returns:
+        dict: Repository rename information including new URLs and details
+        
+    Raises:
+        Exception: If the repository rename fails
+    """
+    client = get_client(token)
+    
+    # API endpoint for renaming repository
+    url = f'/repos/{username}/{old_repository_name}'
+    
+    # Repository rename data
+    data = {
+        'name': new_repository_name
+    }
+    
+    try:
+        # First check if the old repository exists
+        check_response = client.get(url)
+        if check_response.status_code == 404:
+            raise Exception(f"Repository '{old_repository_name}' not found")
+        elif check_response.status_code != 200:
+            check_response.raise_for_status()
+        
+        # Check if the new name is already taken
+        new_url = f'/repos/{username}/{new_repository_name}'
+        new_check_response = client.get(new_url)
+        if new_check_response.status_code == 200:
+            raise Exception(f"Repository name '{new_repository_name}' is already taken")
+        
+        # Make the PATCH request to rename the repository
+        response = client.patch(url, json=data)
+        
+        if response.status_code == 200:
+            # Repository successfully renamed
+            result = response.json()
+            
+            return {
+                'status': 'success',
+                'action': 'renamed',
+                'old_name': old_repository_name,
+                'new_name': new_repository_name,
+                'full_name': result.get('full_name', ''),
+                'html_url': result.get('html_url', ''),
+                'clone_url': result.get('clone_url', ''),
+                'ssh_url': result.get('ssh_url', ''),
+                'private': result.get('private', False),
+                'description': result.get('description', ''),
+                'created_at': result.get('created_at', ''),
+                'updated_at': result.get('updated_at', ''),
+                'message': f"Repository '{old_repository_name}' successfully renamed to '{new_repository_name}'"
+            }
+        elif response.status_code == 422:
+            raise Exception(f"Invalid repository name '{new_repository_name}' or name already exists")
+        elif response.status_code == 403:
+            raise Exception("Insufficient permissions. Token needs 'repo' scope or you don't have access to this repository")
+        elif response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        else:
+            raise Exception(f"Failed to rename repository. Status code: {response.status_code}")
+            
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to rename repository: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error renaming repository: {str(e)}")
+@timed_operation('get_fileInfo_content')
+def get_fileInfo_content(token, username, repository_Name, file_path="README.md", branch="main"):
+    """
+    Get file content or directory listing from a GitHub repository.
+    file content include file name, path, content, size, sha, url, html_url, download_url, encoding.
+    directory listing include file name, path, type, size, sha, url, html_url, download_url.
+    current file README.md is under root folder, you can set your own file path.
+    if file under folder, file path should be "folder/file.ext" for example.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        file_path (str): Path to the file or directory (empty string for root)
+        branch (str): Branch name (default: "main")
+    
+    Returns:
+        dict: File content or directory listing information
+        
+    Raises:
+        Exception: If the file retrieval fails
+    """
+    client = get_client(token)
+    
+    # API endpoint for getting repository contents
+    url = f'/repos/{username}/{repository_Name}/contents/{file_path}'
+    
+    # Add branch parameter if specified
+    params = {'ref': branch} if branch else None
+    
+    try:
+        # A directory already in a recent path index is listed without any request
+        index = peek_path_index(token, username, repository_Name, branch or 'HEAD')
+        if index is not None and index.list_dir(file_path) is not None:
+            return get_directory_listing(index, file_path)
+        
+        # Conditional request: an unchanged file is served from the response cache
+        response = client.cached_get(url, params=params)
+        
+        if response.status_code == 200:
+            content_data = response.json()
+            
+            # Check if it's a file or directory
+            if isinstance(content_data, dict):
+                # Single file
+                if content_data.get('type') == 'file':
+                    encoding = content_data.get('encoding', '')
+                    sha = content_data.get('sha', '')
+                    blob_cache = get_blob_cache()
+                    
+                    # Same blob SHA means same content: reuse the decoded copy
+                    content = blob_cache.get(sha) if sha else None
+                    if content is None:
+                        # Decode content if it's encoded
+                        content = content_data.get('content', '')
+                        size = len(content)
+                        
+                        if encoding == 'base64':
+                            try:
+                                raw = base64.b64decode(content)
+                                content = raw.decode('utf-8')
+                                size = len(raw)
+                            except:
+                                content = content_data.get('content', '')
+                        
+                        blob_cache.put(sha, content, size)
+                    
+                    if sha:
+                        blob_cache.set_path_sha(
+                            (token_fingerprint(token), username, repository_Name, file_path, branch), sha
+                        )
+                    
+                    return {
+                        'type': 'file',
+                        'name': content_data.get('name', ''),
+                        'path': content_data.get('path', ''),
+                        'content': content,
+                        'size': content_data.get('size', 0),
+                        'sha': content_data.get('sha', ''),
+                        'url': content_data.get('url', ''),
+                        'html_url': content_data.get('html_url', ''),
+                        'download_url': content_data.get('download_url', ''),
+                        'encoding': encoding
+                    }
+                elif content_data.get('type') == 'dir':
+                    # Directory - return list of files
+                    return {
+                        'type': 'directory',
+                        'path': content_data.get('path', ''),
+                        'files': content_data
+                    }
+                else:
+                    return content_data
+            elif isinstance(content_data, list):
+                if len(content_data) >= CONTENTS_LISTING_LIMIT:
+                    # The Contents API truncates large directories; list them from the tree instead
+                    index = get_path_index(token, username, repository_Name, branch or 'HEAD')
+                    if index is not None and index.list_dir(file_path) is not None:
+                        return get_directory_listing(index, file_path)
+                
+                # Directory listing
+                files = []
+                for item in content_data:
+                    file_info = {
+                        'name': item.get('name', ''),
+                        'path': item.get('path', ''),
+                        'type': item.get('type', ''),  # 'file' or 'dir'
+                        'size': item.get('size', 0),
+                        'sha': item.get('sha', ''),
+                        'url': item.get('url', ''),
+                        'html_url': item.get('html_url', ''),
+                        'download_url': item.get('download_url', '')
+                    }
+                    files.append(file_info)
+                
+                return {
+                    'type': 'directory',
+                    'path': file_path if file_path else 'root',
+                    'files': files
+                }
+            else:
+                return content_data
+                
+        elif response.status_code == 404:
+            raise Exception(f"File or directory '{file_path}' not found in repository '{repository_Name}'")
+        elif response.status_code == 403:
+            raise Exception("Insufficient permissions or repository is private")
+        elif response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        else:
+            raise Exception(f"Failed to get file content. Status code: {response.status_code}")
+            
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to get file content: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error getting file content: {str(e)}")
+def get_directory_listing(index, file_path=""):
+    """
+    Build a directory listing in the get_fileInfo_content format from a path index.
+    
+    Args:
+        index (PathIndex): Path index of the repository branch
+        file_path (str): Directory path (empty string for root)
+    
+    Returns:
+        dict: Directory listing information
+    """
+    files = []
+    for entry in index.list_dir(file_path):
+        files.append({
+            'name': entry['name'],
+            'path': entry['path'],
+            'type': 'dir' if entry['type'] == 'directory' else entry['type'],  # 'file' or 'dir'
+            'size': entry['size'],
+            'sha': entry['sha'],
+            'url': '',
+            'html_url': index.html_url(entry['path']),
+            'download_url': index.download_url(entry['path'])
+        })
+    
+    return {
+        'type': 'directory',
+        'path': file_path if file_path else 'root',
+        'files': files
+    }
+
+def get_file_content_string(token, username, repository_Name, file_path="README.md", branch="main", max_age=None):
+    """
+    Get content of a specific file from a GitHub repository.
+    current file README.md is under root folder, you can set your own file path.
+    if file under folder, file path should be "folder/file.ext" for example.
+    A file viewed less than max_age seconds ago is served straight from the blob
+    cache; otherwise it is revalidated (a 304 reuses the cached decoded content).
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        file_path (str): Path to the specific file
+        branch (str): Branch name (default: "main")
+        max_age (float, optional): Seconds to trust the last seen blob SHA
+                                   (default: FILE_CONTENT_MAX_AGE)
+    
+    Returns:
+        str: File content as string
+        
+    Raises:
+        Exception: If the file retrieval fails
+    """
+    if max_age is None:
+        max_age = FILE_CONTENT_MAX_AGE
+    
+    blob_cache = get_blob_cache()
+    # Keyed by token too: a private file is only served to the token that read it
+    sha = blob_cache.get_path_sha((token_fingerprint(token), username, repository_Name, file_path, branch), max_age)
+    if sha:
+        content = blob_cache.get(sha)
+        if content is not None:
+            return content
+    
+    result = get_fileInfo_content(token, username, repository_Name, file_path, branch)
+    
+    if result.get('type') == 'file':
+        return result.get('content', '')
+    else:
+        raise Exception(f"Path '{file_path}' is not a file")
+def stream_file_content(token, username, repository_Name, file_path, branch="main",
+                        chunk_size=STREAM_CHUNK_SIZE, max_bytes=None, decode_unicode=False):
+    """
+    Stream a file from a GitHub repository in chunks with constant memory.
+    Uses the raw media type of the Contents API, which serves files up to 100 MB
+    (the JSON/base64 form used by get_fileInfo_content stops at 1 MB).
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        file_path (str): Path to the file, e.g. "folder/file.ext"
+        branch (str): Branch name (default: "main")
+        chunk_size (int): Bytes per chunk
+        max_bytes (int, optional): Stop with an exception once the file exceeds this size
+        decode_unicode (bool): Yield UTF-8 decoded str chunks instead of bytes
+    
+    Yields:
+        bytes or str: Consecutive chunks of the file
+        
+    Raises:
+        Exception: If the file is missing, too large or the download fails
+    """
+    client = get_client(token)
+    url = f'/repos/{username}/{repository_Name}/contents/{file_path}'
+    params = {'ref': branch} if branch else None
+    headers = {'Accept': 'application/vnd.github.raw'}
+    
+    try:
+        with client.get(url, params=params, headers=headers, stream=True) as response:
+            if response.status_code == 404:
+                raise Exception(f"File '{file_path}' not found in repository '{repository_Name}'")
+            elif response.status_code == 403:
+                raise Exception("Insufficient permissions or repository is private")
+            elif response.status_code == 401:
+                raise Exception("Authentication failed. Check your token and permissions")
+            elif response.status_code != 200:
+                raise Exception(f"Failed to download file. Status code: {response.status_code}")
+            
+            content_length = response.headers.get('Content-Length')
+            if max_bytes is not None and content_length and int(content_length) > max_bytes:
+                raise Exception(f"File '{file_path}' is {content_length} bytes, more than the {max_bytes} byte limit")
+            
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace') if decode_unicode else None
+            received = 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                received += len(chunk)
+                if max_bytes is not None and received > max_bytes:
+                    raise Exception(f"File '{file_path}' is more than the {max_bytes} byte limit")
+                yield decoder.decode(chunk) if decoder else chunk
+            
+            if decoder:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+                    
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to download file: {str(e)}")
+
+def download_file(token, username, repository_Name, file_path, destination, branch="main", max_bytes=None):
+    """
+    Save a file from a GitHub repository to disk or a writable binary file object
+    without holding it in memory.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        file_path (str): Path to the file in the repository
+        destination (str or file): Local path, or an object with a write(bytes) method
+        branch (str): Branch name (default: "main")
+        max_bytes (int, optional): Size limit; larger files raise an exception
+    
+    Returns:
+        int: Number of bytes written
+        
+    Raises:
+        Exception: If the download fails
+    """
+    chunks = stream_file_content(token, username, repository_Name, file_path, branch, max_bytes=max_bytes)
+    
+    if hasattr(destination, 'write'):
+        written = 0
+        for chunk in chunks:
+            destination.write(chunk)
+            written += len(chunk)
+        return written
+    
+    # Write to a temporary file first so a failed download leaves no partial file behind
+    temp_path = f"{destination}.part"
+    written = 0
+    try:
+        with open(temp_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                written += len(chunk)
+        os.replace(temp_path, destination)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return written
+
+def check_file_or_folder_exists(token, username, repository_Name, file_path="README.md", branch="main"):
+    """
+    Check if a file or folder exists in a GitHub repository.
+    current file README.md is under root folder, you can set your own file path.
+    if file under folder, file path should be "folder/file.ext" for example.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        file_path (str): Path to the file or folder to check
+        branch (str): Branch name (default: "main")
+    
+    Returns:
+        dict: Existence status and type information
+            {
+                'exists': bool,
+                'type': str,  # 'file', 'directory', or 'unknown'
+                'path': str,
+                'name': str,
+                'size': int,
+                'sha': str
+            }
+        
+    Raises:
+        Exception: If the check fails
+    """
+    client = get_client(token)
+    
+    # API endpoint for checking repository contents
+    url = f'/repos/{username}/{repository_Name}/contents/{file_path}'
+    
+    # Add branch parameter if specified
+    params = {'ref': branch} if branch else None
+    
+    try:
+        # Answer from the path index (one recursive tree request per repository and tree SHA)
+        index = get_path_index(token, username, repository_Name, branch or 'HEAD')
+        if index is None:
+            # Repository or branch does not exist
+            return {
+                'exists': False,
+                'type': 'none',
+                'path': file_path,
+                'name': file_path.split('/')[-1] if '/' in file_path else file_path,
+                'size': 0,
+                'sha': '',
+                'html_url': '',
+                'download_url': ''
+            }
+        
+        entry = index.get(file_path)
+        if entry is not None:
+            return {
+                'exists': True,
+                'type': entry['type'],  # 'file', 'directory', 'symlink' or 'submodule'
+                'path': entry['path'] or file_path,
+                'name': entry['name'],
+                'size': entry['size'],
+                'sha': entry['sha'],
+                'html_url': index.html_url(entry['path']),
+                'download_url': index.download_url(entry['path'])
+            }
+        elif not index.truncated:
+            # File or directory does not exist
+            return {
+                'exists': False,
+                'type': 'none',
+                'path': file_path,
+                'name': file_path.split('/')[-1] if '/' in file_path else file_path,
+                'size': 0,
+                'sha': '',
+                'html_url': '',
+                'download_url': ''
+            }
+        
+        # The tree was truncated, so a missing path is unknown: ask the Contents API
+        response = client.get(url, params=params)
+        
+        if response.status_code == 200:
+            content_data = response.json()
+            
+            # File or directory exists
+            if isinstance(content_data, dict):
+                item_type = content_data.get('type', 'unknown')
+                return {
+                    'exists': True,
+                    'type': item_type,  # 'file' or 'dir'
+                    'path': content_data.get('path', ''),
+                    'name': content_data.get('name', ''),
+                    'size': content_data.get('size', 0),
+                    'sha': content_data.get('sha', ''),
+                    'html_url': content_data.get('html_url', ''),
+                    'download_url': content_data.get('download_url', '')
+                }
+            elif isinstance(content_data, list):
+                # This shouldn't happen for a specific path, but handle it
+                return {
+                    'exists': True,
+                    'type': 'directory',
+                    'path': file_path,
+                    'name': file_path.split('/')[-1] if '/' in file_path else file_path,
+                    'size': 0,
+                    'sha': '',
+                    'html_url': '',
+                    'download_url': ''
+                }
+            else:
+                return {
+                    'exists': True,
+                    'type': 'unknown',
+                    'path': file_path,
+                    'name': file_path.split('/')[-1] if '/' in file_path else file_path,
+                    'size': 0,
+                    'sha': '',
+                    'html_url': '',
+                    'download_url': ''
+                }
+                
+        elif response.status_code == 404:
+            # File or directory does not exist
+            return {
+                'exists': False,
+                'type': 'none',
+                'path': file_path,
+                'name': file_path.split('/')[-1] if '/' in file_path else file_path,
+                'size': 0,
+                'sha': '',
+                'html_url': '',
+                'download_url': ''
+            }
+        elif response.status_code == 403:
+            raise Exception("Insufficient permissions or repository is private")
+        elif response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        else:
+            raise Exception(f"Failed to check file existence. Status code: {response.status_code}")
+            
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to check file existence: {str(e)}")
+    except RateLimitError:
+        raise  # Callers tell rate limiting apart from other failures
+    except Exception as e:
+        raise Exception(f"Error checking file existence: {str(e)}")
+
+def load_repositories(token, username, backend="rest", stats=None):
+    """
+    Load the repository list with the configured backend.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username or organization
+        backend (str): "rest" (one request per 100 repositories) or "graphql"
+                       (batched queries that also prefetch every README.md)
+        stats (dict, optional): Filled with request count and wall time
+    
+    Returns:
+        tuple: (repositories, readmes) where readmes maps repository name to the
+               prefetched README info (None if missing); empty for the REST backend
+    """
+    if backend == "graphql":
+        return get_repositories_with_readmes(token, username, stats=stats)
+    # Inside the background refresher, every page is shown before the last one arrives
+    return get_all_repositories(token, username, stats=stats, on_page=report_partial), {}
+
+@timed_operation('load_repository_snapshot')
+def load_repository_snapshot(token, username, backend="rest", previous=None):
+    """
+    Load everything the page needs about the repositories in one value that can
+    be shared between sessions.
+    With the REST backend and a previous snapshot, only repositories updated
+    since its watermark are fetched (sync_repositories); a full crawl, which
+    also drops deleted repositories, runs every FULL_SYNC_INTERVAL seconds.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username or organization
+        backend (str): "rest" or "graphql"
+        previous (RepositorySnapshot, optional): The snapshot to sync from
+    
+    Returns:
+        dict: {'repos': list, 'readmes': dict, 'stats': dict,
+               'sync': {'mode', 'watermark', 'full_sync_at'}}
+    """
+    stats = {}
+    now = time.time()
+    
+    if (backend == "rest" and previous is not None and previous.sync.get('watermark')
+            and now - previous.sync['full_sync_at'] < FULL_SYNC_INTERVAL):
+        previous_repos = previous.table.rows()
+        repos, changed = sync_repositories(token, username, previous_repos, previous.sync['watermark'], stats=stats)
+        readmes = merge_readmes(previous.readmes, previous_repos, repos)
+        changed_names = {repo['name'] for repo in changed}
+        sync = {'mode': 'incremental', 'full_sync_at': previous.sync['full_sync_at']}
+    else:
+        repos, readmes = load_repositories(token, username, backend, stats=stats)
+        changed_names = None
+        sync = {'mode': 'full', 'full_sync_at': now}
+    
+    # The REST backend has no README prefetch; warm the most recently updated ones
+    # that are new to the snapshot or changed since the last sync
+    if backend == "rest" and README_PREFETCH_COUNT > 0:
+        names = [
+            repo['name'] for repo in repos[:README_PREFETCH_COUNT]
+            if changed_names is None or repo['name'] in changed_names or repo['name'] not in readmes
+        ]
+        if names:
+            readmes.update(prefetch_readmes(token, username, names))
+    
+    # Render the most recently updated READMEs to HTML ahead of time; unchanged
+    # ones are already in the HTML cache and cost nothing
+    if README_RENDER == "html" and README_PREFETCH_COUNT > 0:
+        prerender_readmes(token, username, {
+            repo['name']: readmes.get(repo['name']) for repo in repos[:README_PREFETCH_COUNT]
+        }, branches={repo['name']: repo.get('default_branch') for repo in repos[:README_PREFETCH_COUNT]})
+    
+    sync['watermark'] = max((repo['updated_at'] for repo in repos), default='')
+    return {'repos': repos, 'readmes': readmes, 'stats': stats, 'sync': sync}
+
+@timed_operation('prefetch_readmes')
+def prefetch_readmes(token, username, repository_Names):
+    """
+    Fetch README.md of several repositories concurrently.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repositories)
+        repository_Names (list): Repository names
+    
+    Returns:
+        dict: repository name -> README info from get_fileInfo_content, or None if
+              the repository has no README.md. Repositories whose README could
+              not be fetched for another reason are left out.
+    """
+    priority = current_priority()  # Workers run in other threads; keep the caller's priority
+    
+    def fetch_readme(repository_Name):
+        with request_priority(priority):
+            try:
+                return repository_Name, get_fileInfo_content(token, username, repository_Name, "README.md")
+            except Exception as e:
+                if "not found" in str(e).lower():
+                    return repository_Name, None
+                return repository_Name, False
+    
+    readmes = {}
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+        for repository_Name, readme in executor.map(fetch_readme, repository_Names):
+            if readme is not False:
+                readmes[repository_Name] = readme
+    return readmes
+
+@timed_operation('get_readme_content')
+def get_readme_content(token, username, repository_Name, readmes):
+    """
+    Get README.md content, using the GraphQL prefetch when it covers the repository.
+    
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        readmes (dict): Prefetched READMEs from load_repositories
+    
+    Returns:
+        str: README content
+        
+    Raises:
+        Exception: If the README does not exist or cannot be fetched
+    """
+    if repository_Name in readmes:
+        readme = readmes[repository_Name]
+        if readme is None:
+            raise Exception(f"File or directory 'README.md' not found in repository '{repository_Name}'")
+        return readme['content']
+    
+    # Shared by all sessions with the same token: concurrent views of one README
+    # make a single request, and a README older than FILE_CONTENT_MAX_AGE is
+    # shown while it is revalidated. A private README never reaches another token.
+    readme_cache = get_shared_cache('readmes', FILE_CONTENT_MAX_AGE)
+    return readme_cache.get(
+        (token_fingerprint(token), username, repository_Name),
+        lambda: get_file_content_string(token, username, repository_Name, "README.md", max_age=0),
+        background_loader=lambda: get_file_content_string(token, username, repository_Name, "README.md", max_age=0)
+    )
+
+
+# Async versions of the helpers. They share the GitHubClient connection pool,
+# rate limiting and response cache with the blocking ones; gather_sync() runs
+# several of them at once from the script.
+get_all_repositories_async = make_async(get_all_repositories)
+get_fileInfo_content_async = make_async(get_fileInfo_content)
+check_file_or_folder_exists_async = make_async(check_file_or_folder_exists)
+rename_repository_async = make_async(rename_repository)
+
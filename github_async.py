@@ -0,0 +1,83 @@
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+ASYNC_WORKERS = int(os.environ.get('GITHUB_ASYNC_WORKERS', '16'))  # Helper calls that may block at once
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """
+    Get the process-wide thread pool the async helpers run on, creating it on first use.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=ASYNC_WORKERS, thread_name_prefix='github-async')
+        return _executor
+
+
+async def run_async(func, *args, **kwargs):
+    """
+    Await a blocking GitHub helper without blocking the event loop.
+
+    The call runs on the shared thread pool and goes through the same
+    GitHubClient as the synchronous helpers, so it shares their connection
+    pool, rate-limit scheduler and response cache. The caller's context
+    (e.g. request_priority) is carried over to the worker thread.
+
+    Returns:
+        Whatever func returned
+
+    Raises:
+        Exception: Whatever func raised
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args, **kwargs))
+
+
+def make_async(func):
+    """
+    Build the async version of a blocking helper.
+
+    Example:
+        get_fileInfo_content_async = make_async(get_fileInfo_content)
+        info = await get_fileInfo_content_async(token, userName, repo, "README.md")
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_async(func, *args, **kwargs)
+    wrapper.__name__ = f'{func.__name__}_async'
+    return wrapper
+
+
+async def _gather(awaitables, return_exceptions):
+    return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+
+def gather_sync(*awaitables, return_exceptions=False):
+    """
+    Sync facade for the Streamlit script: run independent async helper calls
+    concurrently and wait for all of them, so the page waits for the slowest
+    call instead of the sum of all calls.
+
+    Args:
+        *awaitables: Coroutines, e.g. get_fileInfo_content_async(...)
+        return_exceptions (bool): Return exceptions in the result list instead of raising the first one
+
+    Returns:
+        list: Results in the order the awaitables were given
+
+    Example:
+        readme, exists = gather_sync(
+            get_fileInfo_content_async(token, userName, repo, "README.md"),
+            check_file_or_folder_exists_async(token, userName, repo, "docs")
+        )
+    """
+    return asyncio.run(_gather(awaitables, return_exceptions))
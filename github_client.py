@@ -0,0 +1,335 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from rate_limit import IDEMPOTENT_METHODS, RateLimitError, RateLimitScheduler, current_priority
+from response_cache import build_cached_response, get_response_cache
+
+# Default settings for every GitHub client, overridable through the environment
+# so the app can be pointed at GitHub Enterprise or a local stand-in server.
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com')
+GITHUB_GRAPHQL_URL = os.environ.get('GITHUB_GRAPHQL_URL')  # Default: derived from the API root
+DEFAULT_POOL_SIZE = int(os.environ.get('GITHUB_POOL_SIZE', '20'))
+DEFAULT_TIMEOUT = float(os.environ.get('GITHUB_TIMEOUT', '30'))
+
+# Functions called with a dict describing every finished request / cache lookup
+_request_hooks = []
+_cache_hooks = []
+
+
+def add_request_hook(hook):
+    """
+    Call hook(event) after every GitHub request, once its retries are done.
+
+    The event has 'method', 'path' (without host and query), 'status' (HTTP
+    status, or the exception name if no response arrived), 'elapsed' (seconds,
+    including rate-limit waits and retries), 'wait' (seconds spent waiting for
+    budget), 'bytes' (body size, 0 for streamed responses without
+    Content-Length), 'retries', 'priority' and 'remaining' (rate-limit budget left).
+    """
+    if hook not in _request_hooks:
+        _request_hooks.append(hook)
+
+
+def add_cache_hook(hook):
+    """
+    Call hook(event) after every cached_get, with 'path' and 'result':
+    "hit" (304 Not Modified, served from the cache), "changed" (cached but
+    modified) or "miss" (not cached before).
+    """
+    if hook not in _cache_hooks:
+        _cache_hooks.append(hook)
+
+
+def _emit(hooks, event):
+    for hook in hooks:
+        try:
+            hook(event)
+        except Exception:
+            # Instrumentation must never break a request
+            pass
+
+
+DEFAULT_HEADERS = {
+    'Accept': 'application/vnd.github.v3+json',
+    'User-Agent': 'HKIBIM-Github-Repositories',
+    'Connection': 'keep-alive'
+}
+
+
+def derive_graphql_url(base_url):
+    """
+    GraphQL endpoint for a REST API root. GitHub.com serves it at
+    https://api.github.com/graphql, GitHub Enterprise Server next to the REST
+    root: https://host/api/v3 -> https://host/api/graphql.
+    """
+    base_url = base_url.rstrip('/')
+    if base_url.endswith('/api/v3'):
+        return base_url[:-len('/v3')] + '/graphql'
+    return f'{base_url}/graphql'
+
+
+class GitHubClient:
+    """
+    Thin wrapper around a pooled, keep-alive requests.Session for the GitHub API.
+
+    All connections to the API host are kept open and reused, so only the first
+    request pays for the TCP+TLS handshake. Every request is paced by a
+    RateLimitScheduler per rate-limit resource (REST "core" and "graphql") and
+    retried with jittered backoff on rate limiting and server errors.
+
+    Args:
+        token (str, optional): GitHub personal access token. None for anonymous access.
+        base_url (str): API root, e.g. "https://api.github.com"
+        graphql_url (str, optional): GraphQL endpoint (default: derived from base_url)
+        pool_size (int): Maximum number of pooled connections per host
+        timeout (float): Default timeout in seconds for every request
+        cache (ResponseCache, optional): Cache used by cached_get for conditional requests
+    """
+
+    def __init__(self, token=None, base_url=GITHUB_API_URL, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT,
+                 cache=None, graphql_url=GITHUB_GRAPHQL_URL):
+        self.token = token
+        self.base_url = base_url.rstrip('/')
+        self.graphql_url = graphql_url or derive_graphql_url(self.base_url)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.schedulers = {
+            'core': RateLimitScheduler(),
+            'graphql': RateLimitScheduler()
+        }
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.session.headers.update(DEFAULT_HEADERS)
+        if token:
+            self.session.headers['Authorization'] = f'token {token}'
+
+    def url(self, path):
+        """
+        Build an absolute URL from an API path. Absolute URLs are returned unchanged.
+        """
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def scheduler_for(self, path):
+        """
+        Get the rate-limit scheduler for the resource a path belongs to.
+        """
+        url = self.url(path)
+        return self.schedulers['graphql' if url == self.graphql_url or url.rstrip('/').endswith('/graphql') else 'core']
+
+    def rate_limit_status(self):
+        """
+        Returns:
+            dict: Resource name -> current budget from RateLimitScheduler.status()
+        """
+        return {name: scheduler.status() for name, scheduler in self.schedulers.items()}
+
+    def request(self, method, path, priority=None, idempotent=None, **kwargs):
+        """
+        Send a request through the pooled session, paced by the rate-limit scheduler.
+
+        Rate-limited (403/429) responses are retried up to the scheduler's
+        max_retries with jittered backoff, honouring Retry-After and
+        X-RateLimit-Reset. 5xx responses and connection errors are retried the
+        same way only for idempotent requests, since a write may have been
+        applied before the error.
+
+        Args:
+            method (str): HTTP method
+            path (str): API path (e.g. "/users/octocat/repos") or absolute URL
+            priority (int, optional): PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND;
+                                      defaults to the request_priority() in effect
+            idempotent (bool, optional): Whether sending the request twice is safe;
+                                         defaults to True for GET, HEAD and OPTIONS only
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: The raw response
+
+        Raises:
+            RateLimitError: If the rate limit does not recover within the scheduler's max_wait
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        url = self.url(path)
+        scheduler = self.scheduler_for(url)
+        if priority is None:
+            priority = current_priority()
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+
+        attempt = 0
+        start = time.perf_counter()
+        wait = 0.0
+        response = None
+        try:
+            while True:
+                acquire_start = time.perf_counter()
+                scheduler.acquire(priority)
+                wait += time.perf_counter() - acquire_start
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    if not idempotent or attempt >= scheduler.max_retries:
+                        raise
+                    scheduler.record_retry()
+                    time.sleep(scheduler.backoff(attempt))
+                    attempt += 1
+                    continue
+
+                scheduler.update(response)
+                if not scheduler.should_retry(response, idempotent) or attempt >= scheduler.max_retries:
+                    if scheduler.is_rate_limited(response):
+                        status = scheduler.status()
+                        raise RateLimitError(
+                            f"GitHub rate limit exceeded (status {response.status_code}), "
+                            f"resets in {max(status['reset_at'] - time.time(), 0):.0f}s"
+                        )
+                    return response
+
+                response.close()
+                scheduler.record_retry()
+                time.sleep(scheduler.retry_delay(attempt, response))
+                attempt += 1
+        except Exception as e:
+            response = e
+            raise
+        finally:
+            if _request_hooks:
+                self._emit_request(method, url, kwargs, response, start, wait, attempt, priority, scheduler)
+
+    def _emit_request(self, method, url, kwargs, response, start, wait, attempt, priority, scheduler):
+        if isinstance(response, requests.Response):
+            status = response.status_code
+            if kwargs.get('stream'):
+                size = int(response.headers.get('Content-Length') or 0)
+            else:
+                size = len(response.content)
+        else:
+            status = type(response).__name__ if response is not None else 'unknown'
+            size = 0
+        _emit(_request_hooks, {
+            'method': method,
+            'path': urlparse(url).path,
+            'status': status,
+            'elapsed': time.perf_counter() - start,
+            'wait': wait,
+            'bytes': size,
+            'retries': attempt,
+            'priority': priority,
+            'remaining': scheduler.remaining
+        })
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def cached_get(self, path, params=None, **kwargs):
+        """
+        GET with conditional request headers backed by the response cache.
+
+        Sends If-None-Match / If-Modified-Since when the URL was seen before. A 304
+        Not Modified (which does not count against the rate limit) is answered with
+        the cached body as a normal 200 response, so callers need no special handling.
+
+        Args:
+            path (str): API path or absolute URL
+            params (dict, optional): Query parameters, part of the cache key
+            **kwargs: Passed through to requests.Session.request
+
+        Returns:
+            requests.Response: Fresh or cached response
+        """
+        if self.cache is None:
+            return self.get(path, params=params, **kwargs)
+
+        url = self.url(path)
+        key = self.cache.make_key(url, params, self.token)
+        cached = self.cache.get(key)
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        response = self.get(url, params=params, headers=headers, **kwargs)
+
+        if _cache_hooks:
+            result = 'hit' if response.status_code == 304 and cached else ('changed' if cached else 'miss')
+            _emit(_cache_hooks, {'path': urlparse(url).path, 'result': result})
+
+        if response.status_code == 304 and cached:
+            return build_cached_response(response, cached, key, self.cache)
+
+        if response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.cache.set(key, etag, last_modified, response.content)
+
+        return response
+
+    def post(self, path, **kwargs):
+        return self.request('POST', path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request('PATCH', path, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+
+# Process-wide clients, one per token. Streamlit re-executes app.py on every
+# rerun but keeps imported modules, so these survive reruns and sessions.
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(token=None):
+    """
+    Get the shared GitHub client for a token, creating it on first use.
+
+    Args:
+        token (str, optional): GitHub personal access token. None for anonymous access.
+
+    Returns:
+        GitHubClient: The process-wide client for this token
+    """
+    client = _clients.get(token)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(token)
+            if client is None:
+                client = GitHubClient(token, cache=get_response_cache())
+                _clients[token] = client
+    return client
+
+
+def iter_clients():
+    """
+    Returns:
+        list: Every shared client created so far
+    """
+    with _clients_lock:
+        return list(_clients.values())
+
+
+def reset_clients():
+    """
+    Close and forget every shared client, e.g. after changing the settings above.
+    """
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,179 @@
+import time
+
+import requests
+
+from github_client import get_client
+
+# Repositories with their README text, newest first, one cursor page at a time.
+# HEAD:README.md resolves against the default branch of each repository.
+REPOSITORIES_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  repositoryOwner(login: $login) {
+    repositories(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+      nodes {
+        databaseId
+        name
+        nameWithOwner
+        url
+        sshUrl
+        description
+        isPrivate
+        isFork
+        stargazerCount
+        forkCount
+        updatedAt
+        defaultBranchRef {
+          name
+        }
+        primaryLanguage {
+          name
+        }
+        readme: object(expression: "HEAD:README.md") {
+          ... on Blob {
+            oid
+            byteSize
+            isBinary
+            text
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+DEFAULT_BATCH_SIZE = 50  # Repositories per query; README text makes large pages expensive
+
+
+def run_graphql_query(token, query, variables=None):
+    """
+    Run a GraphQL v4 query against the GitHub API.
+
+    Args:
+        token (str): GitHub personal access token (GraphQL always needs one)
+        query (str): GraphQL query document
+        variables (dict, optional): Query variables
+
+    Returns:
+        dict: The "data" member of the response
+
+    Raises:
+        Exception: If the request fails or the response contains errors
+    """
+    client = get_client(token)
+
+    try:
+        # Queries only read, so a server error can be retried
+        response = client.post(client.graphql_url, json={'query': query, 'variables': variables or {}},
+                               idempotent=True)
+
+        if response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        elif response.status_code != 200:
+            raise Exception(f"GraphQL request failed. Status code: {response.status_code}")
+
+        result = response.json()
+        if result.get('errors'):
+            messages = '; '.join(error.get('message', '') for error in result['errors'])
+            raise Exception(f"GraphQL query returned errors: {messages}")
+
+        return result.get('data') or {}
+
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to run GraphQL query: {str(e)}")
+
+
+def get_repositories_with_readmes(token, username, batch_size=DEFAULT_BATCH_SIZE, stats=None):
+    """
+    Get all repositories of a user or organization together with their README.md,
+    using batched, cursor-paginated GraphQL queries instead of one REST call per
+    100 repositories plus one per README.
+
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub user or organization login
+        batch_size (int): Repositories per GraphQL page (max 100)
+        stats (dict, optional): If given, filled with 'requests', 'pages' and 'elapsed'
+
+    Returns:
+        tuple: (repositories, readmes)
+            repositories (list): repo_info dicts with the same keys as get_all_repositories
+            readmes (dict): repository name -> README info in the shape returned by
+                            get_fileInfo_content for a file, or None if the
+                            repository has no README.md
+
+    Raises:
+        Exception: If the owner does not exist or a query fails
+    """
+    client = get_client(token)
+
+    repositories = []
+    readmes = {}
+    cursor = None
+    page_count = 0
+    start_time = time.perf_counter()
+
+    while True:
+        data = run_graphql_query(token, REPOSITORIES_QUERY, {
+            'login': username,
+            'first': batch_size,
+            'after': cursor
+        })
+        page_count += 1
+
+        owner = data.get('repositoryOwner')
+        if owner is None:
+            raise Exception(f"User or organization '{username}' not found")
+
+        connection = owner['repositories']
+        for node in connection['nodes']:
+            repo_info = {
+                'id': node['databaseId'],  # Same id as the REST API
+                'name': node['name'],
+                'url': client.url(f"/repos/{node['nameWithOwner']}"),  # API URL
+                'html_url': node['url'],  # Web page URL
+                'clone_url': f"{node['url']}.git",  # HTTPS clone URL
+                'ssh_url': node['sshUrl'],  # SSH clone URL
+                'description': node.get('description'),
+                'language': (node.get('primaryLanguage') or {}).get('name'),
+                'private': node['isPrivate'],
+                'fork': node['isFork'],
+                'stars': node['stargazerCount'],
+                'forks': node['forkCount'],
+                'updated_at': node['updatedAt'],
+                'default_branch': (node.get('defaultBranchRef') or {}).get('name', '')  # None for empty repositories
+            }
+            repositories.append(repo_info)
+
+            readme = node.get('readme')
+            if readme and not readme.get('isBinary'):
+                readmes[node['name']] = {
+                    'type': 'file',
+                    'name': 'README.md',
+                    'path': 'README.md',
+                    'content': readme.get('text') or '',
+                    'size': readme.get('byteSize', 0),
+                    'sha': readme.get('oid', ''),
+                    'url': client.url(f"/repos/{node['nameWithOwner']}/contents/README.md"),
+                    'html_url': f"{node['url']}/blob/HEAD/README.md",
+                    'download_url': '',
+                    'encoding': ''
+                }
+            else:
+                readmes[node['name']] = None
+
+        page_info = connection['pageInfo']
+        if not page_info['hasNextPage']:
+            break
+        cursor = page_info['endCursor']
+
+    if stats is not None:
+        stats['requests'] = page_count
+        stats['pages'] = page_count
+        stats['elapsed'] = time.perf_counter() - start_time
+
+    return repositories, readmes
@@ -0,0 +1,216 @@
+import ipaddress
+import os
+import socket
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_WORKERS = int(os.environ.get('IMAGE_PREFETCH_WORKERS', '8'))
+DEFAULT_PER_HOST = int(os.environ.get('IMAGE_PREFETCH_PER_HOST', '4'))
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get('IMAGE_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+DEFAULT_MAX_IMAGE_BYTES = 10 * 1024 * 1024  # Larger images are reported as broken
+DEFAULT_TIMEOUT = 15
+MAX_REDIRECTS = 5  # Each redirect target is checked like the original URL
+# Only for local stand-in servers: allow images on loopback and private addresses
+ALLOW_PRIVATE_HOSTS = os.environ.get('IMAGE_PREFETCH_ALLOW_PRIVATE', '').lower() in ('1', 'true', 'yes')
+
+
+def check_public_url(url):
+    """
+    Make sure an image URL may be fetched by the server: http(s) only, and its
+    host must resolve to public addresses only. README image URLs come from
+    any repository, so without this check a README could make the server
+    request loopback, private (RFC 1918) or link-local addresses such as the
+    cloud metadata service at 169.254.169.254.
+
+    Raises:
+        Exception: If the URL is not http(s) or its host is not public
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ('http', 'https') or not parsed.hostname:
+        raise Exception("Invalid image URL")
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(parsed.hostname, parsed.port or None,
+                                                                 type=socket.SOCK_STREAM)}
+    except socket.gaierror as e:
+        raise Exception(f"Cannot resolve image host '{parsed.hostname}': {str(e)}")
+    for address in addresses:
+        if not ipaddress.ip_address(address.split('%', 1)[0]).is_global:
+            raise Exception(f"Image host '{parsed.hostname}' is not a public address")
+
+
+class ImagePrefetcher:
+    """
+    Concurrent image downloader for README rendering.
+
+    Fetches every image URL of a README at once with a bounded thread pool and
+    a per-host connection limit, validates that the response really is an image,
+    and keeps the bytes in an LRU cache bounded by total size. No GitHub token is
+    sent: images are often hosted on third-party servers. Only public http(s)
+    hosts are fetched, redirects are followed one by one and re-checked, and
+    an image is rejected by its Content-Length before anything is buffered.
+
+    Args:
+        max_workers (int): Maximum concurrent downloads overall
+        per_host (int): Maximum concurrent downloads per host
+        max_bytes (int): Byte budget of the image cache
+        max_image_bytes (int): Size limit for a single image
+        timeout (float): Timeout in seconds for each download
+        allow_private (bool): Skip the public-host check (local stand-in servers only)
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, per_host=DEFAULT_PER_HOST,
+                 max_bytes=DEFAULT_CACHE_MAX_BYTES, max_image_bytes=DEFAULT_MAX_IMAGE_BYTES,
+                 timeout=DEFAULT_TIMEOUT, allow_private=ALLOW_PRIVATE_HOSTS):
+        self.per_host = per_host
+        self.max_bytes = max_bytes
+        self.max_image_bytes = max_image_bytes
+        self.timeout = timeout
+        self.allow_private = allow_private
+        self.total_bytes = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-prefetch')
+        self._lock = threading.Lock()
+        self._host_slots = {}
+        self._cache = OrderedDict()  # url -> (data, content_type)
+
+    def _host_slot(self, host):
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host)
+                self._host_slots[host] = slot
+            return slot
+
+    def _get_cached(self, url):
+        with self._lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                self._cache.move_to_end(url)
+            return entry
+
+    def _store(self, url, entry):
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._cache.pop(url, None)
+            if old is not None:
+                self.total_bytes -= len(old[0])
+            self._cache[url] = entry
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (evicted, _) = self._cache.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def _download(self, url):
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            if not self.allow_private:
+                check_public_url(target)
+            with self._host_slot(urlparse(target).netloc):
+                with self.session.get(target, stream=True, timeout=self.timeout, allow_redirects=False) as response:
+                    if response.is_redirect:
+                        target = urljoin(target, response.headers['Location'])
+                        continue
+                    data, content_type = self._read_image(response)
+            break
+        else:
+            raise Exception(f"More than {MAX_REDIRECTS} redirects")
+
+        entry = (data, content_type)
+        self._store(url, entry)
+        return entry
+
+    def _read_image(self, response):
+        if response.status_code != 200:
+            raise Exception(f"HTTP {response.status_code}")
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip()
+        if not content_type.startswith('image/'):
+            raise Exception(f"Not an image (Content-Type: {content_type or 'unknown'})")
+
+        too_large = f"Image larger than {self.max_image_bytes // (1024 * 1024)} MB"
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_image_bytes:
+            raise Exception(too_large)
+
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > self.max_image_bytes:
+                raise Exception(too_large)
+            chunks.append(chunk)
+        return b''.join(chunks), content_type
+
+    def fetch_all(self, urls):
+        """
+        Download and validate a set of image URLs concurrently.
+
+        Args:
+            urls (list): Image URLs (duplicates are fetched once)
+
+        Returns:
+            tuple: (images, errors)
+                images (dict): url -> (bytes, content_type) for every image that loaded
+                errors (dict): url -> error message for every image that did not
+        """
+        images = {}
+        errors = {}
+        futures = {}
+
+        for url in dict.fromkeys(urls):
+            if not url.startswith(('http://', 'https://')):
+                errors[url] = "Invalid image URL"
+                continue
+
+            cached = self._get_cached(url)
+            if cached is not None:
+                images[url] = cached
+            else:
+                futures[url] = self._executor.submit(self._download, url)
+
+        for url, future in futures.items():
+            try:
+                images[url] = future.result()
+            except requests.exceptions.RequestException as e:
+                errors[url] = f"Failed to load image: {str(e)}"
+            except Exception as e:
+                errors[url] = str(e)
+
+        return images, errors
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of cached images and bytes used
+        """
+        with self._lock:
+            return {'entries': len(self._cache), 'bytes': self.total_bytes, 'max_bytes': self.max_bytes}
+
+
+_prefetcher = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_image_prefetcher():
+    """
+    Get the process-wide image prefetcher, creating it on first use.
+    """
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                _prefetcher = ImagePrefetcher()
+    return _prefetcher
@@ -0,0 +1,371 @@
+import functools
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from blob_cache import get_blob_cache
+from github_client import add_cache_hook, add_request_hook, iter_clients
+from readme_render import get_readme_html_cache
+from response_cache import get_response_cache
+
+# Histogram bucket upper bounds in seconds, as in the Prometheus client defaults
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RECENT_REQUESTS = 200  # Requests kept for the debug panel
+
+# API paths -> endpoint labels, so owners, repositories and file paths do not
+# each become a separate time series
+ENDPOINT_PATTERNS = [
+    (re.compile(r'^/users/[^/]+/repos$'), '/users/{owner}/repos'),
+    (re.compile(r'^/user/repos$'), '/user/repos'),
+    (re.compile(r'^/repos/[^/]+/[^/]+/contents(/.*)?$'), '/repos/{owner}/{repo}/contents/{path}'),
+    (re.compile(r'^/repos/[^/]+/[^/]+/git/trees/.+$'), '/repos/{owner}/{repo}/git/trees/{ref}'),
+    (re.compile(r'^/repos/[^/]+/[^/]+/git/blobs/[^/]+$'), '/repos/{owner}/{repo}/git/blobs/{sha}'),
+    (re.compile(r'^/repos/[^/]+/[^/]+$'), '/repos/{owner}/{repo}'),
+    (re.compile(r'^/graphql$'), '/graphql'),
+    (re.compile(r'^/markdown$'), '/markdown'),
+    (re.compile(r'^/rate_limit$'), '/rate_limit'),
+]
+
+
+def endpoint_label(path):
+    """
+    Map a request path (without host or query) to its endpoint template.
+    """
+    for pattern, label in ENDPOINT_PATTERNS:
+        if pattern.match(path):
+            return label
+    return 'other'
+
+
+class Histogram:
+    """
+    Cumulative-bucket histogram (Prometheus style) with sum and count.
+    """
+
+    def __init__(self, buckets=DURATION_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside its bucket.
+
+        Returns:
+            float: The estimate, or None if nothing was observed
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for i, bound in enumerate(self.buckets):
+            if seen + self.counts[i] >= rank:
+                return lower + (bound - lower) * ((rank - seen) / self.counts[i] if self.counts[i] else 0)
+            seen += self.counts[i]
+            lower = bound
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """
+    In-process store of counters, gauges and histograms with labels.
+
+    Collectors are functions called at export time that return current gauge
+    values, for numbers that live elsewhere (cache sizes, rate-limit budget).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._help = {}        # name -> (type, help text)
+        self._collectors = []
+        self.recent = deque(maxlen=RECENT_REQUESTS)
+
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def describe(self, name, metric_type, help_text):
+        self._help[name] = (metric_type, help_text)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, self._labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def add_collector(self, collector):
+        """
+        Register a function returning [(name, labels dict, value), ...] gauges.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def counters(self, name):
+        """
+        Returns:
+            dict: labels dict (as a sorted tuple of pairs) -> value for one counter
+        """
+        with self._lock:
+            return {labels: value for (counter, labels), value in self._counters.items() if counter == name}
+
+    def histograms(self, name):
+        """
+        Returns:
+            dict: labels (as a sorted tuple of pairs) -> Histogram for one histogram
+        """
+        with self._lock:
+            return {labels: histogram for (metric, labels), histogram in self._histograms.items() if metric == name}
+
+    def gauges(self):
+        """
+        Returns:
+            list: (name, labels dict, value) from every collector; failing collectors are skipped
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        values = []
+        for collector in collectors:
+            try:
+                values.extend(collector())
+            except Exception:
+                pass
+        return values
+
+    def prometheus_text(self):
+        """
+        Export everything in the Prometheus text exposition format (version 0.0.4).
+        """
+        def format_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ''
+            escaped = (
+                f'{key}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+                for key, value in pairs
+            )
+            return '{' + ','.join(escaped) + '}'
+
+        lines = []
+        described = set()
+
+        def header(name, default_type):
+            if name in described:
+                return
+            described.add(name)
+            metric_type, help_text = self._help.get(name, (default_type, ''))
+            if help_text:
+                lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            histograms = [(key, (list(h.counts), h.sum, h.count, h.buckets)) for key, h in histograms]
+
+        for (name, labels), value in counters:
+            header(name, 'counter')
+            lines.append(f'{name}{format_labels(labels)} {value}')
+
+        for (name, labels), (counts, total, count, buckets) in histograms:
+            header(name, 'histogram')
+            cumulative = 0
+            for bound, bucket_count in zip(list(buckets) + ['+Inf'], counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {total}')
+            lines.append(f'{name}_count{format_labels(labels)} {count}')
+
+        for name, labels, value in sorted(self.gauges(), key=lambda gauge: gauge[0]):
+            header(name, 'gauge')
+            lines.append(f'{name}{format_labels(sorted(labels.items()))} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    return _metrics
+
+
+def record_github_request(event):
+    """
+    Request hook for GitHubClient: turns one finished request into metrics.
+
+    Args:
+        event (dict): 'method', 'path', 'status', 'elapsed', 'wait', 'bytes',
+                      'retries', 'priority', 'remaining' (see GitHubClient.request)
+    """
+    endpoint = endpoint_label(event['path'])
+    status = str(event['status'])
+    _metrics.inc('github_requests_total', method=event['method'], endpoint=endpoint, status=status)
+    _metrics.observe('github_request_duration_seconds', event['elapsed'], method=event['method'], endpoint=endpoint)
+    if event['wait'] > 0:
+        _metrics.observe('github_rate_limit_wait_seconds', event['wait'], endpoint=endpoint)
+    if event['bytes']:
+        _metrics.inc('github_response_bytes_total', event['bytes'], endpoint=endpoint)
+    if event['retries']:
+        _metrics.inc('github_request_retries_total', event['retries'], endpoint=endpoint)
+    _metrics.recent.append(dict(event, endpoint=endpoint, time=time.time()))
+
+
+def record_cache_lookup(event):
+    """
+    Cache hook for GitHubClient.cached_get.
+
+    Args:
+        event (dict): 'path' and 'result': "hit" (304 Not Modified), "changed" or "miss"
+    """
+    _metrics.inc('github_cache_lookups_total', endpoint=endpoint_label(event['path']), result=event['result'])
+
+
+@contextmanager
+def timed(operation):
+    """
+    Record how long a block takes as app_operation_duration_seconds{operation}.
+    Failed blocks are also counted in app_operation_errors_total.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _metrics.inc('app_operation_errors_total', operation=operation)
+        raise
+    finally:
+        _metrics.observe('app_operation_duration_seconds', time.perf_counter() - start, operation=operation)
+
+
+def timed_operation(operation):
+    """
+    Decorator form of timed().
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(operation):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_metrics.describe('github_requests_total', 'counter', 'GitHub API requests by method, endpoint and final status')
+_metrics.describe('github_request_duration_seconds', 'histogram',
+                  'GitHub request latency including rate-limit waits and retries')
+_metrics.describe('github_rate_limit_wait_seconds', 'histogram', 'Time requests waited for rate-limit budget')
+_metrics.describe('github_response_bytes_total', 'counter', 'Response body bytes received')
+_metrics.describe('github_request_retries_total', 'counter', 'Retries after rate limiting, 5xx or connection errors')
+_metrics.describe('github_cache_lookups_total', 'counter', 'Conditional request cache lookups by result')
+_metrics.describe('app_operation_duration_seconds', 'histogram', 'Duration of app-level operations')
+_metrics.describe('app_operation_errors_total', 'counter', 'Failed app-level operations')
+
+
+def collect_rate_limits():
+    gauges = []
+    now = time.time()
+    for index, client in enumerate(iter_clients()):
+        for resource, status in client.rate_limit_status().items():
+            labels = {'client': index, 'resource': resource}
+            gauges.append(('github_rate_limit_remaining', labels, status['remaining']))
+            gauges.append(('github_rate_limit_limit', labels, status['limit']))
+            gauges.append(('github_rate_limit_reset_seconds', labels, max(status['reset_at'] - now, 0)))
+            gauges.append(('github_rate_limit_tokens', labels, status['tokens']))
+            for priority, queued in enumerate(status['queued']):
+                gauges.append(('github_rate_limit_queued', dict(labels, priority=priority), queued))
+    return gauges
+
+
+def collect_caches():
+    gauges = []
+    for name, stats in (('blob', get_blob_cache().stats()), ('readme_html', get_readme_html_cache().stats()),
+                        ('response', get_response_cache().stats())):
+        for key in ('hits', 'misses', 'hit_ratio', 'entries', 'bytes', 'max_bytes'):
+            if key in stats:
+                gauges.append((f'cache_{key}', {'cache': name}, stats[key]))
+    return gauges
+
+
+_installed = False
+_install_lock = threading.Lock()
+
+
+def install_github_metrics():
+    """
+    Hook the metrics into every GitHub client and register the rate-limit and
+    cache collectors. Safe to call on every rerun; only the first call installs.
+    """
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        add_request_hook(record_github_request)
+        add_cache_hook(record_cache_lookup)
+        _metrics.add_collector(collect_rate_limits)
+        _metrics.add_collector(collect_caches)
+        _installed = True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = _metrics.prometheus_text().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host='0.0.0.0'):
+    """
+    Serve /metrics for Prometheus from a daemon thread. Only the first call
+    starts a server; later calls return the running one.
+
+    Returns:
+        ThreadingHTTPServer: The server
+
+    Raises:
+        Exception: If the port cannot be bound
+    """
+    global _server
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                raise Exception(f"Failed to start metrics server on port {port}: {str(e)}")
+            threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+        return _server
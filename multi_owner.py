@@ -0,0 +1,284 @@
+import heapq
+import threading
+import time
+from functools import partial
+
+from background_refresh import freeze_snapshot, get_background_refresher
+from github_api import load_repository_snapshot
+from repo_search import OWNER_SEPARATOR, RepositorySearchIndex
+from snapshot_store import get_snapshot_store, make_store_key
+
+
+def parse_owners(owners, default_token):
+    """
+    Normalize the configured owners (users or organizations).
+
+    Args:
+        owners (str or iterable): Comma separated names, or a list whose items are
+                                  names or mappings with 'name' and an optional
+                                  'token' (for owners another account can read)
+        default_token (str): Token of owners without their own
+
+    Returns:
+        list: One dict per owner with 'name' and 'token', in configured order,
+              without duplicates (GitHub names are case-insensitive)
+
+    Raises:
+        Exception: If an owner has no name or no owner is configured
+    """
+    if isinstance(owners, str):
+        owners = [owner.strip() for owner in owners.split(',') if owner.strip()]
+
+    parsed = []
+    seen = set()
+    for owner in owners:
+        if isinstance(owner, str):
+            name, token = owner.strip(), default_token
+        else:
+            name, token = str(owner.get('name', '')).strip(), owner.get('token') or default_token
+        if not name:
+            raise Exception(f"Owner without a name: {owner}")
+        if name.lower() in seen:
+            continue
+        seen.add(name.lower())
+        parsed.append({'name': name, 'token': token})
+
+    if not parsed:
+        raise Exception("No repository owners configured")
+    return parsed
+
+
+def qualify(owner, repository_Name):
+    return f'{owner}{OWNER_SEPARATOR}{repository_Name}'
+
+
+def split_repository_label(label, default_owner):
+    """
+    Split a repository label from the combined view into (owner, repository name).
+    Labels without an owner belong to default_owner.
+    """
+    if OWNER_SEPARATOR in label:
+        owner, repository_Name = label.split(OWNER_SEPARATOR, 1)
+        return owner, repository_Name
+    return default_owner, label
+
+
+class OwnerGroup:
+    """
+    The repositories of several owners, loaded in parallel and shown as one list.
+
+    Every owner has its own BackgroundRefresher: its own thread, token (so its
+    own rate-limit budget and scheduler when the token differs), ETag-cached
+    pages and snapshot. A slow or failing owner therefore only delays or
+    drops its own repositories; the others keep their latest snapshot.
+    Snapshots are saved to the SnapshotStore, and after a restart each owner
+    starts from its saved snapshot and reconciles it with GitHub.
+
+    With a single owner the combined view is that owner's snapshot, unchanged.
+    With several, repository names are qualified as "owner/name" so they stay
+    unique, and the view is rebuilt only when an owner publishes a new snapshot.
+    The group's search index is synced to the combined view on the publishing
+    refresher's thread.
+
+    Args:
+        owners (list): Dicts with 'name' and 'token' (see parse_owners)
+        backend (str): "rest" or "graphql"
+        interval (float): Seconds between refreshes of every owner
+    """
+
+    def __init__(self, owners, backend, interval):
+        self.owners = [owner['name'] for owner in owners]
+        self.tokens = {owner['name']: owner['token'] for owner in owners}
+        store = get_snapshot_store()
+        self.refreshers = {}
+        for owner in owners:
+            store_key = make_store_key(owner['name'], backend, owner['token'])
+            self.refreshers[owner['name']] = get_background_refresher(
+                (owner['name'], backend),
+                partial(load_repository_snapshot, owner['token'], owner['name'], backend),
+                interval,
+                restore=partial(store.load, store_key),
+                on_publish=partial(store.save, store_key)
+            )
+        self._lock = threading.Lock()
+        self._combined = None
+        self._combined_versions = None
+        self._version = 0
+        self.search_index = RepositorySearchIndex()
+        for refresher in self.refreshers.values():
+            refresher.add_listener(self._index_published)
+
+    def _index_published(self, snapshot):
+        combined = self.combined_snapshot()
+        if combined is not None:
+            self.search_index.sync(combined)
+
+    @property
+    def multiple(self):
+        return len(self.owners) > 1
+
+    def token(self, owner):
+        return self.tokens[owner]
+
+    def snapshot(self, owner):
+        """
+        Returns:
+            RepositorySnapshot: The owner's own latest snapshot (unqualified names), or None
+        """
+        return self.refreshers[owner].snapshot()
+
+    def pending_owners(self):
+        """
+        Returns:
+            list: Owners whose first load is still running
+        """
+        return [
+            owner for owner, refresher in self.refreshers.items()
+            if refresher.snapshot() is None and refresher.last_error is None
+        ]
+
+    def statuses(self):
+        """
+        Returns:
+            list: One dict per owner: 'owner', 'snapshot' (or None), 'error'
+                  (the last failed load, or None) and 'loading' (first load running)
+        """
+        return [
+            {
+                'owner': owner,
+                'snapshot': refresher.snapshot(),
+                'error': refresher.last_error,
+                'loading': refresher.snapshot() is None and refresher.last_error is None
+            }
+            for owner, refresher in self.refreshers.items()
+        ]
+
+    def wait(self, timeout):
+        """
+        Block until every owner has a snapshot or has failed, at most `timeout` seconds.
+
+        Returns:
+            list: Owners still loading
+        """
+        deadline = time.time() + timeout
+        for owner in self.pending_owners():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            self.refreshers[owner].wait_for_snapshot(timeout=remaining)
+        return self.pending_owners()
+
+    def refresh_now(self, wait=False, timeout=None):
+        """
+        Refresh every owner at once; with wait, block until all have published
+        (or the timeout passes).
+        """
+        # Wake every owner first, so the loads run at the same time, then wait
+        # on each refresher's own condition; no shared worker threads are held
+        targets = [(refresher, refresher.request_refresh()) for refresher in self.refreshers.values()]
+        if wait:
+            deadline = None if timeout is None else time.time() + timeout
+            for refresher, newer_than in targets:
+                remaining = None if deadline is None else max(deadline - time.time(), 0)
+                refresher.wait_for_snapshot(remaining, newer_than=newer_than)
+        return self.combined_snapshot()
+
+    def partial_repos(self):
+        """
+        Returns:
+            list: Repositories received so far: snapshots of the owners that
+                  have one and partial pages of the ones still loading
+        """
+        repos = []
+        for owner, refresher in self.refreshers.items():
+            snapshot = refresher.snapshot()
+            owner_repos = snapshot.table.rows() if snapshot is not None else refresher.partial_repos()
+            if self.multiple:
+                owner_repos = [dict(repo, name=qualify(owner, repo['name'])) for repo in owner_repos]
+            repos.extend(owner_repos)
+        return repos
+
+    def combined_snapshot(self):
+        """
+        The repositories of every owner with a snapshot as one RepositorySnapshot,
+        most recently updated first.
+
+        Returns:
+            RepositorySnapshot: The combined view, or None before any owner has loaded
+        """
+        if not self.multiple:
+            return self.snapshot(self.owners[0])
+
+        snapshots = [(owner, self.snapshot(owner)) for owner in self.owners]
+        snapshots = [(owner, snapshot) for owner, snapshot in snapshots if snapshot is not None]
+        if not snapshots:
+            return None
+
+        versions = tuple((owner, snapshot.version) for owner, snapshot in snapshots)
+        with self._lock:
+            if versions != self._combined_versions:
+                self._version += 1
+                self._combined = freeze_snapshot(combine_snapshots(snapshots), self._version)
+                self._combined_versions = versions
+            return self._combined
+
+
+def combine_snapshots(snapshots):
+    """
+    Merge per-owner snapshots into data for freeze_snapshot. Every owner's list
+    is already sorted by updated_at, so they are merged rather than re-sorted.
+
+    Args:
+        snapshots (list): (owner, RepositorySnapshot) pairs
+
+    Returns:
+        dict: {'repos', 'readmes', 'stats', 'sync', 'saved_at'} with names qualified
+              as "owner/name"; saved_at is the creation time of the oldest snapshot
+    """
+    repos = heapq.merge(
+        *([dict(repo, name=qualify(owner, repo['name'])) for repo in snapshot.table.rows()] for owner, snapshot in snapshots),
+        key=lambda repo: repo['updated_at'],
+        reverse=True
+    )
+    readmes = {
+        qualify(owner, name): readme
+        for owner, snapshot in snapshots
+        for name, readme in snapshot.readmes.items()
+    }
+    stats = {
+        'requests': sum(snapshot.stats.get('requests', 0) for _, snapshot in snapshots),
+        # Owners load in parallel, so the slowest one sets the wall time
+        'elapsed': max(snapshot.stats.get('elapsed', 0.0) for _, snapshot in snapshots)
+    }
+    modes = sorted({snapshot.sync.get('mode', 'full') for _, snapshot in snapshots})
+    return {
+        'repos': list(repos), 'readmes': readmes, 'stats': stats, 'sync': {'mode': '/'.join(modes)},
+        # The combined view is as old as its oldest part
+        'saved_at': min(snapshot.created_at for _, snapshot in snapshots)
+    }
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def get_owner_group(owners, backend, interval):
+    """
+    Get the process-wide OwnerGroup for a list of owners, creating it (and
+    starting its refreshers) on first use.
+
+    Args:
+        owners (list): Dicts with 'name' and 'token' (see parse_owners)
+        backend (str): "rest" or "graphql"
+        interval (float): Seconds between refreshes
+
+    Returns:
+        OwnerGroup: The shared group
+    """
+    key = (tuple((owner['name'], owner['token']) for owner in owners), backend)
+    with _groups_lock:
+        group = _groups.get(key)
+        if group is None:
+            group = OwnerGroup(owners, backend, interval)
+            _groups[key] = group
+        return group
@@ -0,0 +1,236 @@
+import contextvars
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+# Request priorities: lower runs first. Interactive work (a user waiting on a
+# README) goes ahead of background refreshes whenever both are queued.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+DEFAULT_BURST = int(os.environ.get('GITHUB_RATE_BURST', '50'))
+# Share of the window's limit below which requests are paced; above it they go out at once
+DEFAULT_RESERVE = float(os.environ.get('GITHUB_RATE_RESERVE', '0.1'))
+DEFAULT_MAX_RETRIES = int(os.environ.get('GITHUB_MAX_RETRIES', '3'))
+DEFAULT_MAX_WAIT = float(os.environ.get('GITHUB_MAX_WAIT', '30'))  # Longer waits fail instead of blocking
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Methods that may be sent again after a server error or a lost connection: the
+# first attempt may already have been applied (e.g. a PATCH renaming a repository)
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_current_priority = contextvars.ContextVar('github_request_priority', default=PRIORITY_INTERACTIVE)
+
+
+class RateLimitError(Exception):
+    """
+    Raised when GitHub's rate limit leaves no budget within the allowed wait.
+    """
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    Run the GitHub requests made inside the block with the given priority.
+
+    Example:
+        with request_priority(PRIORITY_BACKGROUND):
+            get_all_repositories(token, userName)
+    """
+    reset_token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(reset_token)
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+class RateLimitScheduler:
+    """
+    Token bucket in front of every request to one GitHub rate-limit resource.
+
+    While more than `reserve` of the window's limit is left, requests are not
+    paced at all. Below it, the bucket allows bursts of up to `burst` requests
+    and refills at the rate that spreads the remaining budget
+    (X-RateLimit-Remaining) evenly until the window resets (X-RateLimit-Reset).
+    A 304 Not Modified does not count against the limit, so its token is given
+    back. Retry-After pauses all requests. Queued interactive requests are
+    always let through before background ones.
+
+    Args:
+        limit (int): Requests per window assumed until the first response arrives
+        burst (int): Bucket capacity once requests are paced
+        reserve (float): Share of the limit below which requests are paced
+        max_retries (int): Retries for 403 (rate limited) / 429 / 5xx responses and connection errors
+        max_wait (float): Longest a request may wait for budget before RateLimitError is raised
+    """
+
+    def __init__(self, limit=5000, burst=DEFAULT_BURST, max_retries=DEFAULT_MAX_RETRIES, max_wait=DEFAULT_MAX_WAIT,
+                 reserve=DEFAULT_RESERVE):
+        self.limit = limit
+        self.remaining = limit
+        self.reset_at = time.time() + 3600
+        self.burst = burst
+        self.reserve = reserve
+        self.waits = 0  # Times a request had to wait (for budget or a higher-priority request)
+        self.tokens = float(burst)
+        self.max_retries = max_retries
+        self.max_wait = max_wait
+        self.blocked_until = 0.0
+        self.retries = 0
+        self._last_refill = time.time()
+        self._waiting = [0, 0]  # queued requests per priority
+        self._cond = threading.Condition()
+
+    def _refill(self, now):
+        if now >= self.reset_at:
+            # The window rolled over; the next response will carry the real numbers
+            self.remaining = self.limit
+            self.reset_at = now + 3600
+        rate = max(self.remaining, 0) / max(self.reset_at - now, 1.0)
+        self.tokens = min(float(self.burst), self.tokens + (now - self._last_refill) * rate)
+        self._last_refill = now
+        return rate
+
+    def acquire(self, priority=PRIORITY_INTERACTIVE):
+        """
+        Block until the request may be sent.
+
+        Raises:
+            RateLimitError: If the budget will not allow it within max_wait seconds
+        """
+        priority = min(max(priority, 0), len(self._waiting) - 1)
+        deadline = time.time() + self.max_wait
+
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.time()
+                    rate = self._refill(now)
+
+                    if self.blocked_until > now:
+                        wait = self.blocked_until - now
+                    elif self.remaining <= 0:
+                        wait = self.reset_at - now
+                    elif any(self._waiting[p] for p in range(priority)):
+                        wait = 0.05  # A higher priority request goes first
+                    elif self.remaining > self.limit * self.reserve:
+                        # Plenty of budget left in this window: no pacing
+                        self.remaining -= 1
+                        return
+                    elif self.tokens < 1:
+                        wait = (1 - self.tokens) / rate if rate > 0 else self.reset_at - now
+                    else:
+                        self.tokens -= 1
+                        self.remaining -= 1
+                        return
+
+                    if now + wait > deadline:
+                        raise RateLimitError(
+                            f"GitHub rate limit exhausted ({self.remaining}/{self.limit} left), "
+                            f"resets in {max(self.reset_at - now, 0):.0f}s"
+                        )
+                    self.waits += 1
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def update(self, response):
+        """
+        Re-seed the bucket from the rate-limit headers of a response, and give
+        back the token of a 304 Not Modified, which GitHub does not count.
+        """
+        headers = response.headers
+        now = time.time()
+        with self._cond:
+            if response.status_code == 304:
+                self.tokens = min(float(self.burst), self.tokens + 1)
+                if 'X-RateLimit-Remaining' not in headers:
+                    self.remaining = min(self.limit, self.remaining + 1)
+            if 'X-RateLimit-Remaining' in headers:
+                try:
+                    self.limit = int(headers.get('X-RateLimit-Limit', self.limit))
+                    self.remaining = int(headers['X-RateLimit-Remaining'])
+                    self.reset_at = float(headers.get('X-RateLimit-Reset', self.reset_at))
+                    self.tokens = min(self.tokens, float(self.remaining))
+                except ValueError:
+                    pass
+            if 'Retry-After' in headers:
+                try:
+                    self.blocked_until = max(self.blocked_until, now + float(headers['Retry-After']))
+                except ValueError:
+                    pass
+            self._cond.notify_all()
+
+    @staticmethod
+    def is_rate_limited(response):
+        """
+        Whether a response was rejected by a primary or secondary rate limit
+        (as opposed to a permission error, which GitHub also reports as 403).
+        """
+        if response.status_code == 429:
+            return True
+        if response.status_code != 403:
+            return False
+        if response.headers.get('X-RateLimit-Remaining') == '0' or 'Retry-After' in response.headers:
+            return True
+        return 'rate limit' in response.text.lower()
+
+    def should_retry(self, response, idempotent=True):
+        """
+        Whether to send a request again after this response. Rate-limited requests
+        were not applied and are always retried; server errors only when the
+        request is idempotent.
+        """
+        if self.is_rate_limited(response):
+            return True
+        return idempotent and response.status_code in RETRY_STATUS_CODES
+
+    def backoff(self, attempt):
+        """
+        Exponential backoff with jitter: half fixed, half random.
+        """
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def retry_delay(self, attempt, response):
+        """
+        Seconds to sleep before retrying a response. Retry-After and an exhausted
+        X-RateLimit-Remaining were already applied by update(), so the next
+        acquire() waits for them; every other retry gets jittered backoff.
+        """
+        if 'Retry-After' in response.headers or response.headers.get('X-RateLimit-Remaining') == '0':
+            return 0.0
+        return self.backoff(attempt)
+
+    def record_retry(self):
+        with self._cond:
+            self.retries += 1
+
+    def status(self):
+        """
+        Returns:
+            dict: Current budget: 'limit', 'remaining', 'reset_at', 'tokens',
+                  'blocked_until', 'retries', 'waits' and 'queued' requests per priority
+        """
+        with self._cond:
+            self._refill(time.time())
+            return {
+                'limit': self.limit,
+                'remaining': self.remaining,
+                'reset_at': self.reset_at,
+                'tokens': self.tokens,
+                'blocked_until': self.blocked_until,
+                'retries': self.retries,
+                'waits': self.waits,
+                'queued': list(self._waiting)
+            }
@@ -0,0 +1,86 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+# Any markdown image: ![alt](url). GitHub blob URLs are split out by the first
+# alternative: https://github.com/user/repo/blob/<rest>, where <rest> is
+# "branch/path/to/image.png", or just "image.png" when the branch is missing
+IMAGE_PATTERN = re.compile(
+    r'!\[([^\]]*)\]\('
+    r'(?:https://github\.com/([^/)]+)/([^/)]+)/blob/([^)]+)|([^)]+))'
+    r'\)'
+)
+
+REWRITE_CACHE_ENTRIES = 128  # Processed READMEs kept in memory, keyed by content hash
+
+_rewrite_cache = OrderedDict()
+_rewrite_cache_lock = threading.Lock()
+
+
+def _rewrite(content):
+    images = []
+
+    def replace_image(match):
+        alt_text, username, repo_name, rest, img_url = match.groups()
+
+        if rest is not None:
+            if '/' in rest:
+                branch, file_path = rest.split('/', 1)
+            else:
+                # Default to main branch
+                branch, file_path = 'main', rest
+            # Convert to raw GitHub URL
+            img_url = f"https://raw.githubusercontent.com/{username}/{repo_name}/{branch}/{file_path}"
+
+        images.append((alt_text, img_url))
+        return f'![{alt_text}]({img_url})\n\n'
+
+    processed_content = IMAGE_PATTERN.sub(replace_image, content)
+    return processed_content, tuple(images)
+
+
+def rewrite_readme_images(content):
+    """
+    Convert GitHub blob image URLs to raw URLs and add line breaks after every
+    image, in a single pass over the content.
+
+    Results are memoized by content hash, so re-rendering the same README is a
+    dictionary lookup.
+
+    Args:
+        content (str): Markdown content from README
+
+    Returns:
+        tuple: (processed_content, images)
+            processed_content (str): Content with converted image URLs and line breaks after images
+            images (tuple): (alt_text, img_url) for every image, in document order
+    """
+    key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).digest()
+
+    with _rewrite_cache_lock:
+        cached = _rewrite_cache.get(key)
+        if cached is not None:
+            _rewrite_cache.move_to_end(key)
+            return cached
+
+    result = _rewrite(content)
+
+    with _rewrite_cache_lock:
+        _rewrite_cache[key] = result
+        while len(_rewrite_cache) > REWRITE_CACHE_ENTRIES:
+            _rewrite_cache.popitem(last=False)
+    return result
+
+
+def process_github_images(content):
+    """
+    Process GitHub markdown content to convert blob URLs to raw URLs for image display.
+
+    Args:
+        content (str): Markdown content from README
+
+    Returns:
+        str: Processed content with converted image URLs and line breaks after images
+    """
+    return rewrite_readme_images(content)[0]
@@ -0,0 +1,307 @@
+import hashlib
+import html
+import os
+import posixpath
+import re
+import threading
+from collections import OrderedDict
+from html.parser import HTMLParser
+
+import requests
+
+from github_async import gather_sync, run_async
+from github_client import get_client
+
+DEFAULT_HTML_CACHE_MAX_BYTES = int(os.environ.get('README_HTML_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+
+# Tags GitHub's markdown renderer produces; anything else is dropped (its text is kept)
+ALLOWED_TAGS = {
+    'a', 'abbr', 'b', 'blockquote', 'br', 'code', 'dd', 'del', 'details', 'div', 'dl', 'dt',
+    'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'i', 'img', 'input', 'ins', 'kbd', 'li',
+    'ol', 'p', 'picture', 'pre', 'q', 's', 'samp', 'source', 'span', 'strike', 'strong', 'sub',
+    'summary', 'sup', 'table', 'tbody', 'td', 'tfoot', 'th', 'thead', 'tr', 'tt', 'ul', 'var'
+}
+DROPPED_CONTENT_TAGS = {'script', 'style', 'iframe', 'object', 'embed', 'template', 'noscript', 'textarea'}
+VOID_TAGS = {'br', 'hr', 'img', 'input', 'source', 'wbr'}
+ALLOWED_ATTRIBUTES = {
+    'href', 'src', 'alt', 'title', 'width', 'height', 'align', 'id', 'class', 'name', 'colspan',
+    'rowspan', 'open', 'start', 'type', 'checked', 'disabled', 'dir', 'lang', 'media', 'aria-hidden'
+}
+URL_ATTRIBUTES = {'href', 'src'}
+SAFE_URL_PATTERN = re.compile(r'^(?:https?:|mailto:|#|/|[^:/?#]*(?:[/?#]|$))', re.IGNORECASE)
+ABSOLUTE_URL_PATTERN = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//)', re.IGNORECASE)
+GITHUB_BLOB_PATTERN = re.compile(r'^https://github\.com/([^/]+)/([^/]+)/blob/(.+)$')
+
+
+def git_blob_sha(content):
+    """
+    The SHA git (and GitHub) gives a file with this content, so README text
+    fetched any way maps to the same cache entry as its blob.
+    """
+    data = content.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+
+class ReadmeHtmlSanitizer(HTMLParser):
+    """
+    Single pass over rendered README HTML that keeps only allowed tags and
+    attributes, drops unsafe URLs and rewrites links for display outside GitHub:
+
+    - relative and GitHub blob image URLs -> raw.githubusercontent.com
+    - relative links -> the file's page on github.com
+    - '#anchor' links -> the 'user-content-' ids GitHub gives headings
+    - protocol-relative ('//host/...') URLs -> https
+    """
+
+    def __init__(self, username, repository_Name, branch='main'):
+        super().__init__(convert_charrefs=True)
+        self.username = username
+        self.repository_Name = repository_Name
+        self.branch = branch
+        self.parts = []
+        self._dropping = 0
+
+    def _resolve(self, url, attribute):
+        if url.startswith('#'):
+            return url if url.startswith('#user-content-') else f'#user-content-{url[1:]}'
+        if url.startswith('//'):
+            # Protocol-relative: the embedding page may not be served over https
+            url = f'https:{url}'
+
+        blob = GITHUB_BLOB_PATTERN.match(url)
+        if blob is not None and attribute == 'src':
+            username, repository_Name, rest = blob.groups()
+            branch, file_path = rest.split('/', 1) if '/' in rest else ('main', rest)
+            return f"https://raw.githubusercontent.com/{username}/{repository_Name}/{branch}/{file_path}"
+
+        if ABSOLUTE_URL_PATTERN.match(url):
+            return url
+
+        # Relative to the repository root, where README.md lives
+        path, _, fragment = url.partition('#')
+        path = posixpath.normpath(path.lstrip('/')) if path else ''
+        if path.startswith('..'):
+            path = ''
+        if attribute == 'src':
+            return f"https://raw.githubusercontent.com/{self.username}/{self.repository_Name}/{self.branch}/{path}"
+        target = f"https://github.com/{self.username}/{self.repository_Name}/blob/{self.branch}/{path}"
+        return f'{target}#{fragment}' if fragment else target
+
+    def _start(self, tag, attrs, self_closing):
+        if tag in DROPPED_CONTENT_TAGS:
+            if not self_closing and tag not in VOID_TAGS:
+                self._dropping += 1
+            return
+        if self._dropping or tag not in ALLOWED_TAGS:
+            return
+
+        kept = []
+        for name, value in attrs:
+            if name not in ALLOWED_ATTRIBUTES:
+                continue
+            value = value if value is not None else ''
+            if name in URL_ATTRIBUTES:
+                value = value.strip()
+                if not SAFE_URL_PATTERN.match(value):
+                    continue
+                value = self._resolve(value, name)
+            if name == 'id' and not value.startswith('user-content-'):
+                value = f'user-content-{value}'
+            kept.append(f' {name}="{html.escape(value, quote=True)}"')
+        if tag == 'input':
+            # Only task list checkboxes, and never editable
+            if ('type', 'checkbox') not in attrs:
+                return
+            kept.append(' disabled=""')
+        if tag == 'a' and any(part.startswith(' href="http') for part in kept):
+            kept.append(' target="_blank" rel="noopener noreferrer"')
+        self.parts.append(f"<{tag}{''.join(kept)}>")
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, True)
+
+    def handle_endtag(self, tag):
+        if tag in DROPPED_CONTENT_TAGS:
+            self._dropping = max(self._dropping - 1, 0)
+            return
+        if self._dropping or tag not in ALLOWED_TAGS or tag in VOID_TAGS:
+            return
+        self.parts.append(f'</{tag}>')
+
+    def handle_data(self, data):
+        if not self._dropping:
+            self.parts.append(html.escape(data, quote=False))
+
+    def result(self):
+        self.close()
+        return ''.join(self.parts)
+
+
+def sanitize_readme_html(rendered_html, username, repository_Name, branch='main'):
+    """
+    Sanitize rendered README HTML and rewrite its links and images (see ReadmeHtmlSanitizer).
+
+    Returns:
+        str: HTML safe to embed in the page
+    """
+    sanitizer = ReadmeHtmlSanitizer(username, repository_Name, branch)
+    sanitizer.feed(rendered_html)
+    return sanitizer.result()
+
+
+def render_markdown(token, username, repository_Name, content):
+    """
+    Render GitHub Flavored Markdown to HTML with GitHub's Markdown API, so the
+    result matches what github.com shows (tables, task lists, issue references).
+
+    Returns:
+        str: Rendered HTML
+
+    Raises:
+        Exception: If the markdown cannot be rendered
+    """
+    client = get_client(token)
+    try:
+        # Rendering has no side effects, so a server error can be retried
+        response = client.post('/markdown', json={
+            'text': content,
+            'mode': 'gfm',
+            'context': f'{username}/{repository_Name}'
+        }, idempotent=True)
+        if response.status_code != 200:
+            raise Exception(f"Failed to render markdown. Status code: {response.status_code}")
+        return response.text
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to render markdown: {str(e)}")
+
+
+class ReadmeHtmlCache:
+    """
+    Byte-bounded LRU cache of sanitized README HTML keyed by (blob SHA, owner,
+    repository, branch). The same README content always renders to the same
+    HTML, so entries never go stale.
+
+    Args:
+        max_bytes (int): Maximum total size of the cached HTML
+    """
+
+    def __init__(self, max_bytes=DEFAULT_HTML_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (html, size)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, rendered_html):
+        size = len(rendered_html.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (rendered_html, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss counters, number of entries and bytes used
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes
+            }
+
+
+# Process-wide rendered README cache, shared by every session
+_html_cache = ReadmeHtmlCache()
+
+
+def get_readme_html_cache():
+    return _html_cache
+
+
+def get_readme_html(token, username, repository_Name, content, branch='main'):
+    """
+    Get a README as sanitized HTML, rendering it at most once per blob SHA.
+
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        content (str): README markdown
+        branch (str): Branch relative links point to (default: "main")
+
+    Returns:
+        str: Sanitized HTML
+
+    Raises:
+        Exception: If the markdown cannot be rendered
+    """
+    key = (git_blob_sha(content), username, repository_Name, branch)
+    rendered_html = _html_cache.get(key)
+    if rendered_html is None:
+        rendered_html = sanitize_readme_html(
+            render_markdown(token, username, repository_Name, content), username, repository_Name, branch
+        )
+        _html_cache.put(key, rendered_html)
+    return rendered_html
+
+
+def prerender_readmes(token, username, readmes, branches=None):
+    """
+    Render several READMEs to HTML ahead of time, concurrently, skipping the
+    ones already cached. Failures are ignored; those READMEs are rendered when
+    first viewed.
+
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repositories)
+        readmes (dict): repository name -> README info with 'content' (or None)
+        branches (dict, optional): repository name -> default branch relative
+                                   links point to ("main" when missing)
+
+    Returns:
+        int: Number of READMEs rendered
+    """
+    branches = branches or {}
+    pending = [
+        (name, readme['content'], branches.get(name) or 'main') for name, readme in readmes.items()
+        if readme and readme.get('content')
+        and (git_blob_sha(readme['content']), username, name, branches.get(name) or 'main') not in _html_cache
+    ]
+    if not pending:
+        return 0
+    results = gather_sync(
+        *(run_async(get_readme_html, token, username, name, content, branch) for name, content, branch in pending),
+        return_exceptions=True
+    )
+    return sum(1 for result in results if not isinstance(result, Exception))
@@ -0,0 +1,213 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from urllib.parse import parse_qs, urlparse
+
+from github_client import get_client
+from rate_limit import current_priority
+
+try:
+    import orjson
+except ImportError:  # Optional; the standard library decoder is used without it
+    orjson = None
+    import json
+
+MAX_PAGE_WORKERS = int(os.environ.get('GITHUB_PAGE_WORKERS', '8'))  # Concurrent page requests per fetch
+PER_PAGE = 100  # Maximum allowed by GitHub API
+
+# repo_info key -> key in the GitHub REST repository object
+REPO_FIELDS = {
+    'id': 'id',  # Stable across renames
+    'name': 'name',
+    'url': 'url',  # API URL
+    'html_url': 'html_url',  # Web page URL
+    'clone_url': 'clone_url',  # HTTPS clone URL
+    'ssh_url': 'ssh_url',  # SSH clone URL
+    'description': 'description',
+    'language': 'language',
+    'private': 'private',
+    'fork': 'fork',
+    'stars': 'stargazers_count',
+    'forks': 'forks_count',
+    'updated_at': 'updated_at',
+    'default_branch': 'default_branch'  # Branch relative README links point to
+}
+OPTIONAL_FIELDS = {'description', 'language', 'default_branch'}  # '' when GitHub leaves them out
+
+
+def json_loads(data):
+    """
+    Decode a JSON body with orjson when it is installed, else the json module.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def make_projector(fields=None):
+    """
+    Build a function that turns a GitHub repository object into a repo_info
+    dict holding only the requested fields.
+
+    Args:
+        fields (iterable, optional): repo_info keys to keep (default: all of REPO_FIELDS)
+
+    Returns:
+        callable: repo -> dict
+
+    Raises:
+        Exception: If a field is unknown
+    """
+    fields = tuple(fields) if fields else tuple(REPO_FIELDS)
+    unknown = [field for field in fields if field not in REPO_FIELDS]
+    if unknown:
+        raise Exception(f"Unknown repository fields: {', '.join(unknown)}")
+
+    sources = [REPO_FIELDS[field] for field in fields]
+    getter = itemgetter(*sources)
+    single = len(sources) == 1
+
+    def project(repo):
+        try:
+            values = getter(repo)
+        except KeyError:
+            # Slow path for objects missing an optional field
+            return {
+                field: repo.get(source, '') if field in OPTIONAL_FIELDS else repo[source]
+                for field, source in zip(fields, sources)
+            }
+        if single:
+            return {fields[0]: values}
+        return dict(zip(fields, values))
+
+    return project
+
+
+def get_last_page(response):
+    """
+    Read the last page number from the GitHub "Link" pagination header.
+
+    Args:
+        response (requests.Response): Response for the first page
+
+    Returns:
+        int: Last page number, or None if the header has no rel="last" link
+    """
+    last = response.links.get('last')
+    if not last:
+        return None
+
+    page = parse_qs(urlparse(last['url']).query).get('page')
+    return int(page[0]) if page else None
+
+
+class RepositoryFetcher:
+    """
+    The one paginated walk over a repository list, shared by every helper that
+    lists repositories.
+
+    Pages come back newest first. Each page is decoded (orjson when available)
+    and projected to the requested fields as soon as it arrives, and the
+    generators yield in page order while later pages are still in flight, so
+    callers can show the first repositories before the last page is in.
+
+    Args:
+        token (str, optional): GitHub personal access token; None for anonymous
+                               requests (public repositories only, lower rate limit)
+        username (str, optional): Owner whose repositories are listed; None for
+                                  the authenticated user (requires a token)
+        fields (iterable, optional): repo_info keys to keep (default: all)
+        conditional (bool): Send conditional requests through the ETag cache
+        workers (int): Pages fetched at the same time once the page count is known
+
+    Raises:
+        Exception: If neither a token nor a username is given, or a field is unknown
+    """
+
+    def __init__(self, token=None, username=None, fields=None, conditional=True, workers=MAX_PAGE_WORKERS):
+        if not token and not username:
+            raise Exception("Anonymous requests need a username")
+        self.client = get_client(token)
+        self.url = f'/users/{username}/repos' if username else '/user/repos'
+        self.project = make_projector(fields)
+        self.conditional = conditional
+        self.workers = workers
+        self.requests = 0  # Page requests sent, including pages a caller stopped before reading
+        self.pages = 0  # Pages decoded and handed to the caller
+        self.elapsed = 0.0
+
+    def fetch_page(self, page, priority=None):
+        """
+        Fetch one page of the list.
+
+        Returns:
+            tuple: (response, repos) with repos decoded but not projected
+        """
+        params = {
+            'page': page,
+            'per_page': PER_PAGE,
+            'sort': 'updated',  # Sort by last updated
+            'direction': 'desc'  # Most recent first
+        }
+        if self.conditional:
+            # Unchanged pages come back as 304 from the cache, already decoded
+            response = self.client.cached_get(self.url, params=params, priority=priority)
+        else:
+            response = self.client.get(self.url, params=params, priority=priority)
+        response.raise_for_status()
+        self.requests += 1
+
+        parsed = getattr(response, 'parsed', None)
+        return response, parsed if parsed is not None else json_loads(response.content)
+
+    def iter_pages(self, concurrent=True):
+        """
+        Yield each page as a list of projected repositories, in page order.
+
+        Args:
+            concurrent (bool): Read the page count from the first page's Link
+                               header and fetch the remaining pages at the same
+                               time (at most `workers`). If False, pages are
+                               fetched one by one and nothing is requested past
+                               the page the caller stops at.
+
+        Yields:
+            list: Repository information dicts of one page
+        """
+        priority = current_priority()  # Page workers run in other threads; keep the caller's priority
+        start_time = time.perf_counter()
+        try:
+            response, repos = self.fetch_page(1, priority)
+            yield self._page(repos)
+            last_page = get_last_page(response) if concurrent else None
+
+            if last_page is not None and last_page > 1:
+                executor = ThreadPoolExecutor(max_workers=min(self.workers, last_page - 1))
+                try:
+                    futures = [executor.submit(self.fetch_page, page, priority) for page in range(2, last_page + 1)]
+                    for future in futures:
+                        yield self._page(future.result()[1])
+                finally:
+                    # A caller that stops early does not wait for pages it will never read
+                    executor.shutdown(wait=True, cancel_futures=True)
+            else:
+                # No Link header: walk pages until a short page
+                page = 1
+                while len(repos) == PER_PAGE:
+                    page += 1
+                    response, repos = self.fetch_page(page, priority)
+                    yield self._page(repos)
+        finally:
+            self.elapsed += time.perf_counter() - start_time
+
+    def _page(self, repos):
+        self.pages += 1
+        return [self.project(repo) for repo in repos]
+
+    def iter_repositories(self, concurrent=True):
+        """
+        Yield repositories one by one as their pages arrive (see iter_pages).
+        """
+        for page_repos in self.iter_pages(concurrent):
+            yield from page_repos
@@ -0,0 +1,224 @@
+import sqlite3
+import threading
+
+TRIGRAM = 3  # The trigram tokenizer only matches terms of at least this many characters
+RANK_WEIGHTS = (10.0, 3.0, 1.0, 1.0)  # bm25 weights of name, description, language, readme
+OWNER_SEPARATOR = '/'  # Combined views label repositories "owner/name"; names never contain it
+# The label a repository is listed under: its name, qualified with the owner in combined views
+LABEL_SQL = f"CASE r.owner WHEN '' THEN r.name ELSE r.owner || '{OWNER_SEPARATOR}' || r.name END"
+
+
+class RepositorySearchIndex:
+    """
+    In-memory full-text index over repository names, descriptions, languages
+    and README text, with facet columns for filtering.
+
+    Text is held in an SQLite FTS5 table with the trigram tokenizer, so any
+    substring of three or more characters matches ("bim" finds "HKIBIM_Tools").
+    Shorter terms fall back to a LIKE scan of names and descriptions. Facets
+    (language, fork, stars, updated_at) live in a plain indexed table.
+
+    Repositories are identified by their label ("name", or "owner/name" in a
+    combined view); results are labels too. Owner and name are kept apart, so
+    both "repo1" and "bob/repo1" rank the repository as an exact match.
+
+    sync() applies a new snapshot incrementally: only repositories whose
+    updated_at or README changed are re-indexed and deleted ones are removed.
+    It is meant to run on the refresher thread when a snapshot is published,
+    so the Streamlit script only finds the index up to date.
+    """
+
+    def __init__(self):
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._lock = threading.Lock()
+        self.version = 0  # Snapshot version the index was last synced to
+        self._conn.executescript("""
+            CREATE TABLE repos (
+                id INTEGER PRIMARY KEY,
+                owner TEXT NOT NULL,
+                name TEXT NOT NULL,
+                language TEXT,
+                fork INTEGER NOT NULL,
+                stars INTEGER NOT NULL,
+                updated_at TEXT NOT NULL,
+                signature TEXT NOT NULL
+            );
+            CREATE INDEX repos_language ON repos(language);
+            CREATE INDEX repos_stars ON repos(stars);
+            CREATE INDEX repos_updated_at ON repos(updated_at);
+            CREATE VIRTUAL TABLE repo_text USING fts5(
+                name, description, language, readme, tokenize='trigram'
+            );
+        """)
+
+    def sync(self, snapshot):
+        """
+        Bring the index up to date with a RepositorySnapshot. Does nothing if the
+        snapshot version, or a newer one, was already applied.
+
+        Returns:
+            int: Number of repositories added, re-indexed or removed
+        """
+        with self._lock:
+            if snapshot.version <= self.version:
+                return 0
+            changed = self._update(snapshot.table.rows(), snapshot.readmes)
+            self.version = snapshot.version
+            return changed
+
+    def update(self, repos, readmes=None):
+        """
+        Index the given repository list, replacing the previous one.
+
+        Args:
+            repos (iterable): repo_info mappings
+            readmes (Mapping, optional): README info by repository name (None if missing);
+                                         README text of repositories not listed is kept
+
+        Returns:
+            int: Number of repositories added, re-indexed or removed
+        """
+        with self._lock:
+            return self._update(repos, readmes)
+
+    def _update(self, repos, readmes):
+        # Caller holds self._lock
+        readmes = readmes or {}
+        with self._conn:
+            known = dict(self._conn.execute('SELECT id, signature FROM repos'))
+            changed = 0
+
+            for repo in repos:
+                readme = readmes.get(repo['name'])
+                readme_sha = readme.get('sha', '') if readme else ''
+                signature = f"{repo['name']}|{repo.get('updated_at') or ''}|{readme_sha}"
+                previous = known.pop(repo['id'], None)
+                if previous == signature:
+                    continue
+
+                if repo['name'] in readmes:
+                    readme_text = readme.get('content', '') if readme else ''
+                else:
+                    row = self._conn.execute('SELECT readme FROM repo_text WHERE rowid = ?', (repo['id'],)).fetchone()
+                    readme_text = row[0] if row else ''
+
+                self._write(repo, signature, readme_text)
+                changed += 1
+
+            # Whatever was not in the new list has been deleted (or renamed away)
+            for repo_id in known:
+                self._conn.execute('DELETE FROM repos WHERE id = ?', (repo_id,))
+                self._conn.execute('DELETE FROM repo_text WHERE rowid = ?', (repo_id,))
+                changed += 1
+        return changed
+
+    def _write(self, repo, signature, readme_text):
+        # Caller holds self._lock inside a transaction
+        owner, _, name = repo['name'].rpartition(OWNER_SEPARATOR)
+        self._conn.execute(
+            'INSERT OR REPLACE INTO repos (id, owner, name, language, fork, stars, updated_at, signature) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (repo['id'], owner, name, repo.get('language'), int(bool(repo.get('fork'))),
+             int(repo.get('stars') or 0), repo.get('updated_at') or '', signature)
+        )
+        self._conn.execute('DELETE FROM repo_text WHERE rowid = ?', (repo['id'],))
+        self._conn.execute(
+            'INSERT INTO repo_text (rowid, name, description, language, readme) VALUES (?, ?, ?, ?, ?)',
+            (repo['id'], repo['name'], repo.get('description') or '', repo.get('language') or '', readme_text or '')
+        )
+
+    def add_readme(self, repository_Name, content):
+        """
+        Index README text that was loaded outside the snapshot (e.g. when a user viewed it).
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'UPDATE repo_text SET readme = ? WHERE rowid = (SELECT id FROM repos r WHERE {LABEL_SQL} = ?)',
+                (content or '', repository_Name)
+            )
+
+    def search(self, query='', languages=None, fork=None, min_stars=0, updated_after=None, limit=None):
+        """
+        Find repositories matching a text query and facet filters.
+
+        Args:
+            query (str): Space separated terms; every term must match somewhere
+            languages (list, optional): Keep only these primary languages
+            fork (bool, optional): True for forks only, False for sources only, None for both
+            min_stars (int): Minimum stargazer count
+            updated_after (str, optional): ISO 8601 timestamp; keep repositories updated after it
+            limit (int, optional): Maximum number of results
+
+        Returns:
+            list: Repository labels, best match first (most recently updated first without a query)
+        """
+        fts_terms = []
+        where = []
+        params = []
+
+        for term in query.split():
+            if len(term) >= TRIGRAM:
+                fts_terms.append('"' + term.replace('"', '""') + '"')
+            else:
+                where.append(f"({LABEL_SQL} LIKE ? ESCAPE '\\' OR t.description LIKE ? ESCAPE '\\')")
+                pattern = self._like_pattern(term)
+                params.extend([pattern, pattern])
+
+        if fts_terms:
+            where.append('repo_text MATCH ?')
+            params.append(' AND '.join(fts_terms))
+        if languages:
+            where.append(f"r.language IN ({', '.join('?' * len(languages))})")
+            params.extend(languages)
+        if fork is not None:
+            where.append('r.fork = ?')
+            params.append(int(fork))
+        if min_stars:
+            where.append('r.stars >= ?')
+            params.append(int(min_stars))
+        if updated_after:
+            where.append('r.updated_at > ?')
+            params.append(updated_after)
+
+        sql = f'SELECT {LABEL_SQL} FROM repos r JOIN repo_text t ON t.rowid = r.id'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        order = []
+        if query.strip():
+            # Exact name first, then names starting with the query, then by relevance;
+            # with or without the owner ("repo1" and "bob/repo1" both match bob/repo1)
+            qualified = f"r.owner || '{OWNER_SEPARATOR}' || r.name"
+            order.append(f'CASE WHEN r.name = ? COLLATE NOCASE OR {qualified} = ? COLLATE NOCASE THEN 0 '
+                         f"WHEN r.name LIKE ? ESCAPE '\\' OR {qualified} LIKE ? ESCAPE '\\' THEN 1 ELSE 2 END")
+            prefix = self._like_pattern(query.strip(), prefix=True)
+            params.extend([query.strip(), query.strip(), prefix, prefix])
+        if fts_terms:
+            order.append(f"bm25(repo_text, {', '.join(str(weight) for weight in RANK_WEIGHTS)})")
+        order.append('r.updated_at DESC')
+        sql += ' ORDER BY ' + ', '.join(order)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        with self._lock:
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    @staticmethod
+    def _like_pattern(text, prefix=False):
+        escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return escaped + '%' if prefix else '%' + escaped + '%'
+
+    def languages(self):
+        """
+        Returns:
+            list: Distinct primary languages of the indexed repositories
+        """
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                'SELECT DISTINCT language FROM repos WHERE language IS NOT NULL ORDER BY language'
+            )]
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM repos').fetchone()[0]
+
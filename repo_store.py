@@ -0,0 +1,145 @@
+import math
+
+import pandas as pd
+
+UPDATED_AT_FORMAT = '%Y-%m-%dT%H:%M:%SZ'  # GitHub timestamp format, as repo_info stores it
+
+# Column dtypes of the repository table. Strings stay pandas strings, repeated
+# values (language) become categories, counts are int32 and timestamps real datetimes.
+REPO_DTYPES = {
+    'id': 'int64',
+    'name': 'string',
+    'url': 'string',
+    'html_url': 'string',
+    'clone_url': 'string',
+    'ssh_url': 'string',
+    'description': 'string',
+    'language': 'category',
+    'private': 'bool',
+    'fork': 'bool',
+    'stars': 'int32',
+    'forks': 'int32',
+    'updated_at': 'datetime64[ns, UTC]',
+    'default_branch': 'string'
+}
+
+
+def build_repo_frame(repos):
+    """
+    Build a typed, columnar DataFrame from repo_info dicts.
+
+    Args:
+        repos (iterable): repo_info dicts (or read-only mappings)
+
+    Returns:
+        pandas.DataFrame: One row per repository in the given order
+    """
+    columns = {column: [] for column in REPO_DTYPES}
+    for repo in repos:
+        for column, values in columns.items():
+            values.append(repo.get(column))
+
+    frame = pd.DataFrame(columns)
+    for column, dtype in REPO_DTYPES.items():
+        if column == 'updated_at':
+            frame[column] = pd.to_datetime(frame[column], utc=True).astype(dtype)
+        elif dtype in ('int32', 'int64'):
+            frame[column] = frame[column].fillna(0).astype(dtype)
+        elif dtype == 'bool':
+            frame[column] = frame[column].fillna(False).astype(dtype)
+        else:
+            frame[column] = frame[column].astype(dtype)
+    return frame
+
+
+class RepositoryTable:
+    """
+    Columnar repository store built once per snapshot and shared read-only by
+    every rerun and session. Views the page needs are computed here once, so a
+    rerun only reads attributes instead of rebuilding lists and DataFrames.
+    It is the snapshot's only copy of the repositories; code that needs
+    repo_info dicts (syncing, merging, renaming) builds them with rows().
+
+    Args:
+        repos (iterable): repo_info dicts, most recently updated first
+
+    Attributes:
+        frame (pandas.DataFrame): All repository columns with typed dtypes
+        names (tuple): Repository names, most recently updated first
+        names_oldest_first (tuple): Repository names, least recently updated first
+        display_frame (pandas.DataFrame): "Name", "URL", "Index" columns as shown
+                                          in the Repository Table, oldest first
+        default_branches (dict): Repository name -> default branch ('' if unknown)
+    """
+
+    def __init__(self, repos):
+        self.frame = build_repo_frame(repos)
+        self.names = tuple(self.frame['name'])
+        self.names_oldest_first = self.names[::-1]
+        self.default_branches = dict(zip(self.names, self.frame['default_branch'].fillna('')))
+
+        display = pd.DataFrame({
+            'Name': self.frame['name'],
+            'URL': self.frame['html_url'],
+            'Index': pd.Series(range(len(self.frame)), index=self.frame.index, dtype='int32')
+        })
+        self.display_frame = display.iloc[::-1].reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def rows(self):
+        """
+        Rebuild the repo_info dicts the table was built from.
+
+        Returns:
+            list: New repo_info dicts, most recently updated first (missing
+                  values are None, updated_at is a GitHub timestamp string)
+        """
+        columns = []
+        for column in REPO_DTYPES:
+            values = self.frame[column]
+            if column == 'updated_at':
+                values = values.dt.strftime(UPDATED_AT_FORMAT)
+            columns.append(values.astype(object).where(values.notna(), None).tolist())
+        return [dict(zip(REPO_DTYPES, values)) for values in zip(*columns)]
+
+    def default_branch(self, name):
+        """
+        Returns:
+            str: The repository's default branch, "main" if it is not known
+        """
+        return self.default_branches.get(name) or 'main'
+
+    def page_count(self, page_size):
+        """
+        Returns:
+            int: Number of pages of page_size rows (at least 1, even when empty)
+        """
+        return max(1, math.ceil(len(self.display_frame) / page_size))
+
+    def page(self, page_number, page_size, columns=None):
+        """
+        One page of the display frame, so only the visible rows are sent to the browser.
+
+        Args:
+            page_number (int): 1-based page number, clamped to the valid range
+            page_size (int): Rows per page
+            columns (list, optional): Display columns to keep (default: all)
+
+        Returns:
+            pandas.DataFrame: The rows of the page, keeping their display positions as index
+        """
+        page_number = min(max(int(page_number), 1), self.page_count(page_size))
+        start = (page_number - 1) * page_size
+        rows = self.display_frame.iloc[start:start + page_size]
+        if columns is not None:
+            rows = rows[list(columns)]
+        return rows
+
+    def memory_usage(self):
+        """
+        Returns:
+            int: Bytes used by the columnar frame and the display frame
+        """
+        return int(self.frame.memory_usage(deep=True).sum() + self.display_frame.memory_usage(deep=True).sum())
@@ -0,0 +1,253 @@
+import base64
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from blob_cache import get_blob_cache
+from github_client import get_client
+
+TREE_MAX_AGE = float(os.environ.get('TREE_MAX_AGE', '60'))  # Seconds a branch -> tree mapping is trusted
+TREE_INDEX_ENTRIES = 64  # Path indexes kept in memory, keyed by repository and tree SHA
+
+# Git tree entry types and modes -> the type names used by the Contents API helpers
+ENTRY_TYPES = {'blob': 'file', 'tree': 'directory', 'commit': 'submodule'}
+SYMLINK_MODE = '120000'
+
+
+class PathIndex:
+    """
+    Every path of one git tree, built from a single recursive Git Trees API call.
+
+    Existence checks, type and size lookups and directory listings are answered
+    from memory. File contents are not part of the index; read_blob() fetches a
+    blob lazily through the blob cache.
+
+    Args:
+        username (str): Repository owner
+        repository_Name (str): Repository name
+        branch (str): Branch (or any ref) the tree was resolved from
+        tree (dict): Response of GET /repos/{owner}/{repo}/git/trees/{ref}?recursive=1
+    """
+
+    def __init__(self, username, repository_Name, branch, tree):
+        self.username = username
+        self.repository_Name = repository_Name
+        self.branch = branch
+        self.tree_sha = tree.get('sha', '')
+        # GitHub truncates trees over 100,000 entries / 7 MB; missing paths are then unknown
+        self.truncated = tree.get('truncated', False)
+        self.entries = {}
+        self.children = {'': []}
+
+        for item in tree.get('tree', []):
+            path = item['path']
+            item_type = ENTRY_TYPES.get(item.get('type'), 'unknown')
+            if item_type == 'file' and item.get('mode') == SYMLINK_MODE:
+                item_type = 'symlink'
+            self.entries[path] = {
+                'path': path,
+                'name': path.rsplit('/', 1)[-1],
+                'type': item_type,
+                'size': item.get('size', 0),
+                'sha': item.get('sha', '')
+            }
+            if item_type == 'directory':
+                self.children.setdefault(path, [])
+            parent = path.rsplit('/', 1)[0] if '/' in path else ''
+            self.children.setdefault(parent, []).append(path)
+
+    def get(self, path):
+        """
+        Returns:
+            dict: {'path', 'name', 'type', 'size', 'sha'} for the path, or None if it is not in the tree
+        """
+        path = path.strip('/')
+        if path == '':
+            return {'path': '', 'name': '', 'type': 'directory', 'size': 0, 'sha': self.tree_sha}
+        return self.entries.get(path)
+
+    def exists(self, path):
+        return self.get(path) is not None
+
+    def list_dir(self, path=''):
+        """
+        Returns:
+            list: Entries directly inside the directory (no 1,000 entry limit), or
+                  None if the path is not a directory in the tree
+        """
+        children = self.children.get(path.strip('/'))
+        if children is None:
+            return None
+        return [self.entries[child] for child in children]
+
+    def html_url(self, path):
+        is_directory = path == '' or self.entries.get(path, {}).get('type') == 'directory'
+        kind = 'tree' if is_directory else 'blob'
+        return f"https://github.com/{self.username}/{self.repository_Name}/{kind}/{self.branch}/{path}"
+
+    def download_url(self, path):
+        entry = self.entries.get(path)
+        if entry is None or entry['type'] != 'file':
+            return ''
+        return f"https://raw.githubusercontent.com/{self.username}/{self.repository_Name}/{self.branch}/{path}"
+
+    def read_blob(self, token, path):
+        """
+        Fetch and decode a file's content on demand.
+
+        Returns:
+            str: The file content (or its base64 text if it is not UTF-8)
+
+        Raises:
+            Exception: If the path is not a file in the tree or the download fails
+        """
+        entry = self.get(path)
+        if entry is None or entry['type'] != 'file':
+            raise Exception(f"File '{path}' not found in repository '{self.repository_Name}'")
+        return get_blob_content(token, self.username, self.repository_Name, entry['sha'])
+
+
+# Both are keyed by a token fingerprint too, so paths of a private repository
+# are only served to sessions using the token that could read them
+_indexes = OrderedDict()  # (token, owner, repo, tree sha) -> PathIndex; forks can share a tree sha
+_refs = {}                # (token, owner, repo, branch) -> (tree sha, resolved_at)
+_index_lock = threading.Lock()
+
+
+def token_fingerprint(token):
+    """
+    Short hash of a token for cache keys (empty for anonymous access).
+    """
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:16] if token else ''
+
+
+def get_path_index(token, username, repository_Name, branch="main", max_age=TREE_MAX_AGE):
+    """
+    Get the path index of a repository branch.
+
+    A branch resolved less than max_age seconds ago is answered from memory.
+    Otherwise one conditional recursive Git Trees request is made; an unchanged
+    tree (same SHA) reuses the index that was already built.
+
+    Args:
+        token (str): GitHub personal access token
+        username (str): GitHub username (owner of the repository)
+        repository_Name (str): Name of the repository
+        branch (str): Branch name (default: "main")
+        max_age (float): Seconds to trust the last resolved tree SHA
+
+    Returns:
+        PathIndex: The index, or None if the repository or branch does not exist
+
+    Raises:
+        Exception: If the tree cannot be fetched
+    """
+    fingerprint = token_fingerprint(token)
+    ref_key = (fingerprint, username, repository_Name, branch)
+
+    with _index_lock:
+        ref = _refs.get(ref_key)
+        if ref is not None and time.time() - ref[1] < max_age:
+            index_key = (fingerprint, username, repository_Name, ref[0])
+            if index_key in _indexes:
+                _indexes.move_to_end(index_key)
+                return _indexes[index_key]
+
+    client = get_client(token)
+    url = f'/repos/{username}/{repository_Name}/git/trees/{branch}'
+
+    try:
+        response = client.cached_get(url, params={'recursive': 1})
+
+        if response.status_code == 404:
+            return None
+        elif response.status_code == 409:
+            # Empty repository: no commits, so no tree
+            return PathIndex(username, repository_Name, branch, {})
+        elif response.status_code == 403:
+            raise Exception("Insufficient permissions or repository is private")
+        elif response.status_code == 401:
+            raise Exception("Authentication failed. Check your token and permissions")
+        elif response.status_code != 200:
+            raise Exception(f"Failed to get repository tree. Status code: {response.status_code}")
+
+        tree = response.json()
+        tree_sha = tree.get('sha', '')
+        index_key = (fingerprint, username, repository_Name, tree_sha)
+
+        with _index_lock:
+            index = _indexes.get(index_key)
+        if index is None:
+            index = PathIndex(username, repository_Name, branch, tree)
+
+        with _index_lock:
+            _indexes[index_key] = index
+            _indexes.move_to_end(index_key)
+            while len(_indexes) > TREE_INDEX_ENTRIES:
+                _indexes.popitem(last=False)
+            _refs[ref_key] = (tree_sha, time.time())
+        return index
+
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to get repository tree: {str(e)}")
+
+
+def peek_path_index(token, username, repository_Name, branch="main", max_age=TREE_MAX_AGE):
+    """
+    Get the path index of a repository branch only if it is already in memory
+    for this token and was resolved less than max_age seconds ago. Never makes
+    a request.
+
+    Returns:
+        PathIndex: The index, or None
+    """
+    fingerprint = token_fingerprint(token)
+    with _index_lock:
+        ref = _refs.get((fingerprint, username, repository_Name, branch))
+        if ref is None or time.time() - ref[1] >= max_age:
+            return None
+        return _indexes.get((fingerprint, username, repository_Name, ref[0]))
+
+
+def get_blob_content(token, username, repository_Name, sha):
+    """
+    Get a file's content by blob SHA through the Git Blobs API (files up to
+    100 MB, unlike the 1 MB limit of the Contents API), using the blob cache.
+
+    Returns:
+        str: Decoded UTF-8 content, or the base64 text for binary files
+
+    Raises:
+        Exception: If the blob cannot be fetched
+    """
+    blob_cache = get_blob_cache()
+    content = blob_cache.get(sha)
+    if content is not None:
+        return content
+
+    client = get_client(token)
+    try:
+        response = client.cached_get(f'/repos/{username}/{repository_Name}/git/blobs/{sha}')
+        if response.status_code != 200:
+            raise Exception(f"Failed to get blob {sha}. Status code: {response.status_code}")
+
+        blob = response.json()
+        content = blob.get('content', '')
+        size = len(content)
+        if blob.get('encoding') == 'base64':
+            try:
+                raw = base64.b64decode(content)
+                content = raw.decode('utf-8')
+                size = len(raw)
+            except (ValueError, UnicodeDecodeError):
+                pass
+
+        blob_cache.put(sha, content, size)
+        return content
+
+    except requests.exceptions.RequestException as e:
+        raise Exception(f"Failed to get blob: {str(e)}")
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import requests
+
+# Where the on-disk cache lives and how big it may grow before LRU eviction
+DEFAULT_CACHE_PATH = os.environ.get(
+    'GITHUB_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'github_responses.sqlite')
+)
+DEFAULT_CACHE_MAX_BYTES = int(os.environ.get('GITHUB_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+# How many decoded JSON bodies to keep in memory so a 304 skips re-parsing
+PARSED_CACHE_ENTRIES = 256
+# Cache hits are recorded in memory and written as one batch once this many pile up
+TOUCH_BATCH_SIZE = 64
+
+
+class CachedResponse(requests.Response):
+    """
+    Response rebuilt from the cache after a 304 Not Modified.
+    json() returns the already decoded body when it is available.
+    """
+
+    from_cache = True
+    parsed = None
+
+    def json(self, **kwargs):
+        if self.parsed is not None:
+            return self.parsed
+        return super().json(**kwargs)
+
+
+class ResponseCache:
+    """
+    Persistent HTTP response cache for conditional GitHub requests.
+
+    Stores the body together with its ETag / Last-Modified validators in SQLite,
+    keyed by URL + params (+ a token fingerprint, so private data never leaks
+    between tokens). The total body size is bounded; the least recently used
+    entries are evicted first.
+
+    A lookup is a read only: the total size is kept in memory, and access
+    times of hits are written in batches (and before every eviction), in WAL
+    mode so reads never wait for a write.
+
+    Args:
+        path (str): SQLite file path, or ":memory:" for a non-persistent cache
+        max_bytes (int): Maximum total size of the stored bodies
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_CACHE_MAX_BYTES):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._parsed = OrderedDict()
+        self._touched = {}  # key -> last access not written yet
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            ' key TEXT PRIMARY KEY,'
+            ' etag TEXT,'
+            ' last_modified TEXT,'
+            ' body BLOB,'
+            ' size INTEGER,'
+            ' last_access REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)')
+        self._conn.commit()
+        self.total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    @staticmethod
+    def make_key(url, params=None, token=None):
+        """
+        Build the cache key for a request.
+        """
+        key = url
+        if params:
+            key += '?' + urlencode(sorted(params.items()))
+        if token:
+            key += '#' + hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+        return key
+
+    def get(self, key):
+        """
+        Look up a cached response and mark it as recently used.
+
+        Returns:
+            dict: {'etag', 'last_modified', 'body'} or None if not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified, body FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[key] = time.time()
+            if len(self._touched) >= TOUCH_BATCH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+        return {'etag': row[0], 'last_modified': row[1], 'body': row[2]}
+
+    def set(self, key, etag, last_modified, body):
+        """
+        Store a response body with its validators, then evict down to max_bytes.
+        """
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses (key, etag, last_modified, body, size, last_access)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (key, etag, last_modified, body, len(body), time.time())
+            )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            self._touched.pop(key, None)
+            self._parsed.pop(key, None)
+            self._evict()
+            self._conn.commit()
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany('UPDATE responses SET last_access = ? WHERE key = ?',
+                                   ((accessed, key) for key, accessed in self._touched.items()))
+            self._touched.clear()
+
+    def _evict(self):
+        if self.total_bytes <= self.max_bytes:
+            return
+        # Recent hits must count before choosing what to evict
+        self._flush_touched()
+        rows = self._conn.execute('SELECT key, size FROM responses ORDER BY last_access').fetchall()
+        evicted = []
+        for key, size in rows:
+            if self.total_bytes <= self.max_bytes:
+                break
+            evicted.append((key,))
+            self._parsed.pop(key, None)
+            self.total_bytes -= size
+        self._conn.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+    def get_parsed(self, key, etag):
+        """
+        Get the decoded JSON body for a key if it was decoded for this exact ETag.
+        """
+        with self._lock:
+            entry = self._parsed.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._parsed.move_to_end(key)
+            return entry[1]
+
+    def set_parsed(self, key, etag, data):
+        with self._lock:
+            self._parsed[key] = (etag, data)
+            self._parsed.move_to_end(key)
+            while len(self._parsed) > PARSED_CACHE_ENTRIES:
+                self._parsed.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+            self.total_bytes = 0
+            self._touched.clear()
+            self._parsed.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of entries and total stored bytes
+        """
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+            return {'entries': entries, 'bytes': self.total_bytes, 'max_bytes': self.max_bytes}
+
+
+def build_cached_response(response, cached, key, cache):
+    """
+    Turn a 304 Not Modified response into a 200 response carrying the cached body.
+    """
+    result = CachedResponse()
+    result.status_code = 200
+    result.url = response.url
+    result.request = response.request
+    result.headers = response.headers
+    result.encoding = 'utf-8'
+    result._content = cached['body']
+    result.parsed = cache.get_parsed(key, cached['etag'])
+    if result.parsed is None:
+        try:
+            result.parsed = json.loads(cached['body'])
+            cache.set_parsed(key, cached['etag'], result.parsed)
+        except ValueError:
+            pass
+    return result
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Get the process-wide response cache, opening the SQLite file on first use.
+    Falls back to an in-memory cache if the file cannot be opened.
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache()
+                except (OSError, sqlite3.Error):
+                    _response_cache = ResponseCache(':memory:')
+    return _response_cache
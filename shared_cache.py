@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import Future
+
+
+class SharedCache:
+    """
+    Process-wide TTL cache shared by every Streamlit session.
+
+    - Single-flight: when several sessions miss the same key at once, only one
+      loader runs and the others wait for its result.
+    - Stale-while-revalidate: once a value is older than the TTL it is still
+      returned immediately while a background thread reloads it.
+    - invalidate() drops a key so the next get() loads it again.
+
+    Args:
+        ttl (float): Seconds a loaded value counts as fresh
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}     # key -> (value, loaded_at)
+        self._inflight = {}    # key -> Future of the running load
+        self._generation = {}  # key -> bumped by invalidate(), so older loads are not published
+        self.last_error = {}   # key -> exception of the last failed background refresh
+
+    def get(self, key, loader, background_loader=None):
+        """
+        Get the value for a key, loading it with loader() if needed.
+
+        Args:
+            key: Any hashable cache key
+            loader (callable): Zero-argument function returning the fresh value
+            background_loader (callable, optional): Used instead of loader for
+                                                    stale-while-revalidate refreshes
+
+        Returns:
+            The cached (possibly stale) or freshly loaded value
+
+        Raises:
+            Exception: Whatever loader() raised, if there was no value to fall back on
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                if time.time() - loaded_at >= self.ttl and key not in self._inflight:
+                    # Serve the stale value and refresh behind the scenes
+                    future = self._begin_load(key)
+                    threading.Thread(
+                        target=self._load, args=(key, background_loader or loader, future), daemon=True
+                    ).start()
+                return value
+
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = self._begin_load(key)
+
+        if is_owner:
+            self._load(key, loader, future)
+        return future.result()
+
+    def _begin_load(self, key):
+        # Caller holds self._lock
+        future = Future()
+        future.generation = self._generation.get(key, 0)
+        self._inflight[key] = future
+        return future
+
+    def _load(self, key, loader, future):
+        try:
+            value = loader()
+        except Exception as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+                self.last_error[key] = e
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            if self._generation.get(key, 0) == future.generation:
+                self._entries[key] = (value, time.time())
+                self.last_error.pop(key, None)
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+        future.set_result(value)
+
+    def invalidate(self, key):
+        """
+        Forget a key. Loads already running for it finish but are not stored.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+            self._generation[key] = self._generation.get(key, 0) + 1
+
+    def peek(self, key):
+        """
+        Get the stored value without loading or refreshing it.
+
+        Returns:
+            The value, or None if the key is not cached
+        """
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def age(self, key):
+        """
+        Returns:
+            float: Seconds since the key was loaded, or None if it is not cached
+        """
+        entry = self._entries.get(key)
+        return time.time() - entry[1] if entry is not None else None
+
+    def is_refreshing(self, key):
+        return key in self._inflight
+
+
+# Named process-wide caches; module state survives Streamlit reruns and is
+# shared by every session in the server process.
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_shared_cache(name, ttl):
+    """
+    Get the process-wide cache with the given name, creating it on first use.
+
+    Args:
+        name (str): Cache name
+        ttl (float): Freshness in seconds (only used when the cache is created)
+
+    Returns:
+        SharedCache: The shared cache
+    """
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = SharedCache(ttl)
+            _caches[name] = cache
+        return cache
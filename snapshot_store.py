@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from readme_render import git_blob_sha
+from repo_fetch import REPO_FIELDS
+
+# Where saved snapshots live and how many versions per owner are kept
+DEFAULT_SNAPSHOT_PATH = os.environ.get(
+    'GITHUB_SNAPSHOT_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'repository_snapshots.sqlite')
+)
+DEFAULT_KEEP_VERSIONS = int(os.environ.get('GITHUB_SNAPSHOT_KEEP_VERSIONS', '3'))
+
+REPO_COLUMNS = tuple(REPO_FIELDS)
+BOOL_COLUMNS = {'private', 'fork'}
+
+
+def make_store_key(owner, backend, token=None):
+    """
+    Build the store key of an owner's snapshots. Includes a token fingerprint,
+    so repositories one token can see are never restored for another.
+    """
+    key = f'{owner.lower()}:{backend}'
+    if token:
+        key += '#' + hashlib.sha256(token.encode('utf-8')).hexdigest()[:16]
+    return key
+
+
+def snapshot_signature(data):
+    """
+    Fingerprint of the repositories and README versions of snapshot data, so
+    an unchanged refresh does not store a new version.
+    """
+    digest = hashlib.sha1()
+    for repo in data['repos']:
+        digest.update(json.dumps([repo.get(column) for column in REPO_COLUMNS]).encode('utf-8'))
+    for name, readme in sorted(data.get('readmes', {}).items()):
+        digest.update(f"{name}|{readme.get('sha', '') if readme else ''}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SnapshotStore:
+    """
+    Persistent store of repository snapshots, so a restarted app shows the last
+    known repositories at once and only reconciles with GitHub afterwards.
+
+    Schema:
+        snapshots     one row per stored version (owner key, time, stats, signature)
+        repos         the repositories of each version, in display order
+        readmes       README info of each version by repository name (sha NULL = no README)
+        readme_blobs  README text by blob SHA, shared by every version that has it
+        sync_state    latest version and sync watermark per owner key
+
+    Each save is one transaction with batched inserts, in WAL mode so readers
+    never wait for it. Versions beyond keep_versions are compacted away
+    together with README blobs no version uses any more. The store is only
+    read when a refresher starts; the page then works on the snapshot in memory.
+
+    Args:
+        path (str): SQLite file path, or ":memory:" for a non-persistent store
+        keep_versions (int): Versions kept per owner key
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT_PATH, keep_versions=DEFAULT_KEEP_VERSIONS):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.keep_versions = max(1, keep_versions)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Must be set before the first table exists to take effect
+        self._conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode = WAL')
+            self._conn.execute('PRAGMA synchronous = NORMAL')
+        self._conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                store_key TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                repo_count INTEGER NOT NULL,
+                stats TEXT,
+                signature TEXT
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_store_key ON snapshots (store_key, id);
+            CREATE TABLE IF NOT EXISTS repos (
+                snapshot_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                {', '.join(REPO_COLUMNS)},
+                PRIMARY KEY (snapshot_id, position)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS readmes (
+                snapshot_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                sha TEXT,
+                info TEXT,
+                PRIMARY KEY (snapshot_id, name)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS readmes_sha ON readmes (sha);
+            CREATE TABLE IF NOT EXISTS readme_blobs (
+                sha TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS sync_state (
+                store_key TEXT PRIMARY KEY,
+                snapshot_id INTEGER NOT NULL,
+                mode TEXT,
+                watermark TEXT,
+                full_sync_at REAL,
+                saved_at REAL NOT NULL
+            );
+        """)
+        # Stores written before a repository field was added get it as a NULL column
+        existing = {row[1] for row in self._conn.execute('PRAGMA table_info(repos)')}
+        for column in REPO_COLUMNS:
+            if column not in existing:
+                self._conn.execute(f'ALTER TABLE repos ADD COLUMN {column}')
+        self._conn.commit()
+
+    def save(self, store_key, data):
+        """
+        Store snapshot data as the newest version of store_key. If the
+        repositories and READMEs did not change since the newest version, only
+        its stats and sync watermark are updated.
+
+        Args:
+            store_key (str): Owner key (see make_store_key)
+            data (dict): {'repos', 'readmes', 'stats', 'sync'} as published by the refresher
+
+        Returns:
+            int: Id of the version holding the data
+        """
+        signature = snapshot_signature(data)
+        sync = data.get('sync', {})
+        now = time.time()
+
+        with self._lock, self._conn:
+            latest = self._conn.execute(
+                'SELECT id, signature FROM snapshots WHERE store_key = ? ORDER BY id DESC LIMIT 1', (store_key,)
+            ).fetchone()
+            if latest is not None and latest[1] == signature:
+                snapshot_id = latest[0]
+                self._conn.execute('UPDATE snapshots SET stats = ? WHERE id = ?',
+                                   (json.dumps(data.get('stats', {})), snapshot_id))
+            else:
+                snapshot_id = self._conn.execute(
+                    'INSERT INTO snapshots (store_key, created_at, repo_count, stats, signature) VALUES (?, ?, ?, ?, ?)',
+                    (store_key, now, len(data['repos']), json.dumps(data.get('stats', {})), signature)
+                ).lastrowid
+                self._conn.executemany(
+                    f"INSERT INTO repos (snapshot_id, position, {', '.join(REPO_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * (len(REPO_COLUMNS) + 2))})",
+                    (
+                        (snapshot_id, position, *(repo.get(column) for column in REPO_COLUMNS))
+                        for position, repo in enumerate(data['repos'])
+                    )
+                )
+                self._write_readmes(snapshot_id, data.get('readmes', {}))
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sync_state (store_key, snapshot_id, mode, watermark, full_sync_at, saved_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?)',
+                (store_key, snapshot_id, sync.get('mode'), sync.get('watermark'), sync.get('full_sync_at'), now)
+            )
+            compacted = self._compact(store_key)
+        if compacted:
+            self.vacuum()
+        return snapshot_id
+
+    def _write_readmes(self, snapshot_id, readmes):
+        blobs = {}
+        rows = []
+        for name, readme in readmes.items():
+            if readme is None:
+                rows.append((snapshot_id, name, None, None))
+                continue
+            content = readme.get('content') or ''
+            sha = readme.get('sha') or git_blob_sha(content)
+            blobs[sha] = content
+            info = {key: value for key, value in readme.items() if key != 'content'}
+            rows.append((snapshot_id, name, sha, json.dumps(info)))
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO readme_blobs (sha, content, size) VALUES (?, ?, ?)',
+            ((sha, content, len(content)) for sha, content in blobs.items())
+        )
+        self._conn.executemany('INSERT INTO readmes (snapshot_id, name, sha, info) VALUES (?, ?, ?, ?)', rows)
+
+    def _compact(self, store_key):
+        old_ids = [row[0] for row in self._conn.execute(
+            'SELECT id FROM snapshots WHERE store_key = ? ORDER BY id DESC LIMIT -1 OFFSET ?',
+            (store_key, self.keep_versions)
+        )]
+        if not old_ids:
+            return 0
+        self._conn.executemany('DELETE FROM repos WHERE snapshot_id = ?', ((old_id,) for old_id in old_ids))
+        self._conn.executemany('DELETE FROM readmes WHERE snapshot_id = ?', ((old_id,) for old_id in old_ids))
+        self._conn.executemany('DELETE FROM snapshots WHERE id = ?', ((old_id,) for old_id in old_ids))
+        self._conn.execute('DELETE FROM readme_blobs WHERE sha NOT IN (SELECT sha FROM readmes WHERE sha IS NOT NULL)')
+        return len(old_ids)
+
+    def vacuum(self):
+        """
+        Return the pages freed by compaction to the file system and truncate the WAL.
+        """
+        with self._lock:
+            self._conn.execute('PRAGMA incremental_vacuum')
+            self._conn.commit()
+            if self.path != ':memory:':
+                self._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def load(self, store_key):
+        """
+        Load the newest version of store_key.
+
+        Returns:
+            dict: {'repos', 'readmes', 'stats', 'sync', 'saved_at'} for
+                  BackgroundRefresher.publish, or None if nothing is stored.
+                  sync['mode'] is "restored"; saved_at is the time.time() of the save.
+        """
+        start_time = time.perf_counter()
+        with self._lock:
+            state = self._conn.execute(
+                'SELECT snapshot_id, watermark, full_sync_at, saved_at FROM sync_state WHERE store_key = ?',
+                (store_key,)
+            ).fetchone()
+            if state is None:
+                return None
+            snapshot_id, watermark, full_sync_at, saved_at = state
+            rows = self._conn.execute(
+                f"SELECT {', '.join(REPO_COLUMNS)} FROM repos WHERE snapshot_id = ? ORDER BY position",
+                (snapshot_id,)
+            ).fetchall()
+            readme_rows = self._conn.execute(
+                'SELECT r.name, r.info, b.content FROM readmes r LEFT JOIN readme_blobs b ON b.sha = r.sha'
+                ' WHERE r.snapshot_id = ?',
+                (snapshot_id,)
+            ).fetchall()
+
+        repos = [self._repo_from_row(row) for row in rows]
+        readmes = {}
+        for name, info, content in readme_rows:
+            if info is None:
+                readmes[name] = None
+            else:
+                readme = json.loads(info)
+                readme['content'] = content or ''
+                readmes[name] = readme
+
+        return {
+            'repos': repos,
+            'readmes': readmes,
+            'stats': {'requests': 0, 'pages': 0, 'elapsed': time.perf_counter() - start_time},
+            'sync': {'mode': 'restored', 'watermark': watermark or '', 'full_sync_at': full_sync_at or 0.0},
+            'saved_at': saved_at
+        }
+
+    @staticmethod
+    def _repo_from_row(row):
+        repo = dict(zip(REPO_COLUMNS, row))
+        for column in BOOL_COLUMNS:
+            repo[column] = bool(repo[column])
+        return repo
+
+    def stats(self):
+        """
+        Returns:
+            dict: Stored versions, repository rows and README blobs
+        """
+        with self._lock:
+            versions = self._conn.execute('SELECT COUNT(*) FROM snapshots').fetchone()[0]
+            repos = self._conn.execute('SELECT COUNT(*) FROM repos').fetchone()[0]
+            blobs, blob_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM readme_blobs'
+            ).fetchone()
+        return {'versions': versions, 'repos': repos, 'readme_blobs': blobs, 'readme_bytes': blob_bytes}
+
+
+_snapshot_store = None
+_snapshot_store_lock = threading.Lock()
+
+
+def get_snapshot_store():
+    """
+    Get the process-wide snapshot store, opening the SQLite file on first use.
+    Falls back to an in-memory store if the file cannot be opened.
+    """
+    global _snapshot_store
+    if _snapshot_store is None:
+        with _snapshot_store_lock:
+            if _snapshot_store is None:
+                try:
+                    _snapshot_store = SnapshotStore()
+                except (OSError, sqlite3.Error):
+                    _snapshot_store = SnapshotStore(':memory:')
+    return _snapshot_store
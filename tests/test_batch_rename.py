@@ -0,0 +1,26 @@
+import pytest
+
+from batch_rename import parse_rename_mapping, plan_renames
+
+
+def test_parse_rejects_source_listed_twice_in_another_case():
+    with pytest.raises(Exception, match="already listed on line 1"):
+        parse_rename_mapping("repo1 -> x1\nREPO1 -> y1")
+
+
+def test_plan_rejects_source_listed_twice_in_another_case():
+    plan = plan_renames(['repo1', 'repo2'], {'repo1': 'x1', 'REPO1': 'y1', 'repo2': 'z2'})
+
+    statuses = {entry['old']: entry['status'] for entry in plan}
+    assert statuses == {'repo1': 'invalid', 'REPO1': 'invalid', 'repo2': 'ready'}
+    assert all('listed more than once' in entry['reason'] for entry in plan if entry['status'] == 'invalid')
+
+
+def test_every_ready_rename_has_a_wave():
+    plan = plan_renames(['a', 'b', 'c'], {'a': 'b', 'b': 'c', 'c': 'd', 'A': 'e'})
+
+    for entry in plan:
+        if entry['status'] == 'ready':
+            assert entry['wave'] is not None
+        else:
+            assert entry['wave'] is None
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import pytest
+
+import github_client
+from blob_cache import BlobCache
+from github_api import get_file_content_string
+from github_client import GitHubClient
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_github import start_server  # noqa: E402
+
+PRIVATE_TOKEN = 'blob-test-private-token'
+OTHER_TOKEN = 'blob-test-other-token'
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server, state, base_url = start_server(rate_limit=10_000_000)
+    for token in (PRIVATE_TOKEN, OTHER_TOKEN, None):
+        monkeypatch.setitem(github_client._clients, token, GitHubClient(token, base_url=base_url))
+    yield state
+    server.shutdown()
+
+
+def test_recent_file_is_not_served_to_another_token(fake_api):
+    content = get_file_content_string(PRIVATE_TOKEN, 'blobtest', 'repo1', 'README.md', 'main', max_age=60)
+    assert content.startswith('# repo1')
+
+    requests_before = fake_api.requests
+    assert get_file_content_string(PRIVATE_TOKEN, 'blobtest', 'repo1', 'README.md', 'main', max_age=60) == content
+    assert fake_api.requests == requests_before  # Same token: served from memory
+
+    for token in (OTHER_TOKEN, None):
+        get_file_content_string(token, 'blobtest', 'repo1', 'README.md', 'main', max_age=60)
+    assert fake_api.requests == requests_before + 2  # Every other token asked GitHub itself
+
+
+def test_path_map_is_bounded():
+    cache = BlobCache(max_paths=3)
+    for i in range(5):
+        cache.set_path_sha(('', 'owner', 'repo', f'file{i}', 'main'), f'sha{i}')
+
+    assert cache.get_path_sha(('', 'owner', 'repo', 'file0', 'main'), 60) is None
+    assert cache.get_path_sha(('', 'owner', 'repo', 'file4', 'main'), 60) == 'sha4'
+    assert len(cache._paths) == 3
+
+
+def test_shared_readme_is_not_served_to_another_token(fake_api):
+    from github_api import get_readme_content
+
+    assert get_readme_content(PRIVATE_TOKEN, 'readmetest', 'repo2', {}).startswith('# repo2')
+    requests_before = fake_api.requests
+    assert get_readme_content(PRIVATE_TOKEN, 'readmetest', 'repo2', {}).startswith('# repo2')
+    assert fake_api.requests == requests_before
+
+    get_readme_content(OTHER_TOKEN, 'readmetest', 'repo2', {})
+    assert fake_api.requests == requests_before + 1
@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+import github_client
+from github_client import GitHubClient, derive_graphql_url
+from github_graphql import get_repositories_with_readmes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_github import start_server  # noqa: E402
+
+TOKEN = 'graphql-test-token'
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server, state, base_url = start_server(rate_limit=10_000_000)
+    monkeypatch.setitem(github_client._clients, TOKEN, GitHubClient(TOKEN, base_url=base_url))
+    yield state
+    server.shutdown()
+
+
+def test_cursor_pages_cover_every_repository_once(fake_api):
+    stats = {}
+    repositories, readmes = get_repositories_with_readmes(TOKEN, 'bench120', batch_size=50, stats=stats)
+
+    assert stats['requests'] == 3  # 50 + 50 + 20
+    assert [repo['name'] for repo in repositories] == [f'repo{i}' for i in range(120)]
+    assert [repo['updated_at'] for repo in repositories] == sorted(
+        (repo['updated_at'] for repo in repositories), reverse=True)
+    assert set(readmes) == {repo['name'] for repo in repositories}
+    assert readmes['repo0']['content'].startswith('# repo0')
+    assert {repo['default_branch'] for repo in repositories} == {'main'}
+
+
+def test_single_page_when_batch_covers_everything(fake_api):
+    stats = {}
+    repositories, _ = get_repositories_with_readmes(TOKEN, 'bench30', batch_size=50, stats=stats)
+
+    assert stats['requests'] == 1
+    assert len(repositories) == 30
+
+
+def test_graphql_endpoint_of_github_enterprise():
+    assert derive_graphql_url('https://api.github.com') == 'https://api.github.com/graphql'
+    assert derive_graphql_url('https://ghe.example.com/api/v3/') == 'https://ghe.example.com/api/graphql'
+    assert GitHubClient(base_url='https://ghe.example.com/api/v3').graphql_url == 'https://ghe.example.com/api/graphql'
+    assert GitHubClient(base_url='https://ghe.example.com/api/v3',
+                        graphql_url='https://gql.example.com/').graphql_url == 'https://gql.example.com/'
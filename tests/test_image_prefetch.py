@@ -0,0 +1,86 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import image_prefetch
+from image_prefetch import ImagePrefetcher, check_public_url
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\0' * 100
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == '/metadata':
+            self.send_response(302)
+            self.send_header('Location', 'http://169.254.169.254/latest/meta-data/')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path == '/huge.png':
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(1024 * 1024 * 1024))
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png')
+        self.send_header('Content-Length', str(len(PNG)))
+        self.end_headers()
+        self.wfile.write(PNG)
+
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/a.png',
+    'http://localhost/a.png',
+    'http://169.254.169.254/latest/meta-data/',
+    'http://10.0.0.5/a.png',
+    'http://192.168.1.1/a.png',
+    'http://[::1]/a.png',
+    'file:///etc/passwd',
+])
+def test_non_public_urls_are_rejected(url):
+    with pytest.raises(Exception):
+        check_public_url(url)
+
+
+def test_loopback_image_is_reported_as_broken(image_server):
+    images, errors = ImagePrefetcher().fetch_all([f'{image_server}/a.png'])
+
+    assert not images
+    assert 'not a public address' in errors[f'{image_server}/a.png']
+
+
+def test_redirect_targets_are_checked(image_server, monkeypatch):
+    # Let the first hop through (it is the local test server), then check as usual
+    checked = []
+
+    def check(url):
+        checked.append(url)
+        if len(checked) > 1:
+            check_public_url(url)
+
+    monkeypatch.setattr(image_prefetch, 'check_public_url', check)
+    images, errors = ImagePrefetcher().fetch_all([f'{image_server}/metadata'])
+
+    assert checked == [f'{image_server}/metadata', 'http://169.254.169.254/latest/meta-data/']
+    assert 'not a public address' in errors[f'{image_server}/metadata']
+
+
+def test_declared_size_is_checked_before_buffering(image_server):
+    prefetcher = ImagePrefetcher(allow_private=True)
+    images, errors = prefetcher.fetch_all([f'{image_server}/huge.png', f'{image_server}/a.png'])
+
+    assert 'larger than' in errors[f'{image_server}/huge.png']
+    assert images[f'{image_server}/a.png'] == (PNG, 'image/png')
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+import pytest
+
+import github_api
+import github_client
+from github_client import GitHubClient
+from rate_limit import RateLimitError, RateLimitScheduler
+from repo_fetch import RepositoryFetcher
+from response_cache import ResponseCache
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_github import start_server  # noqa: E402
+
+TOKEN = 'rate-limit-test-token'
+
+
+@pytest.fixture
+def cached_client(monkeypatch):
+    # 5000 requests per hour, as on GitHub
+    server, state, base_url = start_server()
+    client = GitHubClient(TOKEN, base_url=base_url, cache=ResponseCache(':memory:'))
+    monkeypatch.setitem(github_client._clients, TOKEN, client)
+    yield client, state
+    server.shutdown()
+
+
+def test_crawl_with_budget_left_is_not_paced(cached_client):
+    client, state = cached_client
+    fetcher = RepositoryFetcher(TOKEN, 'bench6000', fields=['name'], workers=8)
+    assert len(list(fetcher.iter_repositories())) == 6000
+
+    assert fetcher.requests == 60
+    assert client.schedulers['core'].waits == 0
+
+
+def test_warm_recrawl_of_304s_gives_every_token_back(cached_client):
+    client, state = cached_client
+    list(RepositoryFetcher(TOKEN, 'bench6000', fields=['name']).iter_repositories())
+    scheduler = client.schedulers['core']
+    tokens = scheduler.tokens
+
+    for _ in range(3):
+        assert len(list(RepositoryFetcher(TOKEN, 'bench6000', fields=['name']).iter_repositories())) == 6000
+
+    assert state.not_modified == 180
+    assert scheduler.waits == 0
+    assert scheduler.remaining == state.remaining  # Nothing spent by the recrawls
+    assert scheduler.tokens >= tokens
+
+
+def test_low_budget_is_paced():
+    scheduler = RateLimitScheduler(limit=100, burst=2, max_wait=0.01)
+    scheduler.remaining = 5  # Below the 10% reserve
+    scheduler.acquire()
+    scheduler.acquire()
+    with pytest.raises(RateLimitError):
+        scheduler.acquire()
+
+
+@pytest.mark.parametrize('call', [
+    lambda: github_api.get_all_repositories(TOKEN, 'bench10'),
+    lambda: github_api.sync_repositories(TOKEN, 'bench10', [], '2024-01-01T00:00:00Z'),
+    lambda: github_api.rename_repository(TOKEN, 'bench10', 'repo1', 'renamed'),
+    lambda: github_api.get_fileInfo_content(TOKEN, 'bench10', 'repo1'),
+    lambda: github_api.check_file_or_folder_exists(TOKEN, 'bench10', 'repo1')
+])
+def test_helpers_raise_rate_limit_error_unchanged(cached_client, call):
+    client, _ = cached_client
+    scheduler = client.schedulers['core']
+    scheduler.remaining = 0
+    scheduler.reset_at = time.time() + 3600
+    scheduler.max_wait = 0.01
+
+    with pytest.raises(RateLimitError):
+        call()
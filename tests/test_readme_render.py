@@ -0,0 +1,103 @@
+import pytest
+
+from readme_render import prerender_readmes, sanitize_readme_html
+
+
+def sanitize(rendered_html, branch='main'):
+    return sanitize_readme_html(rendered_html, 'owner', 'repo', branch)
+
+
+@pytest.mark.parametrize('href', [
+    'javascript:alert(1)',
+    'JavaScript:alert(1)',
+    '  javascript:alert(1)',
+    '\njavascript:alert(1)',
+    'java\tscript:alert(1)',
+    'jav&#x61;script:alert(1)',
+    'javascript&colon;alert(1)',
+    '&#106;&#97;&#118;&#97;&#115;&#99;&#114;&#105;&#112;&#116;&#58;alert(1)',
+    'vbscript:msgbox(1)',
+    'data:text/html;base64,PHNjcmlwdD5hbGVydCgxKTwvc2NyaXB0Pg=='
+])
+def test_unsafe_urls_are_dropped(href):
+    assert sanitize(f'<a href="{href}">x</a><img src="{href}">') == '<a>x</a><img>'
+
+
+def test_event_handlers_and_unknown_attributes_are_dropped():
+    result = sanitize('<p onclick="alert(1)" ONMOUSEOVER="alert(2)" style="color:red" class="note">x</p>'
+                      '<img src="logo.png" onerror="alert(3)">')
+    assert 'alert' not in result and 'style' not in result
+    assert result.startswith('<p class="note">x</p>')
+
+
+@pytest.mark.parametrize('tag', ['script', 'style', 'template', 'noscript', 'iframe', 'textarea'])
+def test_dropped_tags_lose_their_content(tag):
+    assert sanitize(f'<p>a</p><{tag}><b>alert(1)</b></{tag}><p>b</p>') == '<p>a</p><p>b</p>'
+
+
+def test_nested_dropped_tags():
+    assert sanitize('<template><script>alert(1)</script><b>x</b></template>ok') == 'ok'
+
+
+def test_text_is_escaped():
+    assert sanitize('<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>') == '<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>'
+
+
+def test_protocol_relative_links_become_https():
+    assert sanitize('<a href="//example.com/x">x</a>') == \
+        '<a href="https://example.com/x" target="_blank" rel="noopener noreferrer">x</a>'
+
+
+def test_relative_images_point_to_raw_content_of_the_branch():
+    assert sanitize('<img src="docs/logo.png">', branch='develop') == \
+        '<img src="https://raw.githubusercontent.com/owner/repo/develop/docs/logo.png">'
+    assert sanitize('<img src="./docs/../logo.png">') == \
+        '<img src="https://raw.githubusercontent.com/owner/repo/main/logo.png">'
+
+
+def test_relative_links_point_to_the_file_page_of_the_branch():
+    assert sanitize('<a href="docs/guide.md#setup">x</a>', branch='master') == (
+        '<a href="https://github.com/owner/repo/blob/master/docs/guide.md#setup"'
+        ' target="_blank" rel="noopener noreferrer">x</a>'
+    )
+
+
+@pytest.mark.parametrize('src', ['../../etc/passwd', '/../secret.png', 'docs/../../x.png'])
+def test_parent_paths_are_clamped_to_the_repository(src):
+    assert sanitize(f'<img src="{src}">') == '<img src="https://raw.githubusercontent.com/owner/repo/main/">'
+
+
+def test_anchor_links_match_heading_ids():
+    assert sanitize('<h2 id="setup">Setup</h2><a href="#setup">x</a>') == \
+        '<h2 id="user-content-setup">Setup</h2><a href="#user-content-setup">x</a>'
+    assert sanitize('<a href="#user-content-setup">x</a>') == '<a href="#user-content-setup">x</a>'
+
+
+def test_blob_images_point_to_raw_content():
+    assert sanitize('<img src="https://github.com/other/project/blob/v2/img/shot.png">') == \
+        '<img src="https://raw.githubusercontent.com/other/project/v2/img/shot.png">'
+    # Links to a blob page stay links to the page
+    assert sanitize('<a href="https://github.com/other/project/blob/v2/README.md">x</a>') == (
+        '<a href="https://github.com/other/project/blob/v2/README.md"'
+        ' target="_blank" rel="noopener noreferrer">x</a>'
+    )
+
+
+def test_only_disabled_task_list_checkboxes_are_kept():
+    assert sanitize('<input type="checkbox" checked=""><input type="text" value="x">') == \
+        '<input type="checkbox" checked="" disabled="">'
+
+
+def test_prerender_uses_each_repository_default_branch(monkeypatch):
+    import readme_render
+
+    rendered = []
+
+    def fake_get_readme_html(token, username, repository_Name, content, branch='main'):
+        rendered.append((repository_Name, branch))
+        return ''
+
+    monkeypatch.setattr(readme_render, 'get_readme_html', fake_get_readme_html)
+    readmes = {'a': {'content': '# A'}, 'b': {'content': '# B'}, 'c': None}
+    assert prerender_readmes('token', 'owner', readmes, branches={'a': 'develop', 'b': None}) == 2
+    assert sorted(rendered) == [('a', 'develop'), ('b', 'main')]
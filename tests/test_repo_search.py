@@ -0,0 +1,122 @@
+import threading
+from types import SimpleNamespace
+
+from background_refresh import BackgroundRefresher
+from repo_search import RepositorySearchIndex
+
+
+def make_repo(id, name, updated_at='2024-01-01T00:00:00Z', **fields):
+    return dict({'id': id, 'name': name, 'description': '', 'language': 'Python', 'fork': False, 'stars': 0,
+                 'updated_at': updated_at}, **fields)
+
+
+class FakeTable:
+    def __init__(self, repos, calls=None):
+        self.repos = repos
+        self.calls = calls
+
+    def rows(self):
+        if self.calls is not None:
+            self.calls.append(1)
+        return [dict(repo) for repo in self.repos]
+
+
+def make_snapshot(version, repos, readmes=None, calls=None):
+    return SimpleNamespace(version=version, table=FakeTable(repos, calls), readmes=readmes or {})
+
+
+def test_text_and_facet_search():
+    index = RepositorySearchIndex()
+    index.update([
+        make_repo(1, 'HKIBIM_Tools', description='Revit add-in', stars=50),
+        make_repo(2, 'dynamo-scripts', language='C#', fork=True),
+        make_repo(3, 'ui', description='User interface', updated_at='2024-06-01T00:00:00Z')
+    ], {'dynamo-scripts': {'sha': 'a', 'content': 'Installation with pyRevit'}})
+
+    assert index.search('bim') == ['HKIBIM_Tools']
+    assert index.search('revit') == ['HKIBIM_Tools', 'dynamo-scripts']
+    assert index.search('ui') == ['ui']  # Shorter than a trigram: LIKE fallback
+    assert index.search(languages=['C#']) == ['dynamo-scripts']
+    assert index.search(fork=False, min_stars=10) == ['HKIBIM_Tools']
+    assert index.search(updated_after='2024-03-01T00:00:00Z') == ['ui']
+    assert index.languages() == ['C#', 'Python']
+
+
+def test_update_only_touches_changed_repositories():
+    index = RepositorySearchIndex()
+    repos = [make_repo(i, f'repo{i}') for i in range(10)]
+    assert index.update(repos) == 10
+    assert index.update(repos) == 0
+
+    changed = [dict(repo) for repo in repos[1:]]
+    changed[0]['updated_at'] = '2025-01-01T00:00:00Z'
+    changed[1]['name'] = 'renamed'
+    assert index.update(changed) == 3  # One pushed to, one renamed, one deleted
+    assert index.search('renamed') == ['renamed']
+    assert 'repo0' not in index.search()
+    assert len(index) == 9
+
+
+def test_exact_and_prefix_matches_rank_first_with_or_without_owner():
+    index = RepositorySearchIndex()
+    index.update([
+        make_repo(1, 'bob/repo10', updated_at='2024-03-01T00:00:00Z'),
+        make_repo(2, 'alice/repo1-old', updated_at='2024-02-01T00:00:00Z'),
+        make_repo(3, 'bob/repo1', updated_at='2024-01-01T00:00:00Z'),
+        make_repo(4, 'alice/my-repo1', updated_at='2024-04-01T00:00:00Z')
+    ])
+
+    assert index.search('bob/repo1')[0] == 'bob/repo1'
+    assert index.search('bob/repo1') == ['bob/repo1', 'bob/repo10']
+    assert index.search('repo1')[0] == 'bob/repo1'
+    assert index.search('repo1')[-1] == 'alice/my-repo1'
+    assert index.search('al') == ['alice/my-repo1', 'alice/repo1-old']
+    index.add_readme('alice/my-repo1', 'Unique installation notes')
+    assert index.search('unique installation') == ['alice/my-repo1']
+
+
+def test_sync_never_goes_back_to_an_older_snapshot():
+    index = RepositorySearchIndex()
+    assert index.sync(make_snapshot(2, [make_repo(1, 'new')])) == 1
+    assert index.sync(make_snapshot(1, [make_repo(1, 'old')])) == 0
+    assert index.sync(make_snapshot(2, [make_repo(1, 'new')])) == 0
+    assert index.search() == ['new']
+    assert index.version == 2
+
+
+def test_concurrent_syncs_of_one_snapshot_index_it_once():
+    index = RepositorySearchIndex()
+    calls = []
+    snapshot = make_snapshot(1, [make_repo(i, f'repo{i}') for i in range(2000)], calls=calls)
+
+    threads = [threading.Thread(target=index.sync, args=(snapshot,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(index) == 2000
+
+
+def test_published_snapshots_are_indexed_on_the_refresher_thread():
+    index = RepositorySearchIndex()
+    threads = []
+
+    def listener(snapshot):
+        threads.append(threading.current_thread().name)
+        index.sync(snapshot)
+
+    refresher = BackgroundRefresher(
+        lambda previous: {'repos': [make_repo(1, 'alpha'), make_repo(2, 'beta')], 'readmes': {}},
+        interval=3600, name='search-test-refresher'
+    )
+    refresher.add_listener(listener)
+    refresher.add_listener(lambda snapshot: 1 / 0)  # A failing listener does not stop publishing
+    refresher.start()
+    snapshot = refresher.wait_for_snapshot(timeout=30)
+
+    assert snapshot is not None
+    assert threads == ['search-test-refresher']
+    assert index.version == snapshot.version
+    assert index.search('alp') == ['alpha']
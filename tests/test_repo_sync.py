@@ -0,0 +1,140 @@
+import os
+import sys
+import time
+
+import pytest
+
+import github_api
+import github_client
+from background_refresh import freeze_snapshot
+from github_api import get_all_repositories, load_repository_snapshot, rename_repository, sync_repositories
+from github_client import GitHubClient
+from repo_fetch import RepositoryFetcher
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_github import start_server  # noqa: E402
+
+TOKEN = 'sync-test-token'
+OWNER = 'bench250'  # Three pages of 100
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server, state, base_url = start_server(rate_limit=10_000_000)
+    monkeypatch.setitem(github_client._clients, TOKEN, GitHubClient(TOKEN, base_url=base_url))
+    monkeypatch.setattr(github_api, 'README_PREFETCH_COUNT', 0)
+    yield state
+    server.shutdown()
+
+
+def push(state, *names):
+    """
+    Move repositories to the top of the list with a new updated_at, as a push does.
+    """
+    repos = state.repos(OWNER)
+    with state.lock:
+        for name in names:
+            repo = next(repo for repo in repos if repo['name'] == name)
+            repo['updated_at'] = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(time.time() + 60))
+            repos.remove(repo)
+            repos.insert(0, repo)
+
+
+def delete(state, name):
+    repos = state.repos(OWNER)
+    with state.lock:
+        repos.remove(next(repo for repo in repos if repo['name'] == name))
+
+
+def initial(stats=None):
+    repos = get_all_repositories(TOKEN, OWNER, stats=stats)
+    return repos, max(repo['updated_at'] for repo in repos)
+
+
+def test_unchanged_account_costs_one_request(fake_api):
+    previous, watermark = initial()
+    stats = {}
+    repos, changed = sync_repositories(TOKEN, OWNER, previous, watermark, stats=stats)
+
+    assert stats['requests'] == 1
+    assert stats['pages'] == 1
+    # Repositories updated in the watermark's own second are read again
+    assert [repo['updated_at'] for repo in changed] == [watermark]
+    assert repos == previous
+
+
+def test_sync_stops_at_the_watermark(fake_api):
+    previous, watermark = initial()
+    push(fake_api, 'repo120', 'repo249')
+    stats = {}
+    repos, changed = sync_repositories(TOKEN, OWNER, previous, watermark, stats=stats)
+
+    assert stats['requests'] == 1
+    assert {'repo120', 'repo249'} <= {repo['name'] for repo in changed}
+    assert len(repos) == len(previous)
+    assert [repo['name'] for repo in repos[:2]] == ['repo249', 'repo120']
+    assert sorted(repo['id'] for repo in repos) == sorted(repo['id'] for repo in previous)
+
+
+def test_renames_are_merged_by_id(fake_api):
+    previous, watermark = initial()
+    renamed_id = next(repo['id'] for repo in previous if repo['name'] == 'repo7')
+    rename_repository(TOKEN, OWNER, 'repo7', 'tools')
+    repos, _ = sync_repositories(TOKEN, OWNER, previous, watermark)
+
+    names = [repo['name'] for repo in repos]
+    assert names[0] == 'tools' and 'repo7' not in names
+    assert repos[0]['id'] == renamed_id
+    assert len(repos) == len(previous)
+
+
+def test_readmes_of_renamed_repositories_are_dropped(fake_api):
+    previous, watermark = initial()
+    readmes = {f'repo{i}': {'sha': str(i) * 40, 'content': f'# repo{i}'} for i in range(5)}
+    snapshot = freeze_snapshot({'repos': previous, 'readmes': readmes,
+                                'sync': {'watermark': watermark, 'full_sync_at': time.time()}}, 1)
+
+    rename_repository(TOKEN, OWNER, 'repo1', 'moved')
+    rename_repository(TOKEN, OWNER, 'repo2', 'repo1')  # Takes over the freed name
+    data = load_repository_snapshot(TOKEN, OWNER, 'rest', snapshot)
+
+    assert data['sync']['mode'] == 'incremental'
+    assert set(data['readmes']) == {'repo0', 'repo3', 'repo4'}
+    assert [repo['name'] for repo in data['repos'][:2]] == ['repo1', 'moved']
+
+
+def test_deleted_repositories_stay_until_the_full_sync(fake_api):
+    previous, watermark = initial()
+    delete(fake_api, 'repo42')
+    readmes = {'repo42': {'sha': 'a' * 40, 'content': '# repo42'}}
+
+    recent = freeze_snapshot({'repos': previous, 'readmes': readmes,
+                              'sync': {'watermark': watermark, 'full_sync_at': time.time()}}, 1)
+    data = load_repository_snapshot(TOKEN, OWNER, 'rest', recent)
+    assert data['sync']['mode'] == 'incremental'
+    assert 'repo42' in {repo['name'] for repo in data['repos']}
+
+    stale = freeze_snapshot({'repos': previous, 'readmes': readmes,
+                             'sync': {'watermark': watermark,
+                                      'full_sync_at': time.time() - github_api.FULL_SYNC_INTERVAL - 1}}, 2)
+    stats_before = fake_api.requests
+    data = load_repository_snapshot(TOKEN, OWNER, 'rest', stale)
+    assert data['sync']['mode'] == 'full'
+    assert fake_api.requests - stats_before == 3
+    assert 'repo42' not in {repo['name'] for repo in data['repos']}
+    assert 'repo42' not in data['readmes']
+    assert len(data['repos']) == len(previous) - 1
+
+
+def test_pages_count_the_pages_parsed(fake_api):
+    stats = {}
+    repos = get_all_repositories(TOKEN, OWNER, stats=stats)
+    assert len(repos) == 250
+    assert stats['pages'] == 3
+
+    fetcher = RepositoryFetcher(TOKEN, OWNER, workers=2)
+    for _ in fetcher.iter_pages():
+        break  # Later pages may already be requested, but are never read
+    assert fetcher.pages == 1
+    assert fetcher.requests >= fetcher.pages
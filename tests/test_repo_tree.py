@@ -0,0 +1,38 @@
+import os
+import sys
+
+import pytest
+
+import github_client
+from github_client import GitHubClient
+from repo_tree import get_path_index, peek_path_index
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from fake_github import start_server  # noqa: E402
+
+PRIVATE_TOKEN = 'tree-test-private-token'
+OTHER_TOKEN = 'tree-test-other-token'
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    server, state, base_url = start_server(rate_limit=10_000_000)
+    for token in (PRIVATE_TOKEN, OTHER_TOKEN, None):
+        monkeypatch.setitem(github_client._clients, token, GitHubClient(token, base_url=base_url))
+    yield state
+    server.shutdown()
+
+
+def test_index_is_not_shared_between_tokens(fake_api):
+    index = get_path_index(PRIVATE_TOKEN, 'treetest', 'repo1', 'main')
+    assert index.exists('README.md')
+    assert peek_path_index(PRIVATE_TOKEN, 'treetest', 'repo1', 'main') is index
+
+    assert peek_path_index(OTHER_TOKEN, 'treetest', 'repo1', 'main') is None
+    assert peek_path_index(None, 'treetest', 'repo1', 'main') is None
+
+    requests_before = fake_api.requests
+    other = get_path_index(OTHER_TOKEN, 'treetest', 'repo1', 'main')
+    assert other is not index
+    assert fake_api.requests == requests_before + 1  # Resolved with the other token's own request
@@ -0,0 +1,36 @@
+from response_cache import TOUCH_BATCH_SIZE, ResponseCache
+
+
+def test_total_size_follows_inserts_replacements_and_evictions():
+    cache = ResponseCache(':memory:', max_bytes=250)
+    cache.set('a', '"1"', None, b'x' * 100)
+    cache.set('b', '"2"', None, b'x' * 100)
+    cache.set('a', '"3"', None, b'x' * 50)  # Replacing an entry counts only its new size
+    assert cache.stats()['bytes'] == 150
+
+    cache.set('c', '"4"', None, b'x' * 150)
+    assert cache.get('c') is not None
+    assert cache.stats()['bytes'] <= 250
+    assert cache.stats()['bytes'] == sum(len(cache.get(key)['body']) for key in 'abc' if cache.get(key))
+
+
+def test_recent_hits_are_kept_on_eviction():
+    cache = ResponseCache(':memory:', max_bytes=200)
+    cache.set('old', '"1"', None, b'x' * 100)
+    cache.set('new', '"2"', None, b'x' * 100)
+    assert cache.get('old') is not None  # Only recorded in memory so far
+
+    cache.set('third', '"3"', None, b'x' * 100)
+
+    assert cache.get('old') is not None
+    assert cache.get('new') is None
+
+
+def test_hits_are_written_in_batches():
+    cache = ResponseCache(':memory:')
+    cache.set('a', '"1"', None, b'body')
+    written = cache._conn.execute("SELECT last_access FROM responses WHERE key = 'a'").fetchone()[0]
+
+    for _ in range(TOUCH_BATCH_SIZE - 1):
+        cache.get('a')
+    assert cache._conn.execute("SELECT last_access FROM responses WHERE key = 'a'").fetchone()[0] == written
@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from github_client import GitHubClient
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    calls = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        self.rfile.read(length)
+        self.calls.append(self.command)
+        status = 502 if len(self.calls) == 1 else 200
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_GET = do_PATCH = do_POST = respond
+
+
+@pytest.fixture
+def flaky_client():
+    calls = []
+    handler = type('Handler', (FlakyHandler,), {'calls': calls})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = GitHubClient(base_url=f'http://127.0.0.1:{server.server_port}')
+    for scheduler in client.schedulers.values():
+        scheduler.backoff = lambda attempt: 0.0
+    yield client, calls
+    server.shutdown()
+
+
+def test_get_is_retried_after_a_server_error(flaky_client):
+    client, calls = flaky_client
+    assert client.get('/repos/o/r').status_code == 200
+    assert calls == ['GET', 'GET']
+
+
+def test_patch_is_not_replayed_after_a_server_error(flaky_client):
+    client, calls = flaky_client
+    assert client.patch('/repos/o/r', json={'name': 'new'}).status_code == 502
+    assert calls == ['PATCH']
+
+
+def test_post_marked_idempotent_is_retried(flaky_client):
+    client, calls = flaky_client
+    assert client.post('/markdown', json={'text': ''}, idempotent=True).status_code == 200
+    assert calls == ['POST', 'POST']
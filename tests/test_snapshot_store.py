@@ -0,0 +1,96 @@
+import sqlite3
+
+from snapshot_store import REPO_COLUMNS, SnapshotStore, make_store_key
+
+
+def make_data(count, updated='2024-01-01T00:00:00Z'):
+    repos = [{
+        'id': i,
+        'name': f'repo{i}',
+        'url': f'https://api.github.com/repos/owner/repo{i}',
+        'html_url': f'https://github.com/owner/repo{i}',
+        'clone_url': f'https://github.com/owner/repo{i}.git',
+        'ssh_url': f'git@github.com:owner/repo{i}.git',
+        'description': None if i % 2 else f'Repository {i}',
+        'language': 'Python' if i % 3 else None,
+        'private': i % 5 == 0,
+        'fork': i % 7 == 0,
+        'stars': i,
+        'forks': i // 2,
+        'updated_at': updated,
+        'default_branch': 'main' if i % 4 else 'develop'
+    } for i in range(count)]
+    readmes = {'repo0': {'type': 'file', 'path': 'README.md', 'sha': 'a' * 40, 'content': '# README'},
+               'repo1': None}
+    return {
+        'repos': repos,
+        'readmes': readmes,
+        'stats': {'requests': 3, 'elapsed': 0.5},
+        'sync': {'mode': 'full', 'watermark': updated, 'full_sync_at': 1700000000.0}
+    }
+
+
+def test_save_and_load_round_trip():
+    store = SnapshotStore(':memory:')
+    data = make_data(25)
+    store.save('owner:rest', data)
+
+    loaded = store.load('owner:rest')
+    assert loaded['repos'] == data['repos']
+    assert loaded['readmes'] == data['readmes']
+    assert loaded['sync'] == {'mode': 'restored', 'watermark': data['sync']['watermark'],
+                              'full_sync_at': data['sync']['full_sync_at']}
+    assert loaded['saved_at'] > 0
+    assert store.load('other:rest') is None
+
+
+def test_unchanged_data_is_not_stored_again():
+    store = SnapshotStore(':memory:')
+    first = store.save('owner:rest', make_data(10))
+    second = store.save('owner:rest', dict(make_data(10), stats={'requests': 1}))
+
+    assert first == second
+    assert store.stats()['versions'] == 1
+
+    changed = make_data(10)
+    changed['readmes']['repo0'] = dict(changed['readmes']['repo0'], sha='b' * 40, content='# Changed')
+    assert store.save('owner:rest', changed) != first
+
+
+def test_old_versions_and_unused_readme_blobs_are_compacted():
+    store = SnapshotStore(':memory:', keep_versions=2)
+    for day in range(1, 6):
+        data = make_data(10, updated=f'2024-01-0{day}T00:00:00Z')
+        data['readmes']['repo0'] = dict(data['readmes']['repo0'], sha=str(day) * 40, content=f'# Day {day}')
+        store.save('owner:rest', data)
+
+    stats = store.stats()
+    assert stats['versions'] == 2
+    assert stats['repos'] == 20
+    assert stats['readme_blobs'] == 2
+    assert store.load('owner:rest')['readmes']['repo0']['content'] == '# Day 5'
+
+
+def test_store_keys_are_scoped_to_the_token():
+    assert make_store_key('Owner', 'rest', 'token-a') != make_store_key('owner', 'rest', 'token-b')
+    assert make_store_key('Owner', 'rest', 'token-a') == make_store_key('owner', 'rest', 'token-a')
+    assert make_store_key('owner', 'rest') != make_store_key('owner', 'rest', 'token-a')
+
+    store = SnapshotStore(':memory:')
+    store.save(make_store_key('owner', 'rest', 'token-a'), make_data(3))
+    assert store.load(make_store_key('owner', 'rest', 'token-b')) is None
+    assert store.load(make_store_key('owner', 'rest')) is None
+
+
+def test_stores_without_a_new_repository_field_get_its_column(tmp_path):
+    path = str(tmp_path / 'snapshots.sqlite')
+    old_columns = [column for column in REPO_COLUMNS if column != 'default_branch']
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE repos (snapshot_id INTEGER NOT NULL, position INTEGER NOT NULL, "
+                 f"{', '.join(old_columns)}, PRIMARY KEY (snapshot_id, position)) WITHOUT ROWID")
+    conn.close()
+
+    store = SnapshotStore(path)
+    data = make_data(5)
+    store.save('owner:rest', data)
+    assert store.load('owner:rest')['repos'] == data['repos']